@@ -1,22 +1,19 @@
 """Product Manager agent for website requirements analysis."""
 
-import os
 from crewai import Agent
 from crewai.tools import BaseTool
-from langchain_anthropic import ChatAnthropic
+
+from backend.llm.config import create_agent_llm
 
 
 class ProductManagerAgent:
     """Product Manager agent for analyzing requirements and creating specifications."""
     
     def __init__(self):
-        # Initialize the LLM with Claude 3.5 Sonnet for better analysis
-        self.llm = ChatAnthropic(
-            model="claude-3-5-sonnet-20240620",
-            api_key=os.getenv("ANTHROPIC_API_KEY"),
-            temperature=0.1,
-            max_tokens=8192  # Claude 3.5 Sonnet supports higher token limits
-        )
+        # Model, token limit and temperature come from the agent's tier in
+        # backend/llm/config.py; calls go through a router that falls back to
+        # an alternate model when this one gets slow or starts failing
+        self.llm = create_agent_llm("product_manager")
         
         # Create the agent
         self.agent = Agent(
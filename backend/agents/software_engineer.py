@@ -1,21 +1,18 @@
 """Software Engineer agent for React application development."""
 
-import os
 from crewai import Agent
-from langchain_anthropic import ChatAnthropic
+
+from backend.llm.config import create_agent_llm
 
 
 class SoftwareEngineerAgent:
     """Software Engineer agent for implementing React applications."""
     
     def __init__(self):
-        # Initialize the LLM with Claude 3.5 Sonnet for better code generation
-        self.llm = ChatAnthropic(
-            model="claude-3-5-sonnet-20240620",
-            api_key=os.getenv("ANTHROPIC_API_KEY"),
-            temperature=0.2,
-            max_tokens=8192  # Claude 3.5 Sonnet supports higher token limits
-        )
+        # Model, token limit and temperature come from the agent's tier in
+        # backend/llm/config.py; calls go through a router that falls back to
+        # an alternate model when this one gets slow or starts failing
+        self.llm = create_agent_llm("software_engineer")
         
         # Create the agent
         self.agent = Agent(
@@ -1,22 +1,19 @@
 """UI/UX Designer agent for website design and layout."""
 
-import os
 from crewai import Agent
 from crewai.tools import BaseTool
-from langchain_anthropic import ChatAnthropic
+
+from backend.llm.config import create_agent_llm
 
 
 class UIDesignerAgent:
     """UI/UX Designer agent for creating website designs and layouts."""
     
     def __init__(self):
-        # Initialize the LLM with Claude 3.5 Sonnet for better design analysis
-        self.llm = ChatAnthropic(
-            model="claude-3-5-sonnet-20240620",
-            api_key=os.getenv("ANTHROPIC_API_KEY"),
-            temperature=0.3,
-            max_tokens=8192  # Claude 3.5 Sonnet supports higher token limits
-        )
+        # Model, token limit and temperature come from the agent's tier in
+        # backend/llm/config.py; calls go through a router that falls back to
+        # an alternate model when this one gets slow or starts failing
+        self.llm = create_agent_llm("ui_designer")
         
         # Create the agent
         self.agent = Agent(
@@ -1,15 +1,22 @@
 """API routes for the AI Website Generator."""
 
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, Field
 
-from backend.crew.website_crew import WebsiteCrew
 from backend.utils.project_manager import ProjectManager
 from backend.utils.project_structure import ProjectStructureManager
-from backend.utils.file_parser import ProjectFileParser
+from backend.utils.design_cache import DesignSystemCache
+from backend.utils.draft_project import create_draft_project
+from backend.utils.file_parser import parse_project_files_cached
+from backend.utils.generation_metrics import time_stage
 from backend.utils.project_preview import preview_manager
+from backend.utils.similarity_index import RequestSimilarityIndex
+from backend.llm.config import get_router_stats
+from backend.llm.rate_limiter import get_rate_limiter
 
 router = APIRouter()
 
@@ -19,12 +26,14 @@ class WebsiteRequest(BaseModel):
     description: str = Field(..., description="Description of the website to build")
     requirements: List[str] = Field(default=[], description="Specific requirements")
     style_preferences: Dict[str, Any] = Field(default={}, description="Style preferences")
+    draft: bool = Field(default=False, description="Preview a template-only draft while the crew refines it")
 
 class WebsiteResponse(BaseModel):
     """Response model for website generation."""
     project_id: str = Field(..., description="Unique project identifier")
     status: str = Field(..., description="Generation status")
     message: str = Field(..., description="Status message")
+    preview_url: Optional[str] = Field(default=None, description="Preview of the draft project")
 
 class ProjectStatus(BaseModel):
     """Project status model."""
@@ -34,6 +43,7 @@ class ProjectStatus(BaseModel):
     current_step: str
     files_generated: List[str]
     errors: List[str]
+    metrics: Dict[str, Any] = {}
 
 
 @router.post("/generate", response_model=WebsiteResponse)
@@ -51,19 +61,36 @@ async def generate_website(
             style_preferences=request.style_preferences
         )
         
+        # Serve a runnable draft right away; the crew's files replace it when done
+        preview_url = None
+        if request.draft:
+            preview_url = await run_in_threadpool(
+                _start_draft_preview,
+                project_manager,
+                project_id,
+                request.description,
+                request.requirements,
+                request.style_preferences
+            )
+        
         # Start website generation in background
         background_tasks.add_task(
             _generate_website_task,
             project_id,
             request.description,
             request.requirements,
-            request.style_preferences
+            request.style_preferences,
+            request.draft
         )
         
         return WebsiteResponse(
             project_id=project_id,
             status="started",
-            message="Website generation started. Check status for progress."
+            message=(
+                "Draft preview ready. Refined website generation started."
+                if preview_url else "Website generation started. Check status for progress."
+            ),
+            preview_url=preview_url
         )
         
     except Exception as e:
@@ -92,6 +119,81 @@ async def get_project_status(project_id: str) -> ProjectStatus:
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
 
+@router.get("/projects/{project_id}/stats")
+async def get_project_stats(project_id: str) -> Dict[str, Any]:
+    """Get per-stage token usage and latency for a generation project."""
+    try:
+        project_manager = ProjectManager()
+        project = project_manager.get_project_status(project_id)
+        
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        metrics = project.get("metrics", {})
+        
+        return {
+            "project_id": project_id,
+            "status": project["status"],
+            "stages": metrics.get("stages", {}),
+            "summary": metrics.get("summary", {})
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
+
+
+@router.get("/projects/{project_id}/events")
+async def get_project_events(project_id: str, since: int = 0) -> Dict[str, Any]:
+    """Get project events (e.g. file_created while files stream in) after an event id."""
+    try:
+        project_manager = ProjectManager()
+        events = project_manager.get_events(project_id, since)
+        
+        if events is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        return {
+            "project_id": project_id,
+            "events": events,
+            "last_event_id": events[-1]["id"] if events else since
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get events: {str(e)}")
+
+
+@router.get("/caches/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """Get hit rates of the generation caches."""
+    try:
+        return {
+            "specification_reuse": RequestSimilarityIndex().get_stats(),
+            "design_system": DesignSystemCache().get_stats()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get cache stats: {str(e)}")
+
+
+@router.get("/llm/stats")
+async def get_llm_stats() -> Dict[str, Any]:
+    """Get per-agent model routing, prompt cache and shared rate limiter statistics."""
+    try:
+        rate_limiter = get_rate_limiter()
+        
+        return {
+            "routers": get_router_stats(),
+            "rate_limiter": rate_limiter.get_stats() if rate_limiter else None
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get LLM stats: {str(e)}")
+
+
 @router.get("/projects")
 async def list_projects() -> Dict[str, Any]:
     """List all projects."""
@@ -209,6 +311,24 @@ async def get_project_file_tree(project_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to get file tree: {str(e)}")
 
 
+@router.get("/projects/{project_id}/imports")
+async def get_project_imports(project_id: str) -> Dict[str, Any]:
+    """Get the module graph of a project's script files and the entry point's preload set."""
+    try:
+        manager = ProjectStructureManager(project_id)
+        result = manager.get_import_graph()
+        
+        if not result['success']:
+            raise HTTPException(status_code=404, detail=result.get('error', 'Project manifest not found'))
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get imports: {str(e)}")
+
+
 @router.get("/projects/{project_id}/files/{file_path:path}")
 async def get_project_file(project_id: str, file_path: str) -> Dict[str, Any]:
     """Get individual file content with metadata."""
@@ -396,10 +516,10 @@ async def preview_project_in_new_tab(project_id: str):
         html_content = index_file['content']
         base_url = f"/api/v1/projects/{project_id}/assets/"
         
-        # Inject base tag for relative URLs
+        # Inject base tag for relative URLs, and preload the modules the entry point imports
         html_content = html_content.replace(
             '<head>',
-            f'<head><base href="{base_url}">'
+            f'<head><base href="{base_url}">{manager.get_preload_links()}'
         )
         
         return Response(
@@ -445,14 +565,28 @@ async def serve_project_asset(project_id: str, file_path: str):
         raise HTTPException(status_code=500, detail=f"Failed to serve asset: {str(e)}")
 
 
-async def _generate_website_task(
+def _generate_website_task(
     project_id: str,
     description: str,
     requirements: List[str],
-    style_preferences: Dict[str, Any]
+    style_preferences: Dict[str, Any],
+    draft: bool = False
 ) -> None:
-    """Background task to generate website."""
+    """Background task to generate website.
+    
+    A plain function, so Starlette runs it in its threadpool: the crew's
+    kickoff() calls block for whole stages, and on the event loop they would
+    hold back the status, events, file and draft preview requests that the
+    streamed files are meant for. The crew's coroutine gets its own event
+    loop in the worker thread.
+    
+    For draft projects the refined files are staged and swapped in for the
+    draft in one step once they are complete.
+    """
     try:
+        # Imported here so the API boots without loading crewai and langchain
+        from backend.crew.website_crew import WebsiteCrew
+        
         # Initialize the website crew
         crew = WebsiteCrew()
         
@@ -461,12 +595,13 @@ async def _generate_website_task(
         project_manager.update_project_status(project_id, "in_progress", "Initializing crew...")
         
         # Run the crew
-        result = await crew.generate_website(
+        result = asyncio.run(crew.generate_website(
             description=description,
             requirements=requirements,
             style_preferences=style_preferences,
-            project_id=project_id
-        )
+            project_id=project_id,
+            staged=draft
+        ))
         
         # Update final status
         if result.get("success"):
@@ -476,15 +611,23 @@ async def _generate_website_task(
                 crew_output = result.get("result", "")
                 if crew_output:
                     # Parse files and create structure
-                    parser = ProjectFileParser(str(crew_output), project_id)
-                    parsed_result = parser.parse()
+                    timings = {}
+                    with time_stage(timings, 'parse'):
+                        # Cached next to parsed_files.json so rebuilding the structure skips re-parsing
+                        parsed_result = parse_project_files_cached(str(crew_output), project_id)
+                    _record_pipeline_timings(project_manager, project_id, timings)
                     
                     if parsed_result['success']:
                         # Create project structure
                         from backend.utils.project_structure import create_project_structure
-                        structure_result = create_project_structure(project_id, parsed_result)
+                        structure_result = create_project_structure(project_id, parsed_result, staged=draft)
+                        _record_pipeline_timings(project_manager, project_id, structure_result.get('timings', {}))
                         
                         if structure_result['success']:
+                            if draft:
+                                project_manager.add_event(project_id, "files_swapped", {
+                                    "total_files": structure_result['total_files']
+                                })
                             project_manager.update_project_status(
                                 project_id, 
                                 "completed", 
@@ -530,3 +673,54 @@ async def _generate_website_task(
             "failed", 
             f"Generation failed: {str(e)}"
         )
+
+
+
+def _start_draft_preview(
+    project_manager: ProjectManager,
+    project_id: str,
+    description: str,
+    requirements: List[str],
+    style_preferences: Dict[str, Any]
+) -> Optional[str]:
+    """Write the template-only draft and start its preview; return the preview URL."""
+    try:
+        timings = {}
+        with time_stage(timings, 'draft'):
+            draft_result = create_draft_project(project_id, description, requirements, style_preferences)
+            if not draft_result.get('success'):
+                project_manager.add_error(project_id, f"Draft creation failed: {draft_result.get('error', 'Unknown error')}")
+                return None
+            
+            preview_result = preview_manager.start_preview(project_id)
+            preview_url = preview_result.get('url') if preview_result.get('success') else None
+        
+        # Time to first preview, including starting the preview server
+        project_manager.record_stage_metrics(project_id, "draft", {
+            "wall_time": timings['draft'],
+            "write_time": draft_result['wall_time'],
+            "files": draft_result['total_files'],
+            "preview_started": preview_url is not None
+        })
+        project_manager.add_event(project_id, "draft_ready", {
+            "total_files": draft_result['total_files'],
+            "preview_url": preview_url
+        })
+        return preview_url
+        
+    except Exception as e:
+        print(f"Failed to create draft for {project_id}: {str(e)}")
+        return None
+
+
+def _record_pipeline_timings(
+    project_manager: ProjectManager,
+    project_id: str,
+    timings: Dict[str, float]
+) -> None:
+    """Persist post-processing stage durations (parse, inject, write, zip)."""
+    for stage, wall_time in timings.items():
+        try:
+            project_manager.record_stage_metrics(project_id, stage, {"wall_time": wall_time})
+        except Exception as e:
+            print(f"Failed to record {stage} timing for {project_id}: {str(e)}")
@@ -1,14 +1,51 @@
 """CrewAI crew for website generation."""
 
+import asyncio
 import os
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
 
 from backend.agents.product_manager import ProductManagerAgent
 from backend.agents.ui_designer import UIDesignerAgent
 from backend.agents.software_engineer import SoftwareEngineerAgent
+from backend.llm.prompt_cache import CACHE_BREAKPOINT
+from backend.utils.component_library import (
+    LIBRARY_COMPONENTS,
+    SITE_CONFIG_FILE,
+    required_component_files,
+    site_config_example
+)
+from backend.utils.context_compactor import ContextCompactor, compact_context
+from backend.utils.design_cache import DesignSystemCache, website_category
+from backend.utils.file_parser import detect_truncation
+from backend.utils.generation_metrics import estimate_tokens, time_stage
 from backend.utils.project_manager import ProjectManager
+from backend.utils.similarity_index import RequestSimilarityIndex
+from backend.utils.streaming_writer import StreamingFileWriter
+from backend.utils.task_outputs import CODE_TASK, DESIGN_TASK, SPECIFICATION_TASK, TaskOutputStore
+from backend.utils.template_engine import TEMPLATE_MAPPINGS
+
+# Added from templates after generation, so imports of them are not missing files
+TEMPLATE_FILES = tuple(TEMPLATE_MAPPINGS.values())
+
+# Files the development task asks for, with the note given to the engineer
+EXPECTED_FILES = {
+    "src/App.tsx": "complete main component",
+    "src/components/Navbar.tsx": "complete navigation component",
+    "src/components/Hero.tsx": "complete hero section",
+    "src/components/About.tsx": "complete about section",
+    "src/components/Contact.tsx": "complete contact section",
+    "src/components/Footer.tsx": "complete footer component",
+    "package.json": "with all dependencies",
+    "README.md": "with setup instructions"
+}
+
+# With the component library the engineer only fills slots; the rest is rendered
+LIBRARY_EXPECTED_FILES = {
+    SITE_CONFIG_FILE: "slot values for the component library"
+}
 
 
 class WebsiteCrew:
@@ -22,43 +59,104 @@ class WebsiteCrew:
         self.ui_designer = UIDesignerAgent()
         self.software_engineer = SoftwareEngineerAgent()
         
-        # Create the crew
-        self.crew = Crew(
-            agents=[
-                self.product_manager.agent,
-                self.ui_designer.agent,
-                self.software_engineer.agent
-            ],
-            tasks=[],  # Tasks will be created dynamically
-            process=Process.sequential,
-            verbose=True
-        )
+        # Context compaction between the design and development stages
+        self.compaction_enabled = os.getenv("CONTEXT_COMPACTION", "true").lower() == "true"
+        self.specification_token_budget = int(os.getenv("COMPACTION_SPEC_TOKEN_BUDGET", "600"))
+        self.design_token_budget = int(os.getenv("COMPACTION_DESIGN_TOKEN_BUDGET", "900"))
+        
+        # Reuse the specification of a near-duplicate earlier request
+        self.spec_reuse_enabled = os.getenv("SPEC_REUSE_ENABLED", "true").lower() == "true"
+        self.similarity_index = RequestSimilarityIndex()
+        
+        # Reuse the design system (palette, typography, Tailwind) of matching style preferences
+        self.design_cache_enabled = os.getenv("DESIGN_CACHE_ENABLED", "true").lower() == "true"
+        self.design_cache_skip_designer = os.getenv("DESIGN_CACHE_SKIP_DESIGNER", "false").lower() == "true"
+        self.design_cache = DesignSystemCache()
+        
+        # Draft the design from the raw request while the product manager writes the specification
+        self.speculative_design_enabled = os.getenv("SPECULATIVE_DESIGN_ENABLED", "false").lower() == "true"
+        
+        # Follow-up requests for files cut off at the engineer's max_tokens
+        self.max_continuations = int(os.getenv("TRUNCATION_MAX_CONTINUATIONS", "2"))
+        
+        # Fill the vetted component library instead of generating boilerplate sections
+        self.component_library_enabled = os.getenv("COMPONENT_LIBRARY_ENABLED", "true").lower() == "true"
+        self.expected_files = LIBRARY_EXPECTED_FILES if self.component_library_enabled else EXPECTED_FILES
+        
+        # End the engineer's stream once every required file has closed and validates
+        self.early_stop_enabled = os.getenv("EARLY_STOP_ENABLED", "true").lower() == "true"
     
     async def generate_website(
         self,
         description: str,
         requirements: List[str],
         style_preferences: Dict[str, Any],
-        project_id: str
+        project_id: str,
+        staged: bool = False
     ) -> Dict[str, Any]:
-        """Generate a website using the crew."""
+        """Generate a website using the crew.
+        
+        Each task runs as its own single-agent crew so that upstream outputs
+        can be compacted before they are handed to the next stage and every
+        stage is measured separately. With ``staged`` the streamed files are
+        written to the staging directory so a draft preview stays intact.
+        """
         try:
-            # Update status
+            # Stage 1: Product Manager - Define requirements and structure
             self.project_manager.update_project_status(
-                project_id, "in_progress", "Creating tasks...", progress=10
+                project_id, "in_progress", "Analyzing requirements...", progress=10
             )
+            specification = self._reuse_specification(project_id, description, requirements, style_preferences)
+            if specification is None and self.speculative_design_enabled:
+                # Stages 1 and 2 in parallel, then a short reconcile pass
+                specification, design = await self._speculative_design(
+                    project_id, description, requirements, style_preferences
+                )
+            else:
+                if specification is None:
+                    requirements_task = self._create_requirements_task(description, requirements, style_preferences)
+                    specification = self._run_stage(project_id, "requirements", self.product_manager, requirements_task).raw
+                    self._store_specification(project_id, specification, description, requirements, style_preferences)
+                
+                # Stage 2: UI Designer - Create design and layout
+                self.project_manager.update_project_status(
+                    project_id, "in_progress", "Designing user interface...", progress=30
+                )
+                design = self._design(project_id, specification, description, requirements, style_preferences)
+            self._store_task_output(project_id, DESIGN_TASK, design)
             
-            # Create tasks for the crew
-            tasks = self._create_tasks(description, requirements, style_preferences, project_id)
-            self.crew.tasks = tasks
+            # Hand the engineer a structured summary instead of the full prose
+            specification_context, design_context = self._compact_context(project_id, specification, design)
             
-            # Update status
+            # Stage 3: Software Engineer - Implement the website
             self.project_manager.update_project_status(
-                project_id, "in_progress", "Running crew...", progress=20
+                project_id, "in_progress", "Implementing website...", progress=50
             )
+            if self.component_library_enabled:
+                development_task = self._create_library_development_task(specification_context, design_context, project_id)
+            else:
+                development_task = self._create_development_task(specification_context, design_context, project_id)
             
-            # Execute the crew
-            result = self.crew.kickoff()
+            # Stream the engineer's output so each file is written as soon as it closes
+            writer = StreamingFileWriter(project_id, self.project_manager, staged=staged)
+            self.software_engineer.llm.stream_listener = writer.feed
+            if self.early_stop_enabled:
+                self.software_engineer.llm.stream_stop = lambda: self._required_files_complete(writer.parser.closed_blocks)
+            try:
+                result = self._run_stage(
+                    project_id, "development", self.software_engineer, development_task,
+                    context_tokens=estimate_tokens(specification_context) + estimate_tokens(design_context),
+                    component_library=self.component_library_enabled
+                )
+            finally:
+                self.software_engineer.llm.stream_listener = None
+                self.software_engineer.llm.stream_stop = None
+            writer.close()
+            
+            # Ask only for the files that were cut off or never generated
+            output = self._complete_truncated_output(
+                project_id, result.raw, specification_context, design_context
+            )
             
             # Update status
             self.project_manager.update_project_status(
@@ -66,7 +164,7 @@ class WebsiteCrew:
             )
             
             # Process and save results
-            self._process_results(result, project_id)
+            self._process_results(output, project_id)
             
             # Final status update
             self.project_manager.update_project_status(
@@ -75,8 +173,9 @@ class WebsiteCrew:
             
             return {
                 "success": True,
-                "result": result,
-                "project_id": project_id
+                "result": output,
+                "project_id": project_id,
+                "streamed_files": list(writer.written_files)
             }
             
         except Exception as e:
@@ -90,24 +189,338 @@ class WebsiteCrew:
                 "project_id": project_id
             }
     
-    def _create_tasks(
+    def _run_stage(self, project_id: str, stage: str, agent: Any, task: Task, **extra_metrics: Any) -> Any:
+        """Run a single task with its agent and record the stage metrics."""
+        crew = Crew(
+            agents=[agent.agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=True
+        )
+        
+        agent.llm.project_id = project_id
+        agent.llm.reset_usage()
+        timings: Dict[str, float] = {}
+        with time_stage(timings, stage):
+            result = crew.kickoff()
+        
+        metrics = agent.llm.get_usage()
+        metrics['wall_time'] = timings[stage]
+        metrics['output_chars'] = len(result.raw or '')
+        metrics.update(extra_metrics)
+        self._record_stage_metrics(project_id, stage, metrics)
+        
+        return result
+    
+    def _required_files_complete(self, closed_blocks: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether every required file of the development task has closed and validates.
+        
+        The required set is the task's expected files plus, once site.json has
+        closed, the custom components its sections call for.
+        """
+        required = list(self.expected_files)
+        site_config = closed_blocks.get(SITE_CONFIG_FILE)
+        if site_config is not None and site_config["is_valid"]:
+            required.extend(required_component_files(site_config["content"]))
+        
+        return all(
+            any(
+                block["is_valid"] and (path == expected or path.endswith("/" + expected))
+                for path, block in closed_blocks.items()
+            )
+            for expected in required
+        )
+    
+    def _complete_truncated_output(
         self,
+        project_id: str,
+        output: str,
+        specification: str,
+        design: str
+    ) -> str:
+        """Request continuations for incomplete or missing files and stitch them in."""
+        llm = self.software_engineer.llm
+        check = detect_truncation(output, list(self.expected_files), llm.usage.get("stop_reason"), TEMPLATE_FILES)
+        if not check["truncated"]:
+            return output
+        
+        print(f"Truncated development output for {project_id}: {'; '.join(check['reasons'])}")
+        requested_files = check["incomplete_files"] + check["missing_files"]
+        metrics: Dict[str, Any] = {
+            "reasons": check["reasons"],
+            "requested_files": requested_files,
+            "attempts": 0
+        }
+        
+        llm.project_id = project_id
+        llm.reset_usage()
+        timings: Dict[str, float] = {}
+        with time_stage(timings, "continuation"):
+            while check["incomplete_files"] + check["missing_files"] and metrics["attempts"] < self.max_continuations:
+                metrics["attempts"] += 1
+                prompt = self._create_continuation_prompt(check, specification, design)
+                try:
+                    continuation = llm.call(prompt)
+                except Exception as e:
+                    self.project_manager.add_error(project_id, f"Continuation request failed: {str(e)}")
+                    break
+                
+                # Drop the cut-off block; later blocks for the same path replace earlier ones
+                output = f"{check['complete_output']}\n\n{continuation.strip()}"
+                check = detect_truncation(output, list(self.expected_files), llm.usage.get("stop_reason"), TEMPLATE_FILES)
+        
+        metrics.update(llm.get_usage())
+        metrics["wall_time"] = timings["continuation"]
+        metrics["unrecovered_files"] = check["incomplete_files"] + check["missing_files"]
+        self._record_stage_metrics(project_id, "continuation", metrics)
+        
+        return output
+    
+    def _create_continuation_prompt(self, check: Dict[str, Any], specification: str, design: str) -> str:
+        """Build the follow-up request for the files a truncated response is missing."""
+        importers = {item["path"]: item["importer"] for item in check.get("unresolved_imports", [])}
+        notes = {**{path: f"imported by {importer}" for path, importer in importers.items()}, **self.expected_files}
+        files = "\n".join(
+            f"- {path} ({notes[path]})" if path in notes else f"- {path}"
+            for path in check["incomplete_files"] + check["missing_files"]
+        )
+        
+        return f"""Your previous response was cut off before these files were complete:
+{files}
+
+Output ONLY these files, each COMPLETE from its first to its last line, in the same format
+as before, numbering them from {check['next_number']}:
+
+{check['next_number']}. path/to/File.tsx
+
+```tsx
+file content
+```
+
+Keep component names, props and imports consistent with the files already generated.
+
+PROJECT SPECIFICATION:
+{specification}
+
+DESIGN SPECIFICATION:
+{design}
+"""
+    
+    def _reuse_specification(
+        self,
+        project_id: str,
         description: str,
         requirements: List[str],
-        style_preferences: Dict[str, Any],
-        project_id: str
-    ) -> List[Task]:
-        """Create tasks for the crew."""
+        style_preferences: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the stored specification of a near-duplicate project, if any."""
+        if not self.spec_reuse_enabled:
+            return None
+        
+        timings: Dict[str, float] = {}
+        with time_stage(timings, "requirements"):
+            try:
+                match = self.similarity_index.find_similar(
+                    description, requirements, style_preferences, exclude=project_id
+                )
+            except Exception as e:
+                print(f"Similarity lookup failed for {project_id}: {str(e)}")
+                return None
+            
+            if not match:
+                return None
+            
+            specification = TaskOutputStore(match["project_id"], str(self.project_manager.projects_dir)).load(SPECIFICATION_TASK)
+            if specification is None:
+                # The matched project was removed from disk - forget it
+                self.similarity_index.remove(match["project_id"])
+                return None
+        
+        self._record_stage_metrics(project_id, "requirements", {
+            "llm_calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "wall_time": timings["requirements"],
+            "output_chars": len(specification),
+            "reused_from": match["project_id"],
+            "similarity": match["similarity"]
+        })
+        self._store_task_output(project_id, SPECIFICATION_TASK, specification)
+        
+        return specification
+    
+    def _store_specification(
+        self,
+        project_id: str,
+        specification: str,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> None:
+        """Save the specification and index the request for later reuse."""
+        try:
+            TaskOutputStore(project_id, str(self.project_manager.projects_dir)).save(SPECIFICATION_TASK, specification)
+            if self.spec_reuse_enabled:
+                self.similarity_index.add(project_id, description, requirements, style_preferences)
+        except Exception as e:
+            print(f"Failed to store specification for {project_id}: {str(e)}")
+    
+    def _design(
+        self,
+        project_id: str,
+        specification: str,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> str:
+        """Run the design stage, reusing a cached design system when one matches.
+        
+        On a hit the designer only works out layout and components (or is
+        skipped entirely with DESIGN_CACHE_SKIP_DESIGNER); on a miss the new
+        design system is cached for later requests.
+        """
+        if not self.design_cache_enabled:
+            design_task = self._create_design_task(specification)
+            return self._run_stage(project_id, "design", self.ui_designer, design_task).raw
+        
+        category = website_category(description, requirements)
+        try:
+            cached = self.design_cache.get(style_preferences, category)
+        except Exception as e:
+            print(f"Design cache lookup failed for {project_id}: {str(e)}")
+            cached = None
+        
+        if cached is None:
+            design_task = self._create_design_task(specification)
+            design = self._run_stage(
+                project_id, "design", self.ui_designer, design_task,
+                design_cache="miss", design_category=category
+            ).raw
+            design_system = ContextCompactor().extract_design_system(design)
+            if design_system:
+                try:
+                    self.design_cache.put(style_preferences, category, design_system, project_id)
+                except Exception as e:
+                    print(f"Failed to cache design system for {project_id}: {str(e)}")
+            return design
+        
+        design_system = cached["design_system"]
+        if self.design_cache_skip_designer:
+            self._record_stage_metrics(project_id, "design", {
+                "llm_calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "wall_time": 0.0,
+                "output_chars": len(design_system),
+                "design_cache": "hit",
+                "design_category": category,
+                "reused_from": cached["source_project"]
+            })
+            return design_system
+        
+        design_task = self._create_design_task(specification, design_system)
+        layout = self._run_stage(
+            project_id, "design", self.ui_designer, design_task,
+            design_cache="hit", design_category=category, reused_from=cached["source_project"]
+        ).raw
+        return f"{design_system}\n\n{layout}"
+    
+    async def _speculative_design(
+        self,
+        project_id: str,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Design from the raw request while the specification is written, then reconcile.
+        
+        Most design decisions (palette, typography, layout) only depend on the
+        request, so the designer starts alongside the product manager. Once the
+        specification is done the designer lists the changes it calls for,
+        which are appended to the draft design. The "speculation" stage
+        reports the wall time saved over running both stages in sequence and
+        the tokens spent on the extra reconcile pass.
+        """
+        self.project_manager.update_project_status(
+            project_id, "in_progress", "Analyzing requirements and drafting the design...", progress=10
+        )
+        requirements_task = self._create_requirements_task(description, requirements, style_preferences)
+        request_brief = self._create_request_brief(description, requirements, style_preferences)
+        
+        timings: Dict[str, float] = {}
+        with time_stage(timings, "parallel"):
+            specification_result, draft_design = await asyncio.gather(
+                asyncio.to_thread(self._run_stage, project_id, "requirements", self.product_manager, requirements_task),
+                asyncio.to_thread(self._design, project_id, request_brief, description, requirements, style_preferences)
+            )
+        specification = specification_result.raw
+        self._store_specification(project_id, specification, description, requirements, style_preferences)
+        
+        self.project_manager.update_project_status(
+            project_id, "in_progress", "Reconciling the design with the specification...", progress=30
+        )
+        reconcile_task = self._create_reconcile_task(specification, draft_design)
+        changes = self._run_stage(project_id, "design_reconcile", self.ui_designer, reconcile_task).raw.strip()
+        
+        stages = self.project_manager.get_project_status(project_id)["metrics"]["stages"]
+        requirements_time = stages["requirements"].get("wall_time", 0)
+        design_time = stages["design"].get("wall_time", 0)
+        reconcile = stages["design_reconcile"]
+        self._record_stage_metrics(project_id, "speculation", {
+            "parallel_wall_time": timings["parallel"],
+            "overlapped_time": round(max(0.0, requirements_time + design_time - timings["parallel"]), 4),
+            "saved_wall_time": round(requirements_time + design_time - timings["parallel"] - reconcile.get("wall_time", 0), 4),
+            "extra_input_tokens": reconcile.get("input_tokens", 0),
+            "extra_output_tokens": reconcile.get("output_tokens", 0),
+            "design_changed": not changes.lower().startswith("no changes")
+        })
+        
+        if changes.lower().startswith("no changes"):
+            return specification, draft_design
+        return specification, f"{draft_design}\n\n## Section and component changes\n{changes}"
+    
+    def _compact_context(self, project_id: str, specification: str, design: str) -> Tuple[str, str]:
+        """Compact the specification and design for the development stage."""
+        if not self.compaction_enabled:
+            return specification, design
+        
+        timings: Dict[str, float] = {}
+        with time_stage(timings, "compaction"):
+            compacted = compact_context(
+                specification,
+                design,
+                self.specification_token_budget,
+                self.design_token_budget
+            )
         
-        # Task 1: Product Manager - Define requirements and structure
-        requirements_task = Task(
+        metrics = {key: value for key, value in compacted.items() if key not in ("specification", "design")}
+        metrics['wall_time'] = timings["compaction"]
+        self._record_stage_metrics(project_id, "compaction", metrics)
+        
+        return compacted['specification'], compacted['design']
+    
+    def _record_stage_metrics(self, project_id: str, stage: str, metrics: Dict[str, Any]) -> None:
+        """Persist the metrics of a finished stage on the project record."""
+        try:
+            self.project_manager.record_stage_metrics(project_id, stage, metrics)
+        except Exception as e:
+            print(f"Failed to record {stage} metrics for {project_id}: {str(e)}")
+    
+    # Task descriptions keep their fixed instructions ahead of CACHE_BREAKPOINT and
+    # the project-specific input after it, so the instructions are prompt-cached
+    # together with the agent's system prompt once they reach the model's minimum
+    
+    def _create_requirements_task(
+        self,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> Task:
+        """Create the product manager's specification task."""
+        return Task(
             description=f"""
             Analyze the website request and create a comprehensive project specification.
             
-            Website Description: {description}
-            Requirements: {', '.join(requirements) if requirements else 'None specified'}
-            Style Preferences: {style_preferences}
-            
             Create a detailed specification including:
             1. Project overview and goals
             2. Target audience analysis
@@ -117,13 +530,48 @@ class WebsiteCrew:
             6. Success criteria
             
             Output should be a structured document that the design and development team can use.
+            {CACHE_BREAKPOINT}
+            Website Description: {description}
+            Requirements: {', '.join(requirements) if requirements else 'None specified'}
+            Style Preferences: {style_preferences}
             """,
             agent=self.product_manager.agent,
             expected_output="A comprehensive project specification document"
         )
+    
+    def _create_design_task(self, specification: str, design_system: Optional[str] = None) -> Task:
+        """Create the UI designer's task from the project specification.
         
-        # Task 2: UI Designer - Create design and layout
-        design_task = Task(
+        With a cached ``design_system`` the designer keeps its palette,
+        typography and Tailwind classes and only designs layout and components.
+        """
+        if design_system:
+            return Task(
+                description=f"""
+            Based on the project specification, design the layout and components of the website.
+            
+            The palette, typography and Tailwind CSS classes are fixed by the design system
+            below - reuse them as they are and do not repeat them.
+            
+            Create:
+            1. Wireframes and layout structure
+            2. Component specifications
+            3. Responsive design guidelines
+            4. User experience flow
+            
+            The design should be implementable with React and Tailwind CSS.
+            {CACHE_BREAKPOINT}
+            DESIGN SYSTEM:
+            {design_system}
+            
+            PROJECT SPECIFICATION:
+            {specification}
+            """,
+                agent=self.ui_designer.agent,
+                expected_output="Layout and component specification that uses the given design system"
+            )
+        
+        return Task(
             description=f"""
             Based on the project specification, create a complete UI/UX design for the website.
             
@@ -137,14 +585,53 @@ class WebsiteCrew:
             
             Focus on modern, clean design that follows best practices.
             The design should be implementable with React and Tailwind CSS.
+            {CACHE_BREAKPOINT}
+            PROJECT SPECIFICATION:
+            {specification}
             """,
             agent=self.ui_designer.agent,
-            expected_output="Complete UI/UX design specification with component details",
-            context=[requirements_task]
+            expected_output="Complete UI/UX design specification with component details"
         )
+    
+    def _create_request_brief(
+        self,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> str:
+        """Stand-in for the specification while the product manager is still writing it."""
+        return f"""(Draft from the website request - the full specification is not written yet)
+            Website Description: {description}
+            Requirements: {', '.join(requirements) if requirements else 'None specified'}
+            Style Preferences: {style_preferences}"""
+    
+    def _create_reconcile_task(self, specification: str, design: str) -> Task:
+        """Create the designer's pass that checks a draft design against the specification."""
+        compactor = ContextCompactor(self.specification_token_budget, self.design_token_budget)
+        return Task(
+            description=f"""
+            Your design was drafted from the website request before the project specification
+            was finished. Compare it with the specification.
+            
+            List ONLY the changes the design needs: sections, components, content or user
+            flows the specification adds, removes or changes. Do not repeat the parts of the
+            design that still hold. If nothing needs to change, answer exactly "No changes".
+            {CACHE_BREAKPOINT}
+            DRAFT DESIGN:
+            {compactor.compact_design(design)}
+            
+            PROJECT SPECIFICATION:
+            {specification}
+            """,
+            agent=self.ui_designer.agent,
+            expected_output='A short list of design changes, or "No changes"'
+        )
+    
+    def _create_development_task(self, specification: str, design: str, project_id: str) -> Task:
+        """Create the software engineer's implementation task."""
+        expected_files = "\n            ".join(f"- {path} ({note})" for path, note in EXPECTED_FILES.items())
         
-        # Task 3: Software Engineer - Implement the website
-        development_task = Task(
+        return Task(
             description=f"""
             Implement the website based on the project specification and design.
             
@@ -164,45 +651,88 @@ class WebsiteCrew:
             6. TypeScript for type safety
             
             Generate all necessary files with COMPLETE implementations:
-            - src/App.tsx (complete main component)
-            - src/components/Navbar.tsx (complete navigation component)
-            - src/components/Hero.tsx (complete hero section)
-            - src/components/About.tsx (complete about section)
-            - src/components/Contact.tsx (complete contact section)
-            - src/components/Footer.tsx (complete footer component)
-            - package.json with all dependencies
-            - README.md with setup instructions
+            {expected_files}
             
             IMPORTANT: Each file must be COMPLETE and FUNCTIONAL. Do not cut off mid-component.
             If you need to limit output size, create fewer but complete components rather than incomplete ones.
+            {CACHE_BREAKPOINT}
+            PROJECT SPECIFICATION:
+            {specification}
+            
+            DESIGN SPECIFICATION:
+            {design}
             
             Project ID for file saving: {project_id}
             """,
             agent=self.software_engineer.agent,
-            expected_output="Complete React application with all source files - every component must be fully implemented with proper closing tags",
-            context=[requirements_task, design_task]
+            expected_output="Complete React application with all source files - every component must be fully implemented with proper closing tags"
+        )
+    
+    def _create_library_development_task(self, specification: str, design: str, project_id: str) -> Task:
+        """Create the software engineer's task of filling the component library slots."""
+        library_components = "\n            ".join(
+            f"- {name}: {slots}" for name, slots in LIBRARY_COMPONENTS.items()
         )
         
-        return [requirements_task, design_task, development_task]
+        return Task(
+            description=f"""
+            Implement the website by filling the slots of our vetted component library.
+            
+            These components are already implemented, responsive and styled with Tailwind CSS:
+            {library_components}
+            
+            Fill their slots by outputting the site configuration as the first file:
+            
+            1. {SITE_CONFIG_FILE}
+            
+            ```json
+            {site_config_example()}
+            ```
+            
+            SLOT RULES:
+            - Write real, project-specific copy for every text slot - no placeholder text
+            - Colours are hex values (#RRGGBB) taken from the design's palette
+            - Link hrefs point at section ids (#home, #about, #contact) or full URLs
+            - "sections" lists the page sections in display order by component name
+            
+            Only when the design needs a section the library does not cover (a gallery,
+            pricing table, testimonials...), add its name to "sections" and implement it
+            as an additional numbered file:
+            
+            2. src/components/Gallery.tsx
+            
+            ```tsx
+            complete component
+            ```
+            
+            Custom components default-export a React component without props, use the section
+            name in lowercase as their element id, may import {{ siteContent }} from '../content'
+            for the theme colours, and must be COMPLETE with proper closing tags.
+            Do NOT output App.tsx, package.json, README.md or the library components -
+            they are generated from {SITE_CONFIG_FILE}.
+            {CACHE_BREAKPOINT}
+            PROJECT SPECIFICATION:
+            {specification}
+            
+            DESIGN SPECIFICATION:
+            {design}
+            
+            Project ID for file saving: {project_id}
+            """,
+            agent=self.software_engineer.agent,
+            expected_output=f"{SITE_CONFIG_FILE} with every slot filled, plus complete files for any custom sections"
+        )
     
     def _process_results(self, result: Any, project_id: str) -> None:
-        """Process and save the crew results."""
+        """Save the engineer's final output, the input of the file parser."""
         try:
-            # The result should contain the generated files
-            # This is a simplified version - in practice, you'd parse the agent outputs
-            # and extract the actual file contents
-            
-            # For now, save a basic result file
-            self.project_manager.save_project_file(
-                project_id,
-                "crew_output.txt",
-                str(result)
-            )
-            
-            # In a real implementation, you would:
-            # 1. Parse the software engineer's output to extract React files
-            # 2. Save each file to the project directory
-            # 3. Create a proper project structure
-            
+            TaskOutputStore(project_id, str(self.project_manager.projects_dir)).save(CODE_TASK, str(result))
         except Exception as e:
             self.project_manager.add_error(project_id, f"Error processing results: {str(e)}")
+    
+    def _store_task_output(self, project_id: str, task: str, content: str) -> None:
+        """Save a stage's raw output so later steps can load it on its own."""
+        try:
+            TaskOutputStore(project_id, str(self.project_manager.projects_dir)).save(task, content)
+        except Exception as e:
+            print(f"Failed to store the {task} output for {project_id}: {str(e)}")
@@ -0,0 +1 @@
+"""LLM client adapters shared by the CrewAI agents."""
@@ -0,0 +1,241 @@
+"""CrewAI LLM adapter that sends agent calls through a LangChain chat model."""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from crewai import BaseLLM
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from backend.llm.prompt_cache import apply_cache_breakpoints, min_cacheable_tokens
+from backend.llm.router import ROUTED_MODEL_KEY
+from backend.utils.generation_metrics import estimate_tokens
+
+# CrewAI rejects and retries a response that lacks this marker
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class AgentLLM(BaseLLM):
+    """Run CrewAI agent calls on a LangChain chat model and track their usage.
+
+    CrewAI converts any LLM object it does not recognise into its own LiteLLM
+    client, which discards the configured chat model and only reports
+    crew-wide token usage. Wrapping the chat model in this adapter keeps every
+    call on our client and records tokens, latency and retries per agent.
+    """
+
+    def __init__(
+        self,
+        chat_model: Any,
+        max_retries: int = 1,
+        retry_backoff: float = 2.0,
+        rate_limiter: Optional[Any] = None,
+        prompt_caching: bool = True
+    ):
+        model = getattr(chat_model, 'model', None) or getattr(chat_model, 'model_name', 'unknown')
+        super().__init__(model=model, temperature=getattr(chat_model, 'temperature', None))
+        self.chat_model = chat_model
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # Shared limiter every call waits on; project_id decides its fair-queue slot
+        self.rate_limiter = rate_limiter
+        self.project_id: Optional[str] = None
+        # Mark static prompt prefixes with cache_control (see prompt_cache.py)
+        self.prompt_caching = prompt_caching
+        # When set, responses are streamed and each text delta is passed to it
+        self.stream_listener: Optional[Callable[[str], None]] = None
+        # When set, checked after each delta once the final answer has started;
+        # returning True closes the stream so the provider stops generating
+        self.stream_stop: Optional[Callable[[], bool]] = None
+        self.usage: Dict[str, Any] = {}
+        self.reset_usage()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> str:
+        """Send the messages to the chat model, retrying failed requests."""
+        chat_messages = apply_cache_breakpoints(
+            self._to_chat_messages(messages),
+            self.prompt_caching,
+            min_cacheable_tokens(self.model)
+        )
+
+        estimated_tokens = sum(estimate_tokens(message_text(message)) for message in chat_messages)
+        
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.usage['rate_limit_wait'] += self.rate_limiter.acquire(self.project_id or 'default', estimated_tokens)
+            
+            start = time.perf_counter()
+            try:
+                if self.stream_listener is not None:
+                    response = self._stream(chat_messages)
+                else:
+                    response = self.chat_model.invoke(chat_messages, stop=self.stop or None)
+                break
+            except Exception as e:
+                self.usage['errors'] += 1
+                self.usage['llm_time'] += time.perf_counter() - start
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.usage['retries'] += 1
+                if self.rate_limiter is not None and is_rate_limit_error(e):
+                    # Hold every agent back instead of each retrying on its own
+                    self.rate_limiter.pause(self.retry_backoff * attempt)
+                else:
+                    time.sleep(self.retry_backoff * attempt)
+
+        self._record_response(response, time.perf_counter() - start)
+        if self.rate_limiter is not None:
+            # Charge the output and any difference from the input estimate
+            usage_metadata = getattr(response, 'usage_metadata', None) or {}
+            actual_tokens = usage_metadata.get('input_tokens', 0) + usage_metadata.get('output_tokens', 0)
+            self.rate_limiter.record_usage(actual_tokens - estimated_tokens)
+        return message_text(response)
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 200000
+
+    def reset_usage(self) -> None:
+        """Clear the accumulated usage counters."""
+        self.usage = {
+            'model': self.model,
+            'llm_calls': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_tokens': 0,
+            'cache_creation_tokens': 0,
+            'retries': 0,
+            'errors': 0,
+            'llm_time': 0.0,
+            'rate_limit_wait': 0.0,
+            'stop_reason': None
+        }
+        # Wrappers such as the hedging policy keep their own counters
+        if hasattr(self.chat_model, 'reset_usage'):
+            self.chat_model.reset_usage()
+
+    def get_usage(self) -> Dict[str, Any]:
+        """Return a snapshot of the usage counters."""
+        usage = dict(self.usage)
+        usage['llm_time'] = round(usage['llm_time'], 4)
+        usage['rate_limit_wait'] = round(usage['rate_limit_wait'], 4)
+        if hasattr(self.chat_model, 'get_usage'):
+            usage.update(self.chat_model.get_usage())
+        return usage
+
+    def _stream(self, chat_messages: List[BaseMessage]) -> AIMessage:
+        """Stream a response, forwarding text deltas to the stream listener."""
+        aggregate = None
+        answer_started = False
+        tail = ''
+        stream = self.chat_model.stream(chat_messages, stop=self.stop or None)
+        try:
+            for chunk in stream:
+                # Adding chunks merges content, usage and response metadata
+                aggregate = chunk if aggregate is None else aggregate + chunk
+
+                text = message_text(chunk)
+                if not text:
+                    continue
+                try:
+                    self.stream_listener(text)
+                except Exception as e:
+                    print(f"Stream listener failed: {str(e)}")
+
+                if self.stream_stop is None:
+                    continue
+                if not answer_started:
+                    # The marker may be split across deltas
+                    window = tail + text
+                    answer_started = FINAL_ANSWER_MARKER in window
+                    tail = window[-(len(FINAL_ANSWER_MARKER) - 1):]
+                if answer_started and self.stream_stop():
+                    return self._early_stop_response(chat_messages, aggregate)
+        finally:
+            # Closing the stream closes the HTTP response of an early stop
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+
+        return aggregate if aggregate is not None else AIMessage(content='')
+
+    def _early_stop_response(self, chat_messages: List[BaseMessage], aggregate: Any) -> AIMessage:
+        """Build the response of a stream that was stopped before the provider finished.
+
+        The final usage chunk never arrives, so missing token counts are estimated.
+        """
+        text = message_text(aggregate)
+        usage = dict(getattr(aggregate, 'usage_metadata', None) or {})
+        if not usage.get('input_tokens'):
+            usage['input_tokens'] = sum(estimate_tokens(message_text(message)) for message in chat_messages)
+        usage['output_tokens'] = max(usage.get('output_tokens', 0), estimate_tokens(text))
+        usage['total_tokens'] = usage['input_tokens'] + usage['output_tokens']
+
+        response_metadata = dict(getattr(aggregate, 'response_metadata', None) or {})
+        response_metadata['stop_reason'] = 'early_stop'
+        return AIMessage(content=text, usage_metadata=usage, response_metadata=response_metadata)
+
+    def _record_response(self, response: AIMessage, latency: float) -> None:
+        """Add token usage and timing from a chat model response."""
+        usage_metadata = getattr(response, 'usage_metadata', None) or {}
+        response_metadata = getattr(response, 'response_metadata', None) or {}
+
+        # A router names the model that served this call in the response
+        self.usage['model'] = response_metadata.get(ROUTED_MODEL_KEY) or self.model
+        self.usage['llm_calls'] += 1
+        self.usage['input_tokens'] += usage_metadata.get('input_tokens', 0)
+        self.usage['output_tokens'] += usage_metadata.get('output_tokens', 0)
+        # Prompt-cache hits and writes (already included in input_tokens)
+        token_details = usage_metadata.get('input_token_details') or {}
+        self.usage['cache_read_tokens'] += token_details.get('cache_read', 0) or 0
+        self.usage['cache_creation_tokens'] += token_details.get('cache_creation', 0) or 0
+        self.usage['llm_time'] += latency
+        self.usage['stop_reason'] = response_metadata.get('stop_reason')
+
+    def _to_chat_messages(self, messages: Union[str, List[Dict[str, str]]]) -> List[BaseMessage]:
+        """Convert CrewAI role/content dictionaries into LangChain messages."""
+        if isinstance(messages, str):
+            return [HumanMessage(content=messages)]
+
+        chat_messages: List[BaseMessage] = []
+        for message in messages:
+            role = message.get('role', 'user')
+            content = message.get('content', '')
+            if role == 'system':
+                chat_messages.append(SystemMessage(content=content))
+            elif role == 'assistant':
+                chat_messages.append(AIMessage(content=content))
+            else:
+                chat_messages.append(HumanMessage(content=content))
+        return chat_messages
+
+
+def message_text(message: Any) -> str:
+    """Extract the plain text from a chat message or message chunk."""
+    content = getattr(message, 'content', message)
+    if isinstance(content, str):
+        return content
+
+    # Anthropic responses may carry a list of typed content blocks
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get('type') == 'text':
+            parts.append(block.get('text', ''))
+    return ''.join(parts)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception is the provider rejecting a request with HTTP 429."""
+    return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
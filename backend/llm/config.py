@@ -0,0 +1,142 @@
+"""Per-agent model configuration and the shared model routers."""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict
+
+from backend.llm.hedging import HedgedChatModel, get_first_token_latencies
+from backend.llm.rate_limiter import get_rate_limiter
+from backend.llm.router import ModelRouter
+
+if TYPE_CHECKING:
+    from backend.llm.agent_llm import AgentLLM
+
+SONNET_MODEL = "claude-3-5-sonnet-20240620"
+HAIKU_MODEL = "claude-3-5-haiku-20241022"
+
+# Defaults per agent; each key can be overridden with <AGENT>_<KEY> in the environment,
+# e.g. PRODUCT_MANAGER_MODEL or SOFTWARE_ENGINEER_MAX_TOKENS
+AGENT_MODEL_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    # Specifications are short and structured - the fast tier is good enough
+    'product_manager': {
+        'model': HAIKU_MODEL,
+        'fallback_model': SONNET_MODEL,
+        'max_tokens': 4096,
+        'temperature': 0.1,
+        'p95_threshold': 30.0,
+        'hedging': False
+    },
+    'ui_designer': {
+        'model': SONNET_MODEL,
+        'fallback_model': HAIKU_MODEL,
+        'max_tokens': 8192,
+        'temperature': 0.3,
+        'p95_threshold': 90.0,
+        'hedging': False
+    },
+    'software_engineer': {
+        'model': SONNET_MODEL,
+        'fallback_model': HAIKU_MODEL,
+        'max_tokens': 8192,
+        'temperature': 0.2,
+        'p95_threshold': 240.0,
+        # Race a second request when the first is slow to start (costs extra tokens)
+        'hedging': False
+    }
+}
+
+_routers: Dict[str, ModelRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_agent_model_config(agent_name: str) -> Dict[str, Any]:
+    """Resolve the model settings of an agent from defaults and environment."""
+    config = dict(AGENT_MODEL_DEFAULTS[agent_name])
+    prefix = agent_name.upper()
+
+    for key, default in list(config.items()):
+        value = os.getenv(f"{prefix}_{key.upper()}")
+        if value is None:
+            continue
+        if isinstance(default, bool):
+            config[key] = value.lower() == "true"
+        else:
+            config[key] = type(default)(value) if not isinstance(default, str) else value
+
+    # An empty fallback model disables routing for the agent
+    config['fallback_model'] = config['fallback_model'] or None
+    config['error_rate_threshold'] = float(os.getenv("LLM_ROUTER_ERROR_RATE_THRESHOLD", "0.5"))
+    return config
+
+
+def create_chat_model(model: str, max_tokens: int, temperature: float) -> Any:
+    """Create the chat model client for the configured provider."""
+    if os.getenv("LLM_PROVIDER", "anthropic").lower() == "stub":
+        from backend.llm.stub import StubChatModel
+        return StubChatModel(model=model, latency=float(os.getenv("STUB_LLM_LATENCY", "0")))
+
+    from backend.llm.http_pool import PooledChatAnthropic
+    return PooledChatAnthropic(
+        model=model,
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+
+
+def get_model_router(agent_name: str) -> ModelRouter:
+    """Return the process-wide router of an agent, creating it on first use.
+
+    Routers are shared between crews so latency and error samples from
+    earlier generations inform the routing of later ones.
+    """
+    with _routers_lock:
+        if agent_name not in _routers:
+            config = get_agent_model_config(agent_name)
+            primary = create_chat_model(config['model'], config['max_tokens'], config['temperature'])
+            fallback = None
+            if config['fallback_model']:
+                fallback = create_chat_model(config['fallback_model'], config['max_tokens'], config['temperature'])
+
+            _routers[agent_name] = ModelRouter(
+                primary,
+                fallback,
+                p95_threshold=config['p95_threshold'],
+                error_rate_threshold=config['error_rate_threshold']
+            )
+        return _routers[agent_name]
+
+
+def create_agent_llm(agent_name: str) -> "AgentLLM":
+    """Create the CrewAI LLM of an agent on top of its shared router and rate limiter."""
+    # crewai is imported on first use so the API process starts without it
+    from backend.llm.agent_llm import AgentLLM
+    
+    chat_model: Any = get_model_router(agent_name)
+    if get_agent_model_config(agent_name)['hedging']:
+        chat_model = HedgedChatModel(
+            chat_model,
+            get_first_token_latencies(agent_name),
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "0.9")),
+            min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "5")),
+            initial_delay=float(os.getenv("HEDGE_INITIAL_DELAY", "30")),
+            max_extra_tokens=int(os.getenv("HEDGE_MAX_EXTRA_TOKENS", "20000"))
+        )
+    return AgentLLM(
+        chat_model,
+        rate_limiter=get_rate_limiter(),
+        prompt_caching=os.getenv("PROMPT_CACHING", "true").lower() == "true"
+    )
+
+
+def get_router_stats() -> Dict[str, Any]:
+    """Get the routing statistics of every router created so far."""
+    with _routers_lock:
+        routers = dict(_routers)
+    return {agent_name: router.get_stats() for agent_name, router in routers.items()}
+
+
+def reset_model_routers() -> None:
+    """Forget all routers (they are recreated from the environment on next use)."""
+    with _routers_lock:
+        _routers.clear()
@@ -0,0 +1,199 @@
+"""Hedged requests: race a second identical call when the first is slow to start."""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from backend.llm.router import percentile
+from backend.utils.generation_metrics import estimate_tokens
+
+# Time-to-first-token samples per agent, shared by every crew in the process
+_first_token_latencies: Dict[str, Deque[float]] = {}
+_first_token_latencies_lock = threading.Lock()
+
+
+def get_first_token_latencies(name: str, window: int = 50) -> Deque[float]:
+    """Return the shared time-to-first-token history of an agent."""
+    with _first_token_latencies_lock:
+        return _first_token_latencies.setdefault(name, deque(maxlen=window))
+
+
+class _Attempt:
+    """One in-flight streaming request."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.started = time.perf_counter()
+        self.cancelled = threading.Event()
+        # Set on the request that lost the race; its tokens count as hedge overhead
+        self.lost = False
+        self.output_chars = 0
+
+
+class HedgedChatModel:
+    """Wrap a chat model so slow-starting requests are hedged.
+
+    When no token has arrived after the configured percentile of past
+    time-to-first-token samples, an identical second request is started.
+    Whichever request streams first wins; the other is cancelled by closing
+    its stream (an attempt blocked before its first chunk is closed as soon
+    as that chunk arrives). Hedges stop once the estimated tokens spent on
+    losing requests would exceed ``max_extra_tokens``.
+    """
+
+    def __init__(
+        self,
+        chat_model: Any,
+        latency_history: Deque[float],
+        hedge_percentile: float = 0.9,
+        min_samples: int = 5,
+        initial_delay: float = 30.0,
+        max_extra_tokens: int = 20000
+    ):
+        self.chat_model = chat_model
+        self.latency_history = latency_history
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.max_extra_tokens = max_extra_tokens
+        self.model = getattr(chat_model, 'model', None) or getattr(chat_model, 'model_name', 'unknown')
+        self.temperature = getattr(chat_model, 'temperature', None)
+
+        self._lock = threading.Lock()
+        self.usage: Dict[str, int] = {}
+        self.reset_usage()
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for a first token before hedging."""
+        samples = sorted(self.latency_history)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        return percentile(samples, self.hedge_percentile)
+
+    def invoke(self, messages: List[Any], **kwargs: Any) -> Any:
+        """Run a hedged request and return the aggregated response."""
+        aggregate = None
+        for chunk in self.stream(messages, **kwargs):
+            aggregate = chunk if aggregate is None else aggregate + chunk
+        return aggregate
+
+    def stream(self, messages: List[Any], **kwargs: Any) -> Iterator[Any]:
+        """Stream from the first request to produce output."""
+        events: 'queue.Queue[Any]' = queue.Queue()
+        input_tokens = sum(estimate_tokens(str(getattr(message, 'content', message))) for message in messages)
+        attempts = [self._launch(1, messages, kwargs, events, input_tokens)]
+        deadline = time.perf_counter() + self.hedge_delay()
+        failed = set()
+
+        try:
+            # Wait for the first chunk from any attempt, hedging once the deadline passes
+            while True:
+                can_hedge = len(attempts) == 1 and self._hedge_budget_left(input_tokens)
+                timeout = max(0.0, deadline - time.perf_counter()) if can_hedge else None
+                try:
+                    attempt, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    attempts.append(self._launch(2, messages, kwargs, events, input_tokens))
+                    with self._lock:
+                        self.usage['hedges'] += 1
+                    continue
+
+                if kind == 'error':
+                    # Errors are not hedged; the caller's retry policy handles them
+                    failed.add(attempt.number)
+                    if len(failed) == len(attempts):
+                        raise payload
+                    continue
+
+                winner = attempt
+                break
+
+            self.latency_history.append(time.perf_counter() - winner.started)
+            if winner.number == 2:
+                with self._lock:
+                    self.usage['hedge_wins'] += 1
+            for attempt in attempts:
+                if attempt is not winner:
+                    attempt.lost = True
+                    attempt.cancelled.set()
+
+            while True:
+                if kind == 'chunk':
+                    yield payload
+                elif kind == 'done':
+                    return
+                elif kind == 'error':
+                    raise payload
+
+                attempt, kind, payload = events.get()
+                while attempt is not winner:
+                    attempt, kind, payload = events.get()
+        finally:
+            for attempt in attempts:
+                attempt.cancelled.set()
+
+    def reset_usage(self) -> None:
+        """Clear the hedge counters and the extra-token budget."""
+        with self._lock:
+            self.usage = {'hedges': 0, 'hedge_wins': 0, 'hedge_extra_tokens': 0}
+
+    def get_usage(self) -> Dict[str, int]:
+        """Return a snapshot of the hedge counters."""
+        with self._lock:
+            return dict(self.usage)
+
+    def _hedge_budget_left(self, input_tokens: int) -> bool:
+        """Whether another full request still fits in the extra-token budget."""
+        with self._lock:
+            return self.usage['hedge_extra_tokens'] + input_tokens <= self.max_extra_tokens
+
+    def _launch(
+        self,
+        number: int,
+        messages: List[Any],
+        kwargs: Dict[str, Any],
+        events: 'queue.Queue[Any]',
+        input_tokens: int
+    ) -> _Attempt:
+        """Start a streaming request in a background thread."""
+        attempt = _Attempt(number)
+        thread = threading.Thread(
+            target=self._run_attempt,
+            args=(attempt, messages, kwargs, events, input_tokens),
+            daemon=True
+        )
+        thread.start()
+        return attempt
+
+    def _run_attempt(
+        self,
+        attempt: _Attempt,
+        messages: List[Any],
+        kwargs: Dict[str, Any],
+        events: 'queue.Queue[Any]',
+        input_tokens: int
+    ) -> None:
+        """Forward the chunks of one request to the event queue until cancelled."""
+        try:
+            stream = self.chat_model.stream(messages, **kwargs)
+            try:
+                for chunk in stream:
+                    if attempt.cancelled.is_set():
+                        break
+                    attempt.output_chars += len(str(getattr(chunk, 'content', '') or ''))
+                    events.put((attempt, 'chunk', chunk))
+                else:
+                    events.put((attempt, 'done', None))
+            finally:
+                # Closing the generator closes the HTTP response of a cancelled request
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+        except Exception as e:
+            events.put((attempt, 'error', e))
+        finally:
+            if attempt.lost:
+                with self._lock:
+                    self.usage['hedge_extra_tokens'] += input_tokens + (attempt.output_chars + 3) // 4
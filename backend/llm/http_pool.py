@@ -0,0 +1,54 @@
+"""Shared keep-alive HTTP connection pool for the Anthropic chat models."""
+
+import os
+import threading
+from functools import cached_property
+from typing import Optional
+
+import anthropic
+import httpx
+from langchain_anthropic import ChatAnthropic
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide HTTP client shared by every agent model.
+
+    One pool means TLS connections to the API are opened once and kept
+    alive between calls, stages and generations. Requests use HTTP/1.1, so
+    concurrent agent calls each hold one of the pool's connections.
+    """
+    global _http_client
+
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+            _http_client = anthropic.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", str(max_connections))),
+                    keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "120"))
+                ),
+                timeout=httpx.Timeout(float(os.getenv("LLM_HTTP_TIMEOUT", "600")), connect=10.0)
+            )
+        return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared client (it is recreated on next use)."""
+    global _http_client
+
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+class PooledChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose API client sends requests through the shared pool."""
+
+    @cached_property
+    def _client(self) -> anthropic.Client:
+        return anthropic.Client(**self._client_params, http_client=get_http_client())
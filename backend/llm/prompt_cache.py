@@ -0,0 +1,88 @@
+"""Mark the static prefix of agent prompts for provider-side prompt caching."""
+
+from typing import Any, List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from backend.utils.generation_metrics import estimate_tokens
+
+# Placed in a task description between its static scaffold and the
+# project-specific part; everything before it is cached, the marker itself
+# is never sent
+CACHE_BREAKPOINT = "<<cache-breakpoint>>"
+
+EPHEMERAL_CACHE = {'type': 'ephemeral'}
+
+# Anthropic does not cache shorter prefixes, but the breakpoint still counts
+# against the four a request may carry
+MIN_CACHEABLE_TOKENS = 1024
+MIN_CACHEABLE_TOKENS_BY_MODEL = {'haiku': 2048}
+
+
+def min_cacheable_tokens(model: str) -> int:
+    """The shortest prefix, in tokens, the provider caches for a model."""
+    return next(
+        (tokens for family, tokens in MIN_CACHEABLE_TOKENS_BY_MODEL.items() if family in (model or '').lower()),
+        MIN_CACHEABLE_TOKENS
+    )
+
+
+def apply_cache_breakpoints(
+    messages: List[BaseMessage],
+    enabled: bool = True,
+    min_tokens: int = MIN_CACHEABLE_TOKENS
+) -> List[BaseMessage]:
+    """Mark the end of a prompt's static prefix as a single cache breakpoint.
+
+    The provider caches everything up to a breakpoint, so one breakpoint at
+    the first CACHE_BREAKPOINT of a user prompt covers the system prompt
+    (role, goal and backstory) and the task's scaffold together; without a
+    marker the system prompt alone is the prefix. The breakpoint is only
+    set when that prefix reaches ``min_tokens``. Breakpoint markers are
+    always removed.
+    """
+    marked = next(
+        (index for index, message in enumerate(messages)
+         if isinstance(message, HumanMessage) and isinstance(message.content, str)
+         and CACHE_BREAKPOINT in message.content),
+        None
+    )
+    if marked is None:
+        marked = next((index for index, message in enumerate(messages) if isinstance(message, SystemMessage)), None)
+
+    prefix_tokens = 0
+    if enabled and marked is not None:
+        prefix_tokens = sum(
+            estimate_tokens(message.content) for message in messages[:marked] if isinstance(message.content, str)
+        )
+        prefix_tokens += estimate_tokens(messages[marked].content.split(CACHE_BREAKPOINT, 1)[0])
+    cache_at = marked if enabled and prefix_tokens >= min_tokens else None
+
+    prepared: List[BaseMessage] = []
+    for index, message in enumerate(messages):
+        content = message.content
+        if not isinstance(content, str):
+            prepared.append(message)
+            continue
+
+        if isinstance(message, HumanMessage) and CACHE_BREAKPOINT in content:
+            prefix, rest = content.split(CACHE_BREAKPOINT, 1)
+            rest = rest.replace(CACHE_BREAKPOINT, '')
+            if index == cache_at:
+                prepared.append(HumanMessage(content=[_text_block(prefix, cached=True), _text_block(rest)]))
+            else:
+                prepared.append(HumanMessage(content=prefix + rest))
+        elif isinstance(message, SystemMessage) and index == cache_at:
+            prepared.append(SystemMessage(content=[_text_block(content, cached=True)]))
+        else:
+            prepared.append(message)
+
+    return prepared
+
+
+def _text_block(text: str, cached: bool = False) -> Any:
+    """Build an Anthropic text content block, optionally ending a cached prefix."""
+    block = {'type': 'text', 'text': text}
+    if cached:
+        block['cache_control'] = dict(EPHEMERAL_CACHE)
+    return block
@@ -0,0 +1,227 @@
+"""Process-wide token-bucket rate limiting for agent LLM calls."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+# Number of projects whose wait statistics are kept
+MAX_TRACKED_PROJECTS = 100
+
+
+class TokenBucketRateLimiter:
+    """Limit requests and tokens per minute across every agent in the process.
+
+    Both limits are token buckets that refill continuously and hold up to
+    one minute of budget. Callers waiting for budget are served round-robin
+    by project, so one large generation cannot starve the others. With a
+    ``state_file`` the bucket levels are kept in that file under an
+    exclusive flock, which shares the budget between worker processes
+    (fair queuing still applies within each process).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        state_file: Optional[str] = None
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.state_file = state_file if state_file and fcntl is not None else None
+
+        self._state = {'requests': requests_per_minute, 'tokens': tokens_per_minute,
+                       'updated': time.time(), 'paused_until': 0}
+        self._condition = threading.Condition()
+        # project_id -> waiting tickets; dict order is the round-robin order
+        self._waiting: 'OrderedDict[str, Deque[object]]' = OrderedDict()
+        self._wait_stats: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._totals = {'acquired': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'pauses': 0}
+
+    def acquire(self, project_id: str = 'default', tokens: int = 0) -> float:
+        """Block until a request of ``tokens`` fits in both buckets.
+
+        Returns the number of seconds spent waiting.
+        """
+        start = time.time()
+        ticket = object()
+
+        with self._condition:
+            self._waiting.setdefault(project_id, deque()).append(ticket)
+            try:
+                while True:
+                    delay = None
+                    if self._is_next(project_id, ticket):
+                        delay = self._take(tokens)
+                        if delay == 0:
+                            break
+                    self._condition.wait(delay)
+            finally:
+                self._dequeue(project_id, ticket)
+                self._condition.notify_all()
+
+        waited = time.time() - start
+        self._record_wait(project_id, waited)
+        return waited
+
+    def record_usage(self, tokens: int) -> None:
+        """Charge tokens only known after the call (e.g. output tokens).
+
+        The bucket may go negative, which delays the next callers.
+        """
+        if not self.tokens_per_minute or tokens <= 0:
+            return
+        with self._condition, self._locked_state() as state:
+            self._refill(state)
+            state['tokens'] -= tokens
+
+    def pause(self, seconds: float) -> None:
+        """Hold all callers back, e.g. after the provider answered 429."""
+        with self._condition:
+            with self._locked_state() as state:
+                state['paused_until'] = max(state['paused_until'], time.time() + seconds)
+            self._totals['pauses'] += 1
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limits, current bucket levels and wait-time metrics."""
+        with self._condition:
+            with self._locked_state() as state:
+                self._refill(state)
+                levels = dict(state)
+            totals = dict(self._totals)
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'shared_state_file': self.state_file,
+                'available_requests': round(levels['requests'], 2),
+                'available_tokens': round(levels['tokens']),
+                'paused_for': round(max(0.0, levels['paused_until'] - time.time()), 2),
+                'waiting': sum(len(tickets) for tickets in self._waiting.values()),
+                'acquired': totals['acquired'],
+                'waited': totals['waited'],
+                'pauses': totals['pauses'],
+                'total_wait': round(totals['total_wait'], 4),
+                'average_wait': round(totals['total_wait'] / totals['acquired'], 4) if totals['acquired'] else 0,
+                'max_wait': round(totals['max_wait'], 4),
+                'projects': {
+                    project_id: {key: round(value, 4) if isinstance(value, float) else value
+                                 for key, value in stats.items()}
+                    for project_id, stats in self._wait_stats.items()
+                }
+            }
+
+    def _is_next(self, project_id: str, ticket: object) -> bool:
+        """Whether the ticket heads the project that is next in round-robin order."""
+        first_project = next(iter(self._waiting))
+        return first_project == project_id and self._waiting[project_id][0] is ticket
+
+    def _dequeue(self, project_id: str, ticket: object) -> None:
+        """Remove a ticket and rotate its project to the back of the queue."""
+        tickets = self._waiting[project_id]
+        tickets.remove(ticket)
+        if tickets:
+            self._waiting.move_to_end(project_id)
+        else:
+            del self._waiting[project_id]
+
+    def _take(self, tokens: int) -> float:
+        """Debit one request and ``tokens``, or return how long to wait for them."""
+        with self._locked_state() as state:
+            self._refill(state)
+            now = time.time()
+            if state['paused_until'] > now:
+                return state['paused_until'] - now
+
+            # A call larger than the whole bucket waits for a full bucket instead of forever
+            tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+
+            waits = []
+            if self.requests_per_minute and state['requests'] < 1:
+                waits.append((1 - state['requests']) * 60 / self.requests_per_minute)
+            if tokens and state['tokens'] < tokens:
+                waits.append((tokens - state['tokens']) * 60 / self.tokens_per_minute)
+            if waits:
+                return max(max(waits), 0.001)
+
+            state['requests'] -= 1
+            state['tokens'] -= tokens
+            return 0
+
+    def _refill(self, state: Dict[str, float]) -> None:
+        """Add the budget earned since the last update, capped at one minute's worth."""
+        now = time.time()
+        elapsed = max(0.0, now - state['updated'])
+        state['requests'] = min(self.requests_per_minute, state['requests'] + elapsed * self.requests_per_minute / 60)
+        state['tokens'] = min(self.tokens_per_minute, state['tokens'] + elapsed * self.tokens_per_minute / 60)
+        state['updated'] = now
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, float]]:
+        """Yield the bucket state, loaded from and saved to the shared file if configured."""
+        if not self.state_file:
+            yield self._state
+            return
+
+        with open(self.state_file, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                except ValueError:
+                    state = dict(self._state)
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _record_wait(self, project_id: str, waited: float) -> None:
+        """Add a wait to the global and per-project metrics."""
+        with self._condition:
+            self._totals['acquired'] += 1
+            self._totals['total_wait'] += waited
+            self._totals['max_wait'] = max(self._totals['max_wait'], waited)
+            if waited >= 0.001:
+                self._totals['waited'] += 1
+
+            stats = self._wait_stats.setdefault(project_id, {'acquired': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            stats['acquired'] += 1
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+            self._wait_stats.move_to_end(project_id)
+            while len(self._wait_stats) > MAX_TRACKED_PROJECTS:
+                self._wait_stats.popitem(last=False)
+
+
+_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """Return the process-wide limiter, or None when both limits are disabled."""
+    global _rate_limiter
+
+    requests_per_minute = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "50"))
+    tokens_per_minute = float(os.getenv("LLM_TOKENS_PER_MINUTE", "80000"))
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucketRateLimiter(
+                requests_per_minute,
+                tokens_per_minute,
+                state_file=os.getenv("LLM_RATE_LIMIT_STATE_FILE") or None
+            )
+        return _rate_limiter
@@ -0,0 +1,191 @@
+"""Latency- and error-aware routing between a primary and a fallback chat model."""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Response metadata key naming the model that served a routed call
+ROUTED_MODEL_KEY = 'routed_model'
+
+
+class ModelRouter:
+    """Send calls to the primary model unless it is slow or failing.
+
+    The router keeps a sliding window of (latency, succeeded) samples per
+    model. Once the primary has enough samples and its p95 latency or error
+    rate crosses a threshold, calls go to the fallback model; every
+    ``probe_interval``-th call still goes to the primary so the router
+    notices when it recovers. A failed primary call is retried once on the
+    fallback. The router exposes ``invoke``/``stream`` like a chat model so
+    ``AgentLLM`` can wrap it unchanged; the model that served a call is
+    named in its response metadata under ``ROUTED_MODEL_KEY``.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        fallback: Optional[Any] = None,
+        p95_threshold: float = 60.0,
+        error_rate_threshold: float = 0.5,
+        window: int = 20,
+        min_samples: int = 5,
+        probe_interval: int = 5
+    ):
+        self.primary = primary
+        self.fallback = fallback
+        self.p95_threshold = p95_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.model = model_name(primary)
+        self.temperature = getattr(primary, 'temperature', None)
+
+        self._samples: Dict[str, Deque[Tuple[float, bool]]] = {
+            model_name(chat_model): deque(maxlen=window)
+            for chat_model in (primary, fallback) if chat_model is not None
+        }
+        self._calls = 0
+        self._fallback_calls = 0
+        # Input tokens and how many of them were prompt-cache reads and writes
+        self._input_tokens = 0
+        self._cache_read_input_tokens = 0
+        self._cache_creation_input_tokens = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: List[Any], **kwargs: Any) -> Any:
+        """Run a request on the selected model, falling back if the primary fails."""
+        candidates = self._candidates()
+        for chat_model in candidates:
+            start = time.perf_counter()
+            try:
+                response = chat_model.invoke(messages, **kwargs)
+            except Exception:
+                self._record(chat_model, time.perf_counter() - start, False)
+                if chat_model is candidates[-1]:
+                    raise
+                continue
+            self._record(chat_model, time.perf_counter() - start, True)
+            self._record_usage(getattr(response, 'usage_metadata', None))
+            tag_routed_model(response, model_name(chat_model))
+            return response
+
+    def stream(self, messages: List[Any], **kwargs: Any) -> Iterator[Any]:
+        """Stream from the selected model.
+
+        Falling back is only possible before the first chunk; once output
+        has been forwarded a failure is raised to the caller. A caller that
+        stops reading (an early stop or a cancelled hedge) ends the call, so
+        the time until then is recorded as its latency.
+        """
+        candidates = self._candidates()
+        for chat_model in candidates:
+            start = time.perf_counter()
+            started = False
+            try:
+                for chunk in chat_model.stream(messages, **kwargs):
+                    # Usage arrives in pieces, e.g. input tokens with the first chunk
+                    self._record_usage(getattr(chunk, 'usage_metadata', None))
+                    if not started:
+                        tag_routed_model(chunk, model_name(chat_model))
+                    started = True
+                    yield chunk
+            except GeneratorExit:
+                self._record(chat_model, time.perf_counter() - start, True)
+                raise
+            except Exception:
+                self._record(chat_model, time.perf_counter() - start, False)
+                if started or chat_model is candidates[-1]:
+                    raise
+                continue
+            self._record(chat_model, time.perf_counter() - start, True)
+            return
+
+    def is_primary_healthy(self) -> bool:
+        """Whether the primary's p95 latency and error rate are within limits."""
+        with self._lock:
+            stats = self._window_stats(self.model)
+        if stats['samples'] < self.min_samples:
+            return True
+        return stats['p95_latency'] <= self.p95_threshold and stats['error_rate'] <= self.error_rate_threshold
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-model latency and error statistics."""
+        healthy = self.is_primary_healthy()
+        with self._lock:
+            return {
+                'primary': self.model,
+                'fallback': model_name(self.fallback) if self.fallback is not None else None,
+                'primary_healthy': healthy,
+                'calls': self._calls,
+                'fallback_calls': self._fallback_calls,
+                'input_tokens': self._input_tokens,
+                'cache_read_input_tokens': self._cache_read_input_tokens,
+                'cache_creation_input_tokens': self._cache_creation_input_tokens,
+                'cache_hit_rate': round(self._cache_read_input_tokens / self._input_tokens, 3) if self._input_tokens else 0,
+                'models': {name: self._window_stats(name) for name in self._samples}
+            }
+
+    def _candidates(self) -> List[Any]:
+        """Models to try for the next call, in order."""
+        if self.fallback is None:
+            return [self.primary]
+
+        with self._lock:
+            probe = self._calls % self.probe_interval == 0
+        if probe or self.is_primary_healthy():
+            return [self.primary, self.fallback]
+        return [self.fallback]
+
+    def _record(self, chat_model: Any, latency: float, succeeded: bool) -> None:
+        """Add a latency sample for the model that served a call."""
+        name = model_name(chat_model)
+        with self._lock:
+            self._samples[name].append((latency, succeeded))
+            self._calls += 1
+            if chat_model is self.fallback:
+                self._fallback_calls += 1
+
+    def _record_usage(self, usage_metadata: Optional[Dict[str, Any]]) -> None:
+        """Add the input and prompt-cache tokens of a response or stream chunk."""
+        if not usage_metadata:
+            return
+        token_details = usage_metadata.get('input_token_details') or {}
+        with self._lock:
+            self._input_tokens += usage_metadata.get('input_tokens', 0) or 0
+            self._cache_read_input_tokens += token_details.get('cache_read', 0) or 0
+            self._cache_creation_input_tokens += token_details.get('cache_creation', 0) or 0
+
+    def _window_stats(self, name: str) -> Dict[str, Any]:
+        """Compute sample count, p50/p95 latency and error rate (lock held)."""
+        samples = self._samples.get(name) or []
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, succeeded in samples if not succeeded)
+
+        return {
+            'samples': len(latencies),
+            'p50_latency': round(percentile(latencies, 0.5), 4),
+            'p95_latency': round(percentile(latencies, 0.95), 4),
+            'error_rate': round(errors / len(latencies), 3) if latencies else 0
+        }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def tag_routed_model(message: Any, name: str) -> None:
+    """Name the serving model in a response's (or first chunk's) metadata."""
+    response_metadata = getattr(message, 'response_metadata', None)
+    if isinstance(response_metadata, dict):
+        response_metadata[ROUTED_MODEL_KEY] = name
+
+
+def model_name(chat_model: Any) -> str:
+    """Return the model identifier of a chat model."""
+    return getattr(chat_model, 'model', None) or getattr(chat_model, 'model_name', 'unknown')
@@ -0,0 +1,109 @@
+"""Local stub chat model for exercising the LLM pipeline without network calls."""
+
+import time
+from typing import Any, Callable, Iterator, List, Optional, Set, Union
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from backend.utils.generation_metrics import estimate_tokens
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model that returns canned text after a configurable delay.
+
+    ``response`` is either a fixed string or a callable that receives the
+    prompt messages. ``fail_first`` makes the first N calls raise, which
+    together with ``latency`` lets the router's fallback be tested locally.
+    ``latencies`` replays a latency distribution, one value per call.
+    Prompt prefixes marked with ``cache_control`` are remembered, so a
+    repeated prefix is reported as cache-read tokens like the Anthropic API.
+    """
+
+    model: str = "stub-model"
+    response: Union[str, Callable[[List[BaseMessage]], str]] = "Final Answer: stub response"
+    latency: float = 0.0
+    latencies: List[float] = []
+    fail_first: int = 0
+    stop_reason: str = "end_turn"
+    chunk_size: int = 64
+    calls: int = 0
+    cached_prefixes: Set[str] = Field(default_factory=set)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        text = self._respond(messages)
+        message = AIMessage(
+            content=text,
+            usage_metadata=self._usage(messages, text),
+            response_metadata={'model': self.model, 'stop_reason': self.stop_reason}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        for start in range(0, len(text), self.chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + self.chunk_size]))
+
+        # Usage and stop reason arrive with the last chunk, as with Anthropic
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content='',
+            usage_metadata=self._usage(messages, text),
+            response_metadata={'stop_reason': self.stop_reason}
+        ))
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        """Wait for the configured latency and produce the response text."""
+        self.calls += 1
+        time.sleep(self.latencies[(self.calls - 1) % len(self.latencies)] if self.latencies else self.latency)
+        if self.calls <= self.fail_first:
+            raise RuntimeError(f"Stub model {self.model} failure {self.calls}")
+
+        return self.response(messages) if callable(self.response) else self.response
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> UsageMetadata:
+        """Estimate token usage, simulating prompt-cache writes and hits."""
+        prefix = ''
+        prompt = ''
+        for message in messages:
+            blocks = message.content if isinstance(message.content, list) else [message.content]
+            for block in blocks:
+                prompt += block.get('text', '') if isinstance(block, dict) else str(block)
+                if isinstance(block, dict) and block.get('cache_control'):
+                    prefix = prompt
+
+        cache_read = cache_creation = 0
+        if prefix:
+            if prefix in self.cached_prefixes:
+                cache_read = estimate_tokens(prefix)
+            else:
+                self.cached_prefixes.add(prefix)
+                cache_creation = estimate_tokens(prefix)
+
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        return UsageMetadata(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            input_token_details={'cache_read': cache_read, 'cache_creation': cache_creation}
+        )
@@ -1,6 +1,7 @@
 """Main FastAPI application for the AI Website Generator."""
 
 import os
+import sys
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
@@ -24,6 +25,10 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("🛑 AI Website Generator shutting down...")
+    # Only close the LLM connection pool if a generation ever loaded it
+    http_pool = sys.modules.get("backend.llm.http_pool")
+    if http_pool is not None:
+        http_pool.close_http_client()
 
 
 # Create FastAPI app
@@ -78,10 +83,10 @@ async def preview_project_in_new_tab(project_id: str):
         html_content = index_file['content']
         base_url = f"/api/v1/projects/{project_id}/assets/"
         
-        # Inject base tag for relative URLs
+        # Inject base tag for relative URLs, and preload the modules the entry point imports
         html_content = html_content.replace(
             '<head>',
-            f'<head><base href="{base_url}">'
+            f'<head><base href="{base_url}">{manager.get_preload_links()}'
         )
         
         return Response(
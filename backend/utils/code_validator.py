@@ -0,0 +1,383 @@
+"""Single-pass lexical validation of TypeScript, TSX and JavaScript files.
+
+The lexer walks a file once, skipping strings, template literals, comments,
+regular expressions and JSX text, and keeps one stack of open brackets,
+template substitutions and JSX elements. The first bracket or tag that does
+not balance is reported with its exact offset, which is what the
+continuation prompt needs to regenerate only the broken file.
+
+validate_scripts() checks many files at once and spreads large outputs
+across worker processes.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Extensions validated by the lexer; only .tsx/.jsx may contain JSX
+SCRIPT_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+JSX_EXTENSIONS = ('.tsx', '.jsx')
+
+# At least one of these keywords shows the content is code, not prose
+CODE_KEYWORDS = {'import', 'export', 'function', 'const'}
+
+# After these keywords an expression starts, so `<` opens JSX and `/` a regex
+EXPRESSION_KEYWORDS = {'return', 'yield', 'await', 'case', 'default', 'typeof', 'void', 'delete', 'in', 'of', 'new', 'else', 'do'}
+# After these characters an expression starts
+EXPRESSION_PUNCTUATION = set('({[,;:=?!&|+-*/%~^<>')
+
+CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+# Stack entry kinds
+BRACKET = 'bracket'          # ( [ { in code
+TEMPLATE = 'template'        # inside a template literal's text
+SUBSTITUTION = 'substitution'  # ${ ... } inside a template literal
+JSX_TAG = 'tag'              # between <Name and > (attributes)
+JSX_ELEMENT = 'element'      # children of <Name>...</Name>
+JSX_EXPRESSION = 'expression'  # { ... } inside a JSX tag or children
+
+
+def is_identifier_char(char: str) -> bool:
+    return char.isalnum() or char in '_$'
+
+
+def line_and_column(content: str, offset: int) -> Tuple[int, int]:
+    """1-based line and column of an offset."""
+    line = content.count('\n', 0, offset) + 1
+    column = offset - (content.rfind('\n', 0, offset) + 1) + 1
+    return line, column
+
+
+class ScriptLexer:
+    """Balance checker for one script file; see lex_script()."""
+
+    def __init__(self, content: str, jsx: bool):
+        self.content = content
+        self.length = len(content)
+        self.jsx = jsx
+        # (kind, opening character or tag name, offset)
+        self.stack: List[Tuple[str, str, int]] = []
+        # Whether the next token starts an expression (JSX `<` and regex `/` are allowed)
+        self.expression_start = True
+        self.keywords_seen = False
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        """Lex the whole file and return the first error, or None."""
+        index = 0
+        while index < self.length:
+            kind = self.stack[-1][0] if self.stack else BRACKET
+            if kind == TEMPLATE:
+                index = self._template(index)
+            elif kind == JSX_TAG:
+                index = self._jsx_tag(index)
+            elif kind == JSX_ELEMENT:
+                index = self._jsx_children(index)
+            else:
+                index = self._code(index)
+            if isinstance(index, dict):
+                return index
+
+        if self.stack:
+            kind, opening, offset = self.stack[-1]
+            described = {
+                TEMPLATE: 'template literal',
+                SUBSTITUTION: "'${'",
+                JSX_TAG: f"tag <{opening}",
+                JSX_ELEMENT: f"element <{opening}>" if opening else 'fragment <>',
+                JSX_EXPRESSION: "JSX expression '{'",
+            }.get(kind, f"'{opening}'")
+            return self._error(offset, f"Unclosed {described}")
+        if not self.keywords_seen:
+            return self._error(0, "No import/export/function/const statements found")
+        return None
+
+    def _error(self, offset: int, message: str) -> Dict[str, Any]:
+        line, column = line_and_column(self.content, offset)
+        return {
+            'offset': offset,
+            'line': line,
+            'column': column,
+            'message': f"{message} at line {line}, column {column} (offset {offset})"
+        }
+
+    def _code(self, index: int) -> Any:
+        """Consume one token of plain code."""
+        content = self.content
+        char = content[index]
+
+        if char.isspace():
+            return index + 1
+
+        if char == '/' and content.startswith('//', index):
+            end = content.find('\n', index)
+            return self.length if end < 0 else end
+        if char == '/' and content.startswith('/*', index):
+            end = content.find('*/', index + 2)
+            if end < 0:
+                return self._error(index, "Unterminated comment")
+            return end + 2
+
+        if is_identifier_char(char):
+            end = index + 1
+            while end < self.length and is_identifier_char(content[end]):
+                end += 1
+            word = content[index:end]
+            if word in CODE_KEYWORDS:
+                self.keywords_seen = True
+            self.expression_start = word in EXPRESSION_KEYWORDS
+            return end
+
+        if char in '"\'':
+            return self._string(index, char)
+
+        if char == '`':
+            self.stack.append((TEMPLATE, '`', index))
+            return index + 1
+
+        if char == '/' and self.expression_start:
+            return self._regex(index)
+
+        if char == '<' and self.jsx and self.expression_start and self._opens_jsx(index):
+            return self._open_tag(index)
+
+        if char in '([{':
+            self.stack.append((BRACKET, char, index))
+            self.expression_start = True
+            return index + 1
+
+        if char in ')]}':
+            if not self.stack:
+                return self._error(index, f"Unexpected '{char}'")
+            kind, opening, offset = self.stack[-1]
+            if char == '}' and kind in (SUBSTITUTION, JSX_EXPRESSION):
+                self.stack.pop()
+                self.expression_start = False
+                return index + 1
+            if kind != BRACKET or CLOSERS[char] != opening:
+                expected = {'(': ')', '[': ']', '{': '}'}.get(opening, opening) if kind == BRACKET else None
+                line, column = line_and_column(self.content, offset)
+                hint = f", expected '{expected}'" if expected else ''
+                return self._error(index, f"Unexpected '{char}'{hint} (opened at line {line}, column {column})")
+            self.stack.pop()
+            self.expression_start = False
+            return index + 1
+
+        self.expression_start = char in EXPRESSION_PUNCTUATION
+        return index + 1
+
+    def _string(self, index: int, quote: str) -> Any:
+        """Skip a quoted string; strings may not span lines without an escape."""
+        content = self.content
+        position = index + 1
+        while position < self.length:
+            char = content[position]
+            if char == '\\':
+                position += 2
+                continue
+            if char == quote:
+                self.expression_start = False
+                return position + 1
+            if char == '\n':
+                break
+            position += 1
+        return self._error(index, "Unterminated string")
+
+    def _regex(self, index: int) -> Any:
+        """Skip a regular expression literal, including character classes."""
+        content = self.content
+        position = index + 1
+        in_class = False
+        while position < self.length:
+            char = content[position]
+            if char == '\\':
+                position += 2
+                continue
+            if char == '\n':
+                break
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                position += 1
+                while position < self.length and is_identifier_char(content[position]):
+                    position += 1
+                self.expression_start = False
+                return position
+            position += 1
+        return self._error(index, "Unterminated regular expression")
+
+    def _template(self, index: int) -> Any:
+        """Consume template literal text up to the next substitution or the closing backtick."""
+        content = self.content
+        position = index
+        while position < self.length:
+            char = content[position]
+            if char == '\\':
+                position += 2
+                continue
+            if char == '`':
+                self.stack.pop()
+                self.expression_start = False
+                return position + 1
+            if char == '$' and content.startswith('${', position):
+                self.stack.append((SUBSTITUTION, '${', position))
+                self.expression_start = True
+                return position + 2
+            position += 1
+        return position
+
+    def _opens_jsx(self, index: int) -> bool:
+        """Whether `<` at an expression start is a JSX tag rather than a comparison or generic."""
+        following = self.content[index + 1:index + 2]
+        if following == '>':
+            return True
+        if not (following.isalpha() or following == '_'):
+            return False
+        # `<T,>` and `<T extends ...>` are type parameters of a generic arrow function
+        end = self._read_tag_name(index + 1)
+        rest = self.content[end:end + 9].lstrip()
+        return not (rest.startswith(',') or rest.startswith('extends '))
+
+    def _read_tag_name(self, index: int) -> int:
+        end = index
+        while end < self.length and (is_identifier_char(self.content[end]) or self.content[end] in '.-:'):
+            end += 1
+        return end
+
+    def _open_tag(self, index: int) -> int:
+        """Start a JSX opening tag (or fragment) at `<`."""
+        if self.content.startswith('<>', index):
+            self.stack.append((JSX_ELEMENT, '', index))
+            return index + 2
+        end = self._read_tag_name(index + 1)
+        self.stack.append((JSX_TAG, self.content[index + 1:end], index))
+        return end
+
+    def _jsx_tag(self, index: int) -> Any:
+        """Consume one token of a JSX tag's attribute list."""
+        content = self.content
+        char = content[index]
+        _, name, offset = self.stack[-1]
+
+        if char == '/' and content.startswith('/>', index):
+            self.stack.pop()
+            self._after_jsx_element()
+            return index + 2
+        if char == '>':
+            self.stack.pop()
+            self.stack.append((JSX_ELEMENT, name, offset))
+            return index + 1
+        if char in '"\'':
+            end = content.find(char, index + 1)
+            if end < 0:
+                return self._error(index, "Unterminated attribute string")
+            return end + 1
+        if char == '{':
+            self.stack.append((JSX_EXPRESSION, '{', index))
+            self.expression_start = True
+            return index + 1
+        if char == '<':
+            return self._error(index, f"Unclosed tag <{name}")
+        return index + 1
+
+    def _jsx_children(self, index: int) -> Any:
+        """Consume JSX text up to the next child tag, closing tag or expression."""
+        content = self.content
+        position = index
+        while position < self.length:
+            char = content[position]
+            if char == '{':
+                self.stack.append((JSX_EXPRESSION, '{', position))
+                self.expression_start = True
+                return position + 1
+            if char == '<':
+                if content.startswith('</', position):
+                    return self._close_tag(position)
+                self.expression_start = True
+                return self._open_tag(position) if self._opens_jsx(position) else position + 1
+            position += 1
+        return position
+
+    def _close_tag(self, index: int) -> Any:
+        """Match a closing tag </Name> against the innermost open element."""
+        end = self._read_tag_name(index + 2)
+        name = self.content[index + 2:end]
+        close = self.content.find('>', end)
+        _, opening, offset = self.stack[-1]
+        if close < 0:
+            return self._error(index, f"Unterminated closing tag </{name}")
+        if name != opening:
+            line, column = line_and_column(self.content, offset)
+            expected = f"</{opening}>" if opening else '</>'
+            return self._error(index, f"Mismatched closing tag </{name}>, expected {expected} (opened at line {line}, column {column})")
+        self.stack.pop()
+        self._after_jsx_element()
+        return close + 1
+
+    def _after_jsx_element(self) -> None:
+        # A finished element is a value in code, but more text follows in children
+        self.expression_start = bool(self.stack) and self.stack[-1][0] == JSX_ELEMENT
+
+
+def lex_script(content: str, extension: str) -> Optional[Dict[str, Any]]:
+    """Return the first lexical error of a script file, or None when it balances.
+
+    The error carries its ``offset``, ``line``, ``column`` and a ``message``.
+    """
+    return ScriptLexer(content, extension in JSX_EXTENSIONS).run()
+
+
+def validate_script(content: str, extension: str) -> Tuple[bool, Optional[str]]:
+    """Validate a TypeScript/JavaScript file in the (is_valid, error) form of the file parser."""
+    error = lex_script(content, extension)
+    return (True, None) if error is None else (False, error['message'])
+
+
+def _validate_item(item: Tuple[str, str]) -> Tuple[bool, Optional[str]]:
+    return validate_script(*item)
+
+
+def validate_scripts(
+    items: List[Tuple[str, str]],
+    workers: Optional[int] = None,
+    min_parallel_bytes: Optional[int] = None
+) -> List[Tuple[bool, Optional[str]]]:
+    """Validate (content, extension) pairs, in parallel when the output is large.
+    
+    Worker processes only pay off once there is enough content to outweigh
+    handing it to them, so smaller batches are validated in this process.
+    The pool is started once and reused by later calls.
+    Results are returned in the order of ``items``.
+    """
+    if workers is None:
+        workers = int(os.getenv("VALIDATION_WORKERS", "0")) or os.cpu_count() or 1
+    if min_parallel_bytes is None:
+        min_parallel_bytes = int(os.getenv("PARALLEL_VALIDATION_MIN_BYTES", "1000000"))
+
+    total_bytes = sum(len(content) for content, _ in items)
+    if workers < 2 or len(items) < 2 or total_bytes < min_parallel_bytes:
+        return [_validate_item(item) for item in items]
+
+    chunksize = max(1, len(items) // (workers * 4))
+    return list(_get_executor(workers).map(_validate_item, items, chunksize=chunksize))
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool, started on first use so its cost is paid once."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # Spawned workers do not inherit the server's threads and locks
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+        return _executor
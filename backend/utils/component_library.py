@@ -0,0 +1,278 @@
+"""Vetted component library filled from the software engineer's structured output.
+
+Instead of writing Navbar, Hero, About, Contact and Footer from scratch for
+every project, the engineer returns a ``site.json`` file block with the
+slot values (copy, palette, links and section order). The block is expanded
+here into the library components, a ``src/content.ts`` module holding the
+slot values, ``src/App.tsx``, ``package.json`` and ``README.md``. Sections the
+library does not cover are still generated free-form as ordinary file blocks.
+"""
+
+import copy
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.utils.template_engine import TemplateEngine, create_project_variables
+
+# File block the engineer fills the slots through
+SITE_CONFIG_FILE = 'site.json'
+
+LIBRARY_DIR = Path(__file__).parent.parent / 'templates' / 'components'
+
+# Library component name -> slot description shown to the engineer
+LIBRARY_COMPONENTS = {
+    'Navbar': 'site name, navigation links and a call-to-action button',
+    'Hero': 'headline, subheadline, call-to-action and optional background image',
+    'About': 'title, body paragraphs and highlight cards',
+    'Contact': 'contact details and a contact form',
+    'Footer': 'tagline, links and social links'
+}
+
+DEFAULT_SITE_CONFIG: Dict[str, Any] = {
+    'siteName': 'My Website',
+    'theme': {
+        'primary': '#2563EB',
+        'secondary': '#38BDF8',
+        'background': '#F9FAFB',
+        'text': '#111827',
+        'font': "'Inter', sans-serif"
+    },
+    'navbar': {
+        'links': [
+            {'label': 'Home', 'href': '#home'},
+            {'label': 'About', 'href': '#about'},
+            {'label': 'Contact', 'href': '#contact'}
+        ],
+        'cta': {'label': 'Get in Touch', 'href': '#contact'}
+    },
+    'hero': {
+        'headline': 'Welcome',
+        'subheadline': '',
+        'cta': {'label': 'Learn More', 'href': '#about'},
+        'imageUrl': ''
+    },
+    'about': {
+        'title': 'About Us',
+        'body': '',
+        'highlights': []
+    },
+    'contact': {
+        'title': 'Get in Touch',
+        'body': '',
+        'email': '',
+        'phone': '',
+        'address': '',
+        'submitLabel': 'Send Message',
+        'successMessage': "Thanks for your message! We'll be in touch soon."
+    },
+    'footer': {
+        'tagline': '',
+        'links': [],
+        'socials': []
+    },
+    'sections': list(LIBRARY_COMPONENTS)
+}
+
+HEX_COLOR_PATTERN = re.compile(r'^#(?:[0-9a-fA-F]{3}){1,2}$')
+COMPONENT_NAME_PATTERN = re.compile(r'^[A-Z][A-Za-z0-9]*$')
+JSON_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+def site_config_example() -> str:
+    """Return the slot schema as the example JSON shown to the engineer."""
+    example = copy.deepcopy(DEFAULT_SITE_CONFIG)
+    example['siteName'] = 'Site name'
+    example['hero']['subheadline'] = 'One or two sentences expanding on the headline'
+    example['about']['body'] = 'Paragraphs separated by newlines'
+    example['about']['highlights'] = ['Short highlight', 'Another highlight']
+    example['contact']['body'] = 'Invitation to get in touch'
+    example['contact']['email'] = 'hello@example.com'
+    example['footer']['tagline'] = 'Short tagline'
+    example['footer']['socials'] = [{'label': 'Instagram', 'href': 'https://instagram.com/example'}]
+    example['sections'] = ['Navbar', 'Hero', 'About', 'Gallery', 'Contact', 'Footer']
+    return json.dumps(example, indent=2)
+
+
+def normalize_site_config(config: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """Fill missing slots with defaults and replace values of the wrong shape.
+
+    Args:
+        config: Parsed site.json content
+
+    Returns:
+        Tuple of the normalized configuration and a list of warnings
+    """
+    warnings: List[str] = []
+    if not isinstance(config, dict):
+        return copy.deepcopy(DEFAULT_SITE_CONFIG), ['site.json is not an object; using defaults']
+
+    normalized = _merge_slots(DEFAULT_SITE_CONFIG, config, '', warnings)
+
+    for key, value in normalized['theme'].items():
+        if key != 'font' and not HEX_COLOR_PATTERN.match(value):
+            warnings.append(f"theme.{key}: '{value}' is not a hex colour")
+            normalized['theme'][key] = DEFAULT_SITE_CONFIG['theme'][key]
+
+    sections = []
+    for name in normalized['sections']:
+        if not isinstance(name, str) or not COMPONENT_NAME_PATTERN.match(name.strip()):
+            warnings.append(f"sections: '{name}' is not a component name")
+        elif name.strip() not in sections:
+            sections.append(name.strip())
+    normalized['sections'] = sections or list(LIBRARY_COMPONENTS)
+
+    return normalized, warnings
+
+
+def _merge_slots(default: Any, value: Any, path: str, warnings: List[str]) -> Any:
+    """Merge a slot value onto its default, checking it has the default's type."""
+    if isinstance(default, dict):
+        if not isinstance(value, dict):
+            warnings.append(f"{path or 'site'}: expected an object")
+            return copy.deepcopy(default)
+        return {
+            key: _merge_slots(default_value, value[key], f"{path}.{key}".lstrip('.'), warnings)
+            if key in value else copy.deepcopy(default_value)
+            for key, default_value in default.items()
+        }
+
+    if isinstance(default, list):
+        if not isinstance(value, list):
+            warnings.append(f"{path}: expected a list")
+            return copy.deepcopy(default)
+        if path.endswith('links') or path.endswith('socials'):
+            links = [_link(item) for item in value]
+            return [link for link in links if link]
+        if path == 'sections':
+            return value
+        return [str(item).strip() for item in value if isinstance(item, (str, int, float))]
+
+    if isinstance(value, (dict, list)) or value is None:
+        warnings.append(f"{path}: expected text")
+        return default
+    return str(value).strip()
+
+
+def _link(item: Any) -> Optional[Dict[str, str]]:
+    """Return a label/href link slot, or None if the item is not one."""
+    if not isinstance(item, dict) or not item.get('label') or not item.get('href'):
+        return None
+    return {'label': str(item['label']).strip(), 'href': str(item['href']).strip()}
+
+
+def render_content_module(config: Dict[str, Any], engine: Optional[TemplateEngine] = None) -> str:
+    """Render the slot values as a typed TypeScript module.
+
+    Brackets inside string values are written as unicode escapes, so the
+    module validates like the vetted components whatever the copy contains.
+    """
+    engine = engine or TemplateEngine(templates_dir=str(LIBRARY_DIR))
+    data = json.dumps(config, indent=2, ensure_ascii=False)
+    data = JSON_STRING_PATTERN.sub(
+        lambda match: match.group(0)
+        .replace('(', '\\u0028').replace(')', '\\u0029')
+        .replace('{', '\\u007b').replace('}', '\\u007d'),
+        data
+    )
+    return engine.generate_file('content.ts.template', {'CONTENT': data})
+
+
+def render_site(
+    config: Dict[str, Any],
+    custom_components: Optional[Set[str]] = None
+) -> Dict[str, str]:
+    """Render the project files for a normalized site configuration.
+
+    Args:
+        config: Normalized site configuration
+        custom_components: Names of the free-form components that were
+            generated; None includes every non-library section
+
+    Returns:
+        Dictionary of file paths to file contents
+    """
+    engine = TemplateEngine(templates_dir=str(LIBRARY_DIR))
+    files = {'src/content.ts': render_content_module(config, engine)}
+
+    sections = [
+        name for name in config['sections']
+        if name in LIBRARY_COMPONENTS or custom_components is None or name in custom_components
+    ]
+    for name in sections:
+        if name in LIBRARY_COMPONENTS:
+            files[f'src/components/{name}.tsx'] = engine.load_template(f'{name}.tsx.template')
+
+    variables = create_project_variables({'title': config['siteName']})
+    variables['PROJECT_DESCRIPTION'] = config['hero']['subheadline'] or config['footer']['tagline']
+    variables['IMPORTS'] = '\n'.join(f"import {name} from './components/{name}';" for name in sections)
+    variables['SECTIONS'] = '\n'.join(f"      <{name} />" for name in sections)
+
+    files['src/App.tsx'] = engine.generate_file('App.tsx.template', variables)
+    files['package.json'] = engine.generate_file('package.json.template', variables)
+    files['README.md'] = engine.generate_file('README.md.template', variables)
+
+    return files
+
+
+def required_component_files(site_config: str) -> List[str]:
+    """Return the free-form component files a site.json's sections call for."""
+    try:
+        config, _ = normalize_site_config(json.loads(site_config))
+    except json.JSONDecodeError:
+        return []
+    return [f'src/components/{name}.tsx' for name in config['sections'] if name not in LIBRARY_COMPONENTS]
+
+
+def expand_site_config(file_blocks: List[Dict], final: bool = True) -> Tuple[List[Dict], List[str]]:
+    """Replace a site.json file block with the library files it fills.
+
+    The rendered files take the site.json block's number, so free-form
+    blocks that come after it (including ones overriding a library file)
+    still win. A site.json that is not valid JSON is left in place for
+    validation to report.
+
+    Args:
+        file_blocks: File blocks extracted from crew output
+        final: Whether every block has arrived; while streaming, sections
+            whose components have not been generated yet are still rendered
+
+    Returns:
+        Tuple of the expanded file blocks and any slot warnings
+    """
+    config_block = next((block for block in file_blocks if block['path'] == SITE_CONFIG_FILE), None)
+    if config_block is None:
+        return file_blocks, []
+
+    try:
+        config, warnings = normalize_site_config(json.loads(config_block['content']))
+    except json.JSONDecodeError:
+        return file_blocks, []
+
+    custom_components = None
+    if final:
+        custom_components = {
+            Path(block['path']).stem for block in file_blocks
+            if block['path'].startswith('src/components/')
+        }
+        warnings.extend(
+            f"sections: no component generated for {name}"
+            for name in config['sections']
+            if name not in LIBRARY_COMPONENTS and name not in custom_components
+        )
+
+    rendered = [
+        {
+            'number': config_block['number'],
+            'path': path,
+            'language': path.rsplit('.', 1)[-1],
+            'content': content.strip()
+        }
+        for path, content in render_site(config, custom_components).items()
+    ]
+
+    expanded = []
+    for block in file_blocks:
+        expanded.extend(rendered if block is config_block else [block])
+    return expanded, warnings
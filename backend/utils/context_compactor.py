@@ -0,0 +1,235 @@
+"""Compact upstream crew outputs into token-budgeted summaries for downstream stages."""
+
+import re
+from typing import Dict, List, Any, Tuple
+
+from backend.utils.generation_metrics import estimate_tokens
+
+# Heading keywords -> summary field, checked in order
+SPECIFICATION_FIELDS = [
+    ('sections', ('content', 'sitemap', 'structure', 'page', 'section')),
+    ('features', ('feature', 'requirement', 'functional')),
+    ('audience', ('audience', 'user', 'persona')),
+    ('goals', ('overview', 'goal', 'objective', 'purpose')),
+]
+
+DESIGN_FIELDS = [
+    ('palette', ('color', 'colour', 'palette')),
+    ('typography', ('typograph', 'font')),
+    ('components', ('component', 'button', 'form', 'card', 'navigation')),
+    ('sections', ('layout', 'section', 'header', 'footer', 'wireframe', 'structure')),
+    ('tailwind', ('tailwind', 'class', 'css')),
+]
+
+# Field order decides what survives when the budget is tight
+SPECIFICATION_PRIORITY = ['sections', 'features', 'copy', 'goals', 'audience']
+DESIGN_PRIORITY = ['palette', 'components', 'sections', 'typography', 'copy', 'tailwind']
+# The request-independent part of a design, reusable across projects
+DESIGN_SYSTEM_FIELDS = ['palette', 'typography', 'tailwind']
+
+MAX_ITEMS_PER_FIELD = 12
+MAX_ITEM_CHARS = 160
+
+# "## Title" or a line that is entirely bold ("**Title**:", "1. **Title**:")
+HEADING_PATTERN = re.compile(r'^\s*(?:#{1,6}\s+(.+?)|(?:\d+\.\s+)?\*\*([^*]+)\*\*:?)\s*$')
+BULLET_PATTERN = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+(.*\S)')
+HEX_COLOR_PATTERN = re.compile(r'([A-Za-z][\w /()-]{0,30}?)?[:\s(]*(#[0-9A-Fa-f]{6}\b|#[0-9A-Fa-f]{3}\b)')
+TAILWIND_COLOR_PATTERN = re.compile(r'\b(?:bg|text|border|from|to|via|ring)-([a-z]+-\d{2,3})\b')
+COPY_PATTERN = re.compile(r'["“]([^"”\n]{8,120})["”]')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+
+class ContextCompactor:
+    """Turn long specification and design prose into structured summaries.
+
+    The extraction is deterministic (no extra LLM call): markdown headings
+    decide which summary field their bullets and the lead sentence of their
+    prose belong to, colors and quoted copy are picked up anywhere, and
+    fields are filled in priority order until the token budget is used.
+    """
+
+    def __init__(self, specification_budget: int = 600, design_budget: int = 900):
+        self.specification_budget = specification_budget
+        self.design_budget = design_budget
+
+    def compact_specification(self, text: str) -> str:
+        """Summarize a product specification (sections, features, copy, goals)."""
+        fields = self._extract_fields(text, SPECIFICATION_FIELDS)
+        fields['copy'] = self._extract_copy(text)
+        return self._render(fields, SPECIFICATION_PRIORITY, self.specification_budget, text)
+
+    def compact_design(self, text: str) -> str:
+        """Summarize a design document (palette, components, sections, typography)."""
+        fields = self._extract_fields(text, DESIGN_FIELDS)
+        palette = fields.get('palette', [])
+        listed = ' '.join(palette).lower()
+        palette += [color for color in self._extract_colors(text) if color.split(': ')[-1].lower() not in listed]
+        fields['palette'] = self._unique(palette)
+        fields['copy'] = self._extract_copy(text)
+        return self._render(fields, DESIGN_PRIORITY, self.design_budget, text)
+
+    def extract_design_system(self, text: str) -> str:
+        """Pull the palette, typography and Tailwind recommendations out of a design.
+
+        Each field becomes a markdown heading so the result can be fed back
+        into a design and compacted again. Returns an empty string when the
+        design has no palette to reuse.
+        """
+        fields = self._extract_fields(text, DESIGN_FIELDS)
+        palette = fields.get('palette', [])
+        listed = ' '.join(palette).lower()
+        palette += [color for color in self._extract_colors(text) if color.split(': ')[-1].lower() not in listed]
+        fields['palette'] = self._unique(palette)
+        if not fields['palette']:
+            return ''
+        # Class recommendations are often labelled by component ("Buttons: bg-...")
+        fields['tailwind'] = self._unique(fields.get('tailwind', []) + [
+            item for name, items in fields.items() if name != 'palette'
+            for item in items if TAILWIND_COLOR_PATTERN.search(item)
+        ])
+
+        sections = []
+        for name in DESIGN_SYSTEM_FIELDS:
+            items = fields.get(name, [])[:MAX_ITEMS_PER_FIELD]
+            if items:
+                sections.append('\n'.join([f"## {name.capitalize()}"] + [f"- {item}" for item in items]))
+        return '\n\n'.join(sections)
+
+    def _extract_fields(self, text: str, field_keywords: List[Tuple[str, Tuple[str, ...]]]) -> Dict[str, List[str]]:
+        """Group bullet points, and the lead sentence of prose, under the field their nearest heading maps to."""
+        fields: Dict[str, List[str]] = {}
+        current_field = None
+        paragraph: List[str] = []
+        # Only the first paragraph under a heading: it usually names the site and its purpose
+        lead_taken = False
+
+        def end_paragraph() -> None:
+            nonlocal lead_taken
+            if paragraph and current_field and not lead_taken:
+                sentence = SENTENCE_END_PATTERN.split(' '.join(paragraph), 1)[0]
+                fields.setdefault(current_field, []).append(self._clean(sentence))
+                lead_taken = True
+            paragraph.clear()
+
+        for line in text.splitlines():
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                end_paragraph()
+                current_field = self._match_field(heading.group(1) or heading.group(2), field_keywords)
+                lead_taken = False
+                continue
+
+            bullet = BULLET_PATTERN.match(line)
+            if not bullet:
+                if line.strip() and not line.lstrip().startswith(('|', '`', '>')):
+                    paragraph.append(line.strip())
+                else:
+                    end_paragraph()
+                continue
+
+            end_paragraph()
+            item = self._clean(bullet.group(1))
+            # A labelled bullet ("Typography: Inter") outranks its heading
+            label = item.split(':', 1)[0] if ':' in item[:40] else ''
+            field = (label and self._match_field(label, field_keywords)) or current_field
+            if item and field:
+                fields.setdefault(field, []).append(item)
+
+        end_paragraph()
+        return {name: self._unique(items) for name, items in fields.items()}
+
+    def _match_field(self, title: str, field_keywords: List[Tuple[str, Tuple[str, ...]]]) -> Any:
+        """Return the summary field whose keywords appear in a heading or label."""
+        title = title.lower()
+        return next(
+            (name for name, keywords in field_keywords if any(k in title for k in keywords)),
+            None
+        )
+
+    def _extract_colors(self, text: str) -> List[str]:
+        """Find hex colors (with their labels) and Tailwind color tokens."""
+        colors = []
+        for label, hex_code in HEX_COLOR_PATTERN.findall(text):
+            label = self._clean(label or '').strip(' -:(')
+            colors.append(f"{label}: {hex_code}" if label else hex_code)
+        colors.extend(TAILWIND_COLOR_PATTERN.findall(text))
+        return self._unique(colors)
+
+    def _extract_copy(self, text: str) -> List[str]:
+        """Find quoted strings that look like headlines, taglines or button labels."""
+        return self._unique(
+            match.strip() for match in COPY_PATTERN.findall(text)
+            if ' ' in match.strip() and not match.strip().startswith(('http', '/', '.'))
+        )
+
+    def _render(self, fields: Dict[str, List[str]], priority: List[str], budget: int, original: str) -> str:
+        """Render fields as markdown, adding items in priority order until the budget is met."""
+        selected: Dict[str, List[str]] = {name: [] for name in priority}
+        used = 0
+
+        # Round-robin over fields so one long list cannot starve the others
+        for index in range(MAX_ITEMS_PER_FIELD):
+            for name in priority:
+                items = fields.get(name, [])
+                if index >= len(items):
+                    continue
+                cost = estimate_tokens(items[index]) + 2
+                if used + cost > budget:
+                    continue
+                selected[name].append(items[index])
+                used += cost
+
+        lines = []
+        for name in priority:
+            if selected[name]:
+                lines.append(f"{name.capitalize()}:")
+                lines.extend(f"- {item}" for item in selected[name])
+
+        if not lines:
+            # Nothing structured to extract - fall back to the head of the text
+            return original[:budget * 4].strip()
+
+        return '\n'.join(lines)
+
+    def _clean(self, text: str) -> str:
+        """Strip markdown emphasis and clamp the item length."""
+        text = re.sub(r'[*_`]+', '', text).strip()
+        return text[:MAX_ITEM_CHARS]
+
+    def _unique(self, items: Any) -> List[str]:
+        """De-duplicate while keeping the original order."""
+        seen = set()
+        unique = []
+        for item in items:
+            key = item.lower()
+            if item and key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
+
+
+def compact_context(
+    specification: str,
+    design: str,
+    specification_budget: int = 600,
+    design_budget: int = 900
+) -> Dict[str, Any]:
+    """Compact both upstream outputs and report token counts before and after."""
+    compactor = ContextCompactor(specification_budget, design_budget)
+    compact_specification = compactor.compact_specification(specification)
+    compact_design = compactor.compact_design(design)
+
+    tokens_before = estimate_tokens(specification) + estimate_tokens(design)
+    tokens_after = estimate_tokens(compact_specification) + estimate_tokens(compact_design)
+
+    return {
+        'specification': compact_specification,
+        'design': compact_design,
+        'specification_tokens_before': estimate_tokens(specification),
+        'specification_tokens_after': estimate_tokens(compact_specification),
+        'design_tokens_before': estimate_tokens(design),
+        'design_tokens_after': estimate_tokens(compact_design),
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_after,
+        'reduction': round(1 - tokens_after / tokens_before, 3) if tokens_before else 0
+    }
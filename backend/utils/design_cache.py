@@ -0,0 +1,186 @@
+"""Reuse of UI design systems across requests with the same style preferences."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from backend.utils.similarity_index import normalize_tokens
+
+# Website categories and the (normalized) description tokens that signal them
+CATEGORY_KEYWORDS = {
+    "portfolio": {"portfolio", "photographer", "artist", "illustrator", "gallery", "designer", "creative"},
+    "restaurant": {"restaurant", "bakery", "menu", "food", "coffee", "bar", "catering", "chef"},
+    "store": {"store", "product", "cart", "boutique", "checkout", "merchandise"},
+    "blog": {"blog", "article", "magazine", "news", "journal", "post"},
+    "saas": {"saas", "software", "app", "startup", "platform", "dashboard", "pricing"},
+    "business": {"agency", "consulting", "consultancy", "firm", "service", "company", "corporate"},
+    "event": {"event", "wedding", "conference", "festival", "meetup"},
+    "personal": {"resume", "cv", "personal", "bio"},
+}
+DEFAULT_CATEGORY = "general"
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Serializes read-modify-write cycles on the cache file; with speculative design
+# the designer's lookups run in worker threads next to other generations
+_cache_lock = threading.RLock()
+
+
+def website_category(description: str, requirements: List[str]) -> str:
+    """Classify a request into a coarse website category by keyword votes."""
+    tokens = normalize_tokens(' '.join([description] + list(requirements or [])))
+    votes = Counter(
+        category for token in tokens
+        for category, keywords in CATEGORY_KEYWORDS.items() if token in keywords
+    )
+    if not votes:
+        return DEFAULT_CATEGORY
+    # Ties go to the category listed first
+    best = max(votes.values())
+    return next(category for category in CATEGORY_KEYWORDS if votes.get(category) == best)
+
+
+def normalize_style_preferences(value: Any) -> Any:
+    """Canonical form of style preferences: case, whitespace and ordering do not matter."""
+    if isinstance(value, dict):
+        return {
+            WHITESPACE_PATTERN.sub(' ', str(key)).strip().lower(): normalize_style_preferences(item)
+            for key, item in value.items()
+            if item not in (None, '', [], {})
+        }
+    if isinstance(value, (list, tuple, set)):
+        items = [normalize_style_preferences(item) for item in value]
+        return sorted({json.dumps(item, sort_keys=True): item for item in items}.values(), key=json.dumps)
+    if isinstance(value, str):
+        return WHITESPACE_PATTERN.sub(' ', value).strip().lower()
+    return value
+
+
+def design_cache_key(style_preferences: Dict[str, Any], category: str) -> str:
+    """Hash the normalized style preferences together with the website category."""
+    payload = json.dumps(
+        {"style": normalize_style_preferences(style_preferences or {}), "category": category},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class DesignSystemCache:
+    """Local cache of design systems (palette, typography, Tailwind classes).
+
+    Entries live in data/design_cache.json and are evicted least recently
+    used first once ``max_entries`` is exceeded, or when older than
+    ``ttl_days``.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_days: Optional[float] = None,
+        data_dir: str = "data"
+    ):
+        if max_entries is None:
+            max_entries = int(os.getenv("DESIGN_CACHE_MAX_ENTRIES", "200"))
+        if ttl_days is None:
+            ttl_days = float(os.getenv("DESIGN_CACHE_TTL_DAYS", "30"))
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_days * 86400
+        self.cache_file = Path(data_dir) / "design_cache.json"
+
+    def get(self, style_preferences: Dict[str, Any], category: str) -> Optional[Dict[str, Any]]:
+        """Return the cached design system for these preferences and category, if fresh."""
+        key = design_cache_key(style_preferences, category)
+        with _cache_lock:
+            cache = self._load_cache()
+            entry = cache["entries"].get(key)
+
+            if entry is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+                del cache["entries"][key]
+                cache["stats"]["evictions"] += 1
+                entry = None
+
+            cache["stats"]["lookups"] += 1
+            if entry is not None:
+                cache["stats"]["hits"] += 1
+                entry["hits"] += 1
+                entry["last_used"] = time.time()
+            self._save_cache(cache)
+
+        return dict(entry, key=key) if entry is not None else None
+
+    def put(
+        self,
+        style_preferences: Dict[str, Any],
+        category: str,
+        design_system: str,
+        project_id: Optional[str] = None
+    ) -> str:
+        """Store a design system and evict the least recently used entries over the limit."""
+        key = design_cache_key(style_preferences, category)
+        with _cache_lock:
+            cache = self._load_cache()
+            now = time.time()
+            cache["entries"][key] = {
+                "design_system": design_system,
+                "category": category,
+                "style_preferences": normalize_style_preferences(style_preferences or {}),
+                "source_project": project_id,
+                "created_at": now,
+                "last_used": now,
+                "hits": 0
+            }
+
+            overflow = len(cache["entries"]) - self.max_entries
+            if overflow > 0:
+                for stale_key in sorted(cache["entries"], key=lambda k: cache["entries"][k]["last_used"])[:overflow]:
+                    del cache["entries"][stale_key]
+                cache["stats"]["evictions"] += overflow
+            self._save_cache(cache)
+
+        return key
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup/hit/eviction counters and the eviction settings."""
+        with _cache_lock:
+            cache = self._load_cache()
+        stats = cache["stats"]
+
+        return {
+            "entries": len(cache["entries"]),
+            "lookups": stats["lookups"],
+            "hits": stats["hits"],
+            "hit_rate": round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0,
+            "evictions": stats["evictions"],
+            "max_entries": self.max_entries,
+            "ttl_days": round(self.ttl_seconds / 86400, 2)
+        }
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the cache from disk; call with _cache_lock held."""
+        empty = {"entries": {}, "stats": {"lookups": 0, "hits": 0, "evictions": 0}}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return empty
+        except json.JSONDecodeError:
+            # Keep the unreadable file for inspection instead of overwriting it on the next save
+            corrupt_file = self.cache_file.with_name(self.cache_file.name + ".corrupt")
+            os.replace(self.cache_file, corrupt_file)
+            print(f"Design cache {self.cache_file} is unreadable; moved to {corrupt_file} and starting empty")
+            return empty
+
+    def _save_cache(self, cache: Dict[str, Any]) -> None:
+        """Save the cache to disk; call with _cache_lock held."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers and other processes never see a partial file
+        temp_file = self.cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, self.cache_file)
@@ -0,0 +1,84 @@
+"""Template-only draft projects that can be previewed while the crew generates."""
+
+import copy
+import re
+import shutil
+import time
+from typing import Any, Dict, List
+
+from backend.utils.component_library import DEFAULT_SITE_CONFIG, HEX_COLOR_PATTERN, render_site
+from backend.utils.project_structure import STAGING_FILES_DIR, ProjectStructureManager, create_project_structure
+
+DRAFT_SUBHEADLINE = "This is an instant draft - the finished design replaces it automatically."
+
+
+def draft_site_config(
+    description: str,
+    requirements: List[str],
+    style_preferences: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Fill the default layout's slots from the request alone, without an LLM."""
+    config = copy.deepcopy(DEFAULT_SITE_CONFIG)
+
+    site_name = style_preferences.get('site_name') or style_preferences.get('title')
+    if isinstance(site_name, str) and site_name.strip():
+        config['siteName'] = site_name.strip()
+
+    # First sentence of the description as the headline
+    headline = re.split(r'(?<=[.!?])\s', description.strip(), maxsplit=1)[0].rstrip('.')
+    if headline:
+        config['hero']['headline'] = headline[:80]
+    config['hero']['subheadline'] = DRAFT_SUBHEADLINE
+
+    config['about']['body'] = description.strip()
+    config['about']['highlights'] = [requirement.strip() for requirement in requirements[:6] if requirement.strip()]
+    config['footer']['tagline'] = headline[:80]
+
+    for key in ('primary', 'secondary'):
+        color = style_preferences.get(f'{key}_color')
+        if isinstance(color, str) and HEX_COLOR_PATTERN.match(color.strip()):
+            config['theme'][key] = color.strip()
+
+    return config
+
+
+def create_draft_project(
+    project_id: str,
+    description: str,
+    requirements: List[str],
+    style_preferences: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Write a runnable draft built from the default layout and the project templates.
+
+    The draft is written through the staging directory and swapped in, so
+    the crew's refined files can later replace it the same way.
+    """
+    start = time.perf_counter()
+    config = draft_site_config(description, requirements, style_preferences)
+
+    parsed_files = {
+        'files': {
+            path: {
+                'content': content,
+                'size': len(content),
+                'is_valid': True,
+                'draft': True
+            }
+            for path, content in render_site(config).items()
+        },
+        'success': True
+    }
+    parsed_files['file_count'] = len(parsed_files['files'])
+
+    # Leftovers of an interrupted run must not leak into the draft
+    staging_path = ProjectStructureManager(project_id, files_dir=STAGING_FILES_DIR).files_path
+    shutil.rmtree(staging_path, ignore_errors=True)
+
+    result = create_project_structure(
+        project_id,
+        parsed_files,
+        {'title': config['siteName'], 'description': description},
+        staged=True
+    )
+    result['wall_time'] = round(time.perf_counter() - start, 4)
+    return result
@@ -0,0 +1,487 @@
+"""Single-pass scanner that finds file blocks in crew output.
+
+The development task asks for each file as::
+
+    N. path/to/file
+
+    ```language
+    content
+    ```
+
+but models drift from that layout, so the scanner also recognizes a path
+given as a markdown heading (``### src/App.tsx``), a bold line
+(``**src/App.tsx**``), a label (``File: src/App.tsx``), a fence attribute
+(```` ```tsx title="src/App.tsx" ````) or a comment on the first line of
+the code. Every block records the format it was found in and a confidence;
+when the same path is found more than once the most confident block wins.
+
+The scanner reads the output line by line in one pass - complete or in
+chunks as it streams - and reports every block as soon as its closing fence
+arrives. Each character is looked at a constant number of times, so the
+worst case is linear in the output length, including outputs whose last
+fence never closes.
+
+Blocks are FileBlock records holding offsets into the scanned text rather
+than copies of it; a block's content is only sliced out when first read.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+FENCE = '```'
+
+# How sure we are that a block is a project file, by the format it came in
+FORMAT_CONFIDENCE = {
+    'numbered': 1.0,
+    'fence_attribute': 0.95,
+    'heading': 0.85,
+    'bold': 0.85,
+    'label': 0.8,
+    'comment': 0.6,
+}
+# Numbered headers that are not followed by exactly one blank line
+LOOSE_LAYOUT_PENALTY = 0.1
+# Blank lines allowed between a header and its opening fence
+MAX_BLANK_LINES = 2
+
+# One alternative per header format, matched at the start of a line. Each
+# group starts after the indentation, except numbered headers, which start
+# at their number.
+HEADER_PATTERN = re.compile(
+    r'(?:[ \t]*(?P<numbered>\d{1,6}\.\s)'
+    r'|(?P<heading>[ \t]*#{1,6}[ \t]+(?=\S))'
+    r'|(?P<bold>[ \t]*\*\*(?=[^*\n]+\*\*:?[ \t]*$))'
+    r'|(?P<label>[ \t]*(?:file|filename|path)[ \t]*:[ \t]*(?=\S)))',
+    re.IGNORECASE
+)
+# What a header line can start with after its indentation, checked before the pattern
+HEADER_STARTS = frozenset('0123456789#*fFpP')
+# Lines and code blocks that cannot start or name a file, skipped in one call
+# while seeking: any line except a fence or a possible header followed by
+# its fence (or by the end of the chunk, while streaming), and complete code
+# blocks whose fence and first line have no "." for a path. The repeats are
+# bounded because the regex engine keeps a backtracking mark per repetition;
+# longer code blocks are opened and skipped like named ones.
+SKIPPABLE_REPEATS = 256
+SKIPPABLE_PATTERN = re.compile(
+    r'(?:'
+    r'(?!```|[ \t]*(?:\d|\#|\*|file|path)[^\n]*(?:\Z|\n(?:[^\S\n]*\n){0,%d}(?:```|[^\S\n]*`{0,2}\Z)))[^\n]*\n'
+    r'|```[^\S\n]*\n'
+    r'|```[^\S\n]*[^\s.][^\n.]*\n(?![^\S\n]*(?://|/\*|<!--|\#|--)[^\n]*\.)(?:(?!```)[^\n]*\n){0,%d}```[^\n]*\n'
+    r'){0,%d}' % (MAX_BLANK_LINES, SKIPPABLE_REPEATS, SKIPPABLE_REPEATS),
+    re.IGNORECASE
+)
+NUMBER_PREFIX_PATTERN = re.compile(r'(\d{1,6})\.\s+')
+LABEL_PREFIX_PATTERN = re.compile(r'(?:file|filename|path)\s*:\s*', re.IGNORECASE)
+PATH_ATTRIBUTES = ('title', 'filename', 'file', 'path', 'name')
+COMMENT_MARKERS = (('//', ''), ('/*', '*/'), ('<!--', '-->'), ('#', ''), ('--', ''))
+PATH_CHARACTERS = set('@._-/[]')
+ASCII_PATH_PATTERN = re.compile(r'[A-Za-z0-9@._\-/\[\]]+')
+
+# Scanner states: where the next line fits in the block layout
+SEEK_HEADER = 0
+EXPECT_BLANK = 1
+EXPECT_FENCE = 2
+IN_CONTENT = 3
+
+
+def looks_like_path(text: str) -> bool:
+    """Whether text is a relative file path with an extension (src/App.tsx, package.json)."""
+    name = text.rsplit('/', 1)[-1]
+    stem, dot, extension = name.rpartition('.')
+    if not (dot and stem and extension.isalnum()) or text.startswith('/'):
+        return False
+    # Most paths are plain ASCII and need only the one regex call
+    return (
+        ASCII_PATH_PATTERN.fullmatch(text) is not None
+        or all(char.isalnum() or char in PATH_CHARACTERS for char in text)
+    )
+
+
+def clean_path(text: str) -> str:
+    """Strip the markdown, quotes and labels models wrap around a file path."""
+    text = text.strip().strip('*`"\'').strip()
+    text = LABEL_PREFIX_PATTERN.sub('', text, count=1) if LABEL_PREFIX_PATTERN.match(text) else text
+    return text.strip().rstrip(':').strip('*`"\'').strip()
+
+
+def first_path(text: str) -> Optional[str]:
+    """Return the path a header names, ignoring notes after it ("src/App.tsx (main component)")."""
+    path = text.strip()
+    # A bare path has nothing to clean
+    if ASCII_PATH_PATTERN.fullmatch(path) is not None:
+        return path if looks_like_path(path) else None
+    path = clean_path(path)
+    if looks_like_path(path):
+        return path
+    tokens = path.split(None, 1)
+    if tokens and looks_like_path(clean_path(tokens[0])):
+        return clean_path(tokens[0])
+    return None
+
+
+def match_header(line: str) -> Optional[Tuple[int, Optional[int], str, str]]:
+    """Find a file header in a line and return its offset, number, path and format."""
+    indented = line.lstrip(' \t')
+    if not indented or indented[0] not in HEADER_STARTS:
+        return None
+    match = HEADER_PATTERN.match(line)
+    if match is None:
+        return None
+
+    file_format = match.lastgroup
+    text = line[match.end():]
+    number = None
+
+    if file_format == 'numbered':
+        number = int(match.group(file_format)[:-2])
+        path = first_path(text) or clean_path(text)
+        return (match.start(file_format), number, path, file_format) if path else None
+
+    if file_format == 'bold':
+        text = text.rstrip().rstrip(':').rstrip()[:-2]
+    # "### 1. src/App.tsx" and "**1. src/App.tsx**" carry a number too
+    numbered = NUMBER_PREFIX_PATTERN.match(text.strip())
+    if numbered:
+        number = int(numbered.group(1))
+        text = text.strip()[numbered.end():]
+    path = first_path(text)
+    return (match.start(file_format), number, path, file_format) if path else None
+
+
+def parse_fence(info: str) -> Tuple[str, Optional[str]]:
+    """Split a fence's info string into its language and an optional file path.
+
+    Handles ``tsx``, ``tsx title="src/App.tsx"``, ``tsx:src/App.tsx`` and a
+    bare ``src/App.tsx``.
+    """
+    tokens = info.split()
+    if not tokens:
+        return '', None
+
+    language, path = tokens[0], None
+    if ':' in language:
+        language, _, path = language.partition(':')
+    elif '.' in language and looks_like_path(clean_path(language)):
+        language, path = '', language
+
+    for token in tokens[1:]:
+        key, _, value = token.partition('=')
+        if value and key.lower() in PATH_ATTRIBUTES:
+            path = value
+        elif path is None and '.' in token and looks_like_path(clean_path(token)):
+            path = token
+
+    path = clean_path(path) if path else None
+    if path and not looks_like_path(path):
+        path = None
+    if not language and path:
+        language = path.rsplit('.', 1)[-1]
+    return language, path
+
+
+def comment_path(line: str) -> Optional[str]:
+    """Return the file path named by a comment line such as ``// src/App.tsx``."""
+    line = line.strip()
+    if '.' not in line:
+        return None
+    for opener, closer in COMMENT_MARKERS:
+        if line.startswith(opener) and line.endswith(closer):
+            path = clean_path(line[len(opener):len(line) - len(closer)])
+            return path if looks_like_path(path) else None
+    return None
+
+
+class FileBlock:
+    """A file block found by the scanner.
+
+    The content is the range [content_start, content_end) of a source string
+    that is shared by all blocks of one scan (the whole output), so a block
+    costs a few integers until its content is read. The stripped content is
+    materialized on first access and then kept, so later readers share it.
+    Fields can also be read with ``block['path']`` like the plain dict
+    blocks built by the component library.
+    """
+
+    __slots__ = (
+        'number', 'path', 'language', 'format', 'confidence', 'start', 'end',
+        '_source', '_content_start', '_content_end', '_content'
+    )
+
+    FIELDS = ('number', 'path', 'language', 'content', 'format', 'confidence', 'start', 'end')
+
+    def __init__(
+        self,
+        number: int,
+        path: str,
+        language: str,
+        file_format: str,
+        confidence: float,
+        start: int,
+        end: int,
+        source: str,
+        content_start: int,
+        content_end: int
+    ):
+        self.number = number
+        self.path = path
+        self.language = language
+        self.format = file_format
+        self.confidence = confidence
+        self.start = start
+        self.end = end
+        self._source = source
+        self._content_start = content_start
+        self._content_end = content_end
+        self._content: Optional[str] = None
+
+    @property
+    def content(self) -> str:
+        """The block's code without surrounding whitespace, sliced out on first access."""
+        if self._content is None:
+            source, start, end = self._source, self._content_start, self._content_end
+            # Strip by moving the offsets so only the final range is copied
+            while start < end and source[start].isspace():
+                start += 1
+            while end > start and source[end - 1].isspace():
+                end -= 1
+            self._content = source[start:end]
+            # The block no longer needs the rest of the source
+            self._source = None
+        return self._content
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"FileBlock({self.number}, {self.path!r}, {self.format}, {self.start}:{self.end})"
+
+
+def rank_file_blocks(blocks: List[FileBlock]) -> List[FileBlock]:
+    """Keep one block per path: the most confident, and the later one on a tie."""
+    best: Dict[str, FileBlock] = {}
+    for block in blocks:
+        current = best.get(block['path'])
+        if current is None or block['confidence'] >= current['confidence']:
+            best[block['path']] = block
+    return [block for block in blocks if best[block['path']] is block]
+
+
+class FileBlockScanner:
+    """Incremental, line-oriented recognizer for file blocks.
+
+    feed() accepts chunks of any size and returns the blocks completed by
+    them; close() flushes the last (unterminated) line. Blocks carry the
+    ``start`` and ``end`` offsets of their text in the whole output, and
+    ``open_block`` describes a block whose closing fence has not arrived.
+
+    When the whole output is known up front, pass it as ``source`` and feed
+    exactly that text: the blocks then point into it instead of collecting
+    their own copy of each content line.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self._source = source
+        self.position = 0
+        self._partial: List[str] = []
+        self._state = SEEK_HEADER
+        self._header: Optional[Dict[str, Any]] = None
+        self._blank_lines = 0
+        self._block: Optional[Dict[str, Any]] = None
+        self._content: List[str] = []
+        self._last_number = 0
+
+    @property
+    def open_block(self) -> Optional[Dict[str, Any]]:
+        """The block whose closing fence has not arrived yet, if it names a file."""
+        if self._block is None:
+            return None
+        block = {key: value for key, value in self._block.items() if key != 'content_start'}
+        if block['path'] is None:
+            path = comment_path(self._first_content_line())
+            if path is None:
+                return None
+            block.update(path=path, format='comment')
+        return block
+
+    def feed(self, chunk: str) -> List[FileBlock]:
+        """Consume a chunk of output and return the blocks it completed."""
+        completed: List[FileBlock] = []
+        start = 0
+        length = len(chunk)
+        while start < length:
+            if self._state == IN_CONTENT and not self._partial and not chunk.startswith(FENCE, start):
+                # Inside a code block only a line starting with a fence matters,
+                # so skip straight to the next one
+                fence = chunk.find('\n' + FENCE, start)
+                end = fence if fence >= 0 else chunk.rfind('\n', start)
+                if end >= start:
+                    if self._source is None:
+                        self._content.append(chunk[start:end])
+                    self.position += end + 1 - start
+                    start = end + 1
+                    continue
+
+            if self._state == SEEK_HEADER and not self._partial:
+                # Skip to the next line that could start a file block
+                end = SKIPPABLE_PATTERN.match(chunk, start).end()
+                if end > start:
+                    self.position += end - start
+                    start = end
+                    continue
+
+            newline = chunk.find('\n', start)
+            if newline < 0:
+                self._partial.append(chunk[start:])
+                break
+            if self._partial:
+                self._partial.append(chunk[start:newline])
+                line = ''.join(self._partial)
+                self._partial = []
+            else:
+                line = chunk[start:newline]
+            self._scan_line(line, completed)
+            self.position += len(line) + 1
+            start = newline + 1
+
+        return completed
+
+    def close(self) -> List[FileBlock]:
+        """Scan the final line (which has no newline) and return any block it closed."""
+        completed: List[FileBlock] = []
+        if self._partial:
+            line = ''.join(self._partial)
+            self._partial = []
+            # Only a closing fence can complete something without a trailing newline
+            if self._state == IN_CONTENT:
+                self._scan_line(line, completed)
+            self.position += len(line)
+        return completed
+
+    def _scan_line(self, line: str, completed: List[FileBlock]) -> None:
+        """Advance the state machine by one complete line."""
+        if self._state == IN_CONTENT:
+            if line.startswith(FENCE):
+                block = self._close_block()
+                if block is not None:
+                    completed.append(block)
+            elif self._source is None:
+                self._content.append(line)
+            return
+
+        if self._state != SEEK_HEADER and line.strip() == '' and self._blank_lines < MAX_BLANK_LINES:
+            self._blank_lines += 1
+            self._state = EXPECT_FENCE
+            return
+
+        if line.startswith(FENCE):
+            language, fence_path = parse_fence(line[len(FENCE):])
+            # A bare fence outside a block is a stray closing fence, not an opening
+            if language or fence_path:
+                self._open_block(language, fence_path, self.position + len(line) + 1)
+                return
+
+        # Anything else breaks the layout - the line may start a new block itself
+        header = match_header(line)
+        self._blank_lines = 0
+        if header is None:
+            self._state = SEEK_HEADER
+            self._header = None
+            return
+        offset, number, path, file_format = header
+        self._header = {'start': self.position + offset, 'number': number, 'path': path, 'format': file_format}
+        self._state = EXPECT_BLANK
+
+    def _open_block(self, language: str, fence_path: Optional[str], content_start: int) -> None:
+        """Start a code block, naming it after the header or the fence attribute."""
+        header = self._header if self._state != SEEK_HEADER else None
+        file_format, path, number, start = None, None, None, self.position
+        confidence = FORMAT_CONFIDENCE['comment']
+
+        if header is not None:
+            file_format, path, number, start = header['format'], header['path'], header['number'], header['start']
+            confidence = FORMAT_CONFIDENCE[file_format]
+            if file_format == 'numbered' and self._blank_lines != 1:
+                confidence -= LOOSE_LAYOUT_PENALTY
+        if fence_path and (header is None or FORMAT_CONFIDENCE['fence_attribute'] > confidence):
+            file_format, path, confidence = 'fence_attribute', fence_path, FORMAT_CONFIDENCE['fence_attribute']
+
+        # Without a path the block is named by a comment on its first line, or is not a file
+        self._block = {
+            'number': number,
+            'path': path,
+            'language': language or (path.rsplit('.', 1)[-1] if path else ''),
+            'format': file_format,
+            'confidence': round(confidence, 2),
+            'start': start,
+            'content_start': content_start
+        }
+        self._content = []
+        self._header = None
+        self._blank_lines = 0
+        self._state = IN_CONTENT
+
+    def _first_content_line(self) -> str:
+        """The first line of the open block's content (possibly still partial)."""
+        if self._source is None:
+            return self._content[0].split('\n', 1)[0] if self._content else ''
+        start = self._block['content_start']
+        end = self._source.find('\n', start, max(start, self.position))
+        return self._source[start:end if end >= 0 else max(start, self.position)]
+
+    def _close_block(self) -> Optional[FileBlock]:
+        """Finish the open block at the closing fence of the current line."""
+        block = self._block
+        content_start = block['content_start']
+        content_end = max(content_start, self.position - 1)
+        if self._source is None:
+            # Streaming: the collected lines become this block's own source
+            source = '\n'.join(self._content)
+            content_start, content_end = 0, len(source)
+        else:
+            source = self._source
+        self._block = None
+        self._content = []
+        self._state = SEEK_HEADER
+
+        if block['path'] is None:
+            first_line_end = source.find('\n', content_start, content_end)
+            first_line_end = content_end if first_line_end < 0 else first_line_end
+            path = comment_path(source[content_start:first_line_end])
+            if path is None:
+                return None
+            block.update(path=path, format='comment', language=block['language'] or path.rsplit('.', 1)[-1])
+            content_start = min(first_line_end + 1, content_end)
+
+        if block['number'] is None:
+            block['number'] = self._last_number + 1
+        self._last_number = max(self._last_number, block['number'])
+
+        return FileBlock(
+            block['number'],
+            block['path'],
+            block['language'],
+            block['format'],
+            block['confidence'],
+            block['start'],
+            self.position + len(FENCE),
+            source,
+            content_start,
+            content_end
+        )
+
+
+def scan_file_blocks(text: str) -> Tuple[List[FileBlock], Optional[Dict[str, Any]]]:
+    """Scan a complete output and return its closed blocks and the unclosed one, if any."""
+    scanner = FileBlockScanner(text)
+    blocks = scanner.feed(text)
+    blocks.extend(scanner.close())
+    return blocks, scanner.open_block
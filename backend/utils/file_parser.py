@@ -3,9 +3,24 @@
 import re
 import json
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import hashlib
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from pathlib import Path
 
+from backend.utils.code_validator import SCRIPT_EXTENSIONS, validate_script, validate_scripts
+from backend.utils.component_library import expand_site_config
+from backend.utils.file_block_scanner import FileBlockScanner, rank_file_blocks, scan_file_blocks
+from backend.utils.import_graph import build_import_graph, unresolved_paths
+from backend.utils.structure_trie import StructureTrie
+from backend.utils.task_outputs import CODE_TASK, TaskOutputStore
+
+# Bump whenever a change to parsing or validation changes parse() results,
+# so cached results from an older parser are re-parsed on next access
+PARSER_VERSION = '7'
+
+# Stored next to parsed_files.json in each project directory
+PARSE_CACHE_FILE = 'parse_cache.json'
+
 
 class ProjectFileParser:
     """Parse crew output text into individual project files."""
@@ -16,21 +31,35 @@ class ProjectFileParser:
         self.files = {}
         self.project_structure = {}
         self.parsing_errors = []
+        self.warnings = []
     
     def parse(self) -> Dict[str, Any]:
         """Main parsing method that extracts all files from crew output."""
         try:
             # 1. Extract file blocks from the text
             file_blocks = self.extract_file_blocks()
-            
-            # 2. Parse each file block
+            # How often the model drifted from the requested layout
+            block_formats: Dict[str, int] = {}
             for block in file_blocks:
-                parsed_file = self.parse_file_content(block)
+                block_formats[block['format']] = block_formats.get(block['format'], 0) + 1
+            
+            # 1b. Expand the component library slots into project files
+            file_blocks, slot_warnings = expand_site_config(file_blocks)
+            self.warnings.extend(slot_warnings)
+            
+            # 2. Parse each file block, validating the scripts in one batch
+            validations = self.validate_blocks(file_blocks)
+            for block, validation in zip(file_blocks, validations):
+                parsed_file = self.parse_file_content(block, validation)
                 if parsed_file:
                     self.files[parsed_file['path']] = parsed_file
             
-            # 3. Create project structure
+            # 3. Create project structure and the module graph between the files
             self.project_structure = self.create_project_structure()
+            import_graph = build_import_graph(self.files)
+            self.warnings.extend(
+                f"Unresolved import '{item['source']}' in {item['importer']}" for item in import_graph['unresolved']
+            )
             
             # 4. Validate all extracted content
             self.validate_all_files()
@@ -40,6 +69,9 @@ class ProjectFileParser:
                 'project_structure': self.project_structure,
                 'file_count': len(self.files),
                 'parsing_errors': self.parsing_errors,
+                'warnings': self.warnings,
+                'block_formats': block_formats,
+                'import_graph': import_graph,
                 'success': len(self.parsing_errors) == 0
             }
             
@@ -55,32 +87,26 @@ class ProjectFileParser:
     
     def extract_file_blocks(self) -> List[Dict]:
         """Extract numbered file blocks from crew output text."""
-        file_blocks = []
-        
-        # Regex pattern to match numbered files with code blocks
-        # Pattern: number. filepath\n\n```language\ncontent\n```
-        pattern = r'(\d+)\.\s+([^\n]+)\n\n```(\w+)\n(.*?)\n```'
+        file_blocks, _ = scan_file_blocks(self.crew_output)
         
-        matches = re.findall(pattern, self.crew_output, re.DOTALL)
-        
-        for match in matches:
-            file_number, file_path, language, content = match
-            
-            file_blocks.append({
-                'number': int(file_number),
-                'path': file_path.strip(),
-                'language': language.strip(),
-                'content': content.strip(),
-                'raw_match': match
-            })
+        # One block per path, preferring the most confidently recognized format
+        file_blocks = rank_file_blocks(file_blocks)
         
         # Sort by file number to maintain order
         file_blocks.sort(key=lambda x: x['number'])
         
         return file_blocks
     
-    def parse_file_content(self, file_block: Dict) -> Optional[Dict]:
-        """Parse individual file content and metadata."""
+    def parse_file_content(
+        self,
+        file_block: Dict,
+        validation: Optional[Tuple[bool, Optional[str]]] = None
+    ) -> Optional[Dict]:
+        """Parse individual file content and metadata.
+        
+        ``validation`` is a precomputed (is_valid, error) result from
+        validate_blocks(); without it the content is validated here.
+        """
         try:
             file_path = file_block['path']
             content = file_block['content']
@@ -93,7 +119,7 @@ class ProjectFileParser:
             directory = str(path_obj.parent) if path_obj.parent != Path('.') else ''
             
             # Validate content based on file type
-            is_valid, validation_error = self.validate_content(content, file_extension)
+            is_valid, validation_error = validation or self.validate_content(content, file_extension)
             
             if not is_valid:
                 self.parsing_errors.append(f"Validation failed for {file_path}: {validation_error}")
@@ -116,11 +142,23 @@ class ProjectFileParser:
             self.parsing_errors.append(error_msg)
             return None
     
+    def validate_blocks(self, file_blocks: List[Dict]) -> List[Tuple[bool, Optional[str]]]:
+        """Validate many file blocks, running the script lexer across files in parallel."""
+        extensions = [Path(block['path']).suffix for block in file_blocks]
+        script_indexes = [index for index, extension in enumerate(extensions) if extension in SCRIPT_EXTENSIONS]
+        script_results = validate_scripts([(file_blocks[index]['content'], extensions[index]) for index in script_indexes])
+        
+        results = {index: result for index, result in zip(script_indexes, script_results)}
+        return [
+            results[index] if index in results else self.validate_content(block['content'], extensions[index])
+            for index, block in enumerate(file_blocks)
+        ]
+    
     def validate_content(self, content: str, file_extension: str) -> Tuple[bool, Optional[str]]:
         """Validate file content based on file type."""
         try:
-            if file_extension in ['.tsx', '.ts', '.jsx', '.js']:
-                return self.validate_typescript_content(content)
+            if file_extension in SCRIPT_EXTENSIONS:
+                return self.validate_typescript_content(content, file_extension)
             elif file_extension == '.json':
                 return self.validate_json_content(content)
             elif file_extension == '.md':
@@ -134,29 +172,14 @@ class ProjectFileParser:
         except Exception as e:
             return False, f"Validation error: {str(e)}"
     
-    def validate_typescript_content(self, content: str) -> Tuple[bool, Optional[str]]:
-        """Validate TypeScript/JavaScript content."""
-        # Basic validation checks
-        checks = [
-            # Check for basic syntax elements
-            ('import' in content or 'export' in content or 'function' in content or 'const' in content, 
-             "No import/export/function/const statements found"),
-            
-            # Check for balanced braces (basic check)
-            (content.count('{') == content.count('}'), "Unbalanced curly braces"),
-            
-            # Check for balanced parentheses
-            (content.count('(') == content.count(')'), "Unbalanced parentheses"),
-            
-            # Check for React component patterns if it's a .tsx file
-            (True, None)  # Always pass for now, can add more specific React checks
-        ]
+    def validate_typescript_content(self, content: str, file_extension: str = '.tsx') -> Tuple[bool, Optional[str]]:
+        """Validate TypeScript/JavaScript content.
         
-        for is_valid, error_msg in checks:
-            if not is_valid:
-                return False, error_msg
-        
-        return True, None
+        A single-pass lexer checks bracket, string, template literal and JSX
+        tag balance, ignoring braces inside strings, comments and JSX text,
+        and reports the exact position of the first imbalance.
+        """
+        return validate_script(content, file_extension)
     
     def validate_json_content(self, content: str) -> Tuple[bool, Optional[str]]:
         """Validate JSON content."""
@@ -198,61 +221,16 @@ class ProjectFileParser:
         return has_css_syntax, None if has_css_syntax else "No CSS syntax detected"
     
     def create_project_structure(self) -> Dict[str, Any]:
-        """Create hierarchical project structure from parsed files."""
-        structure = {
-            'name': f'project-{self.project_id}',
-            'type': 'folder',
-            'children': {}
-        }
-        
-        for file_path, file_info in self.files.items():
-            self._add_file_to_structure(structure, file_path, file_info)
+        """Create hierarchical project structure from parsed files.
         
-        # Convert children dict to list for easier frontend consumption
-        structure['children'] = self._convert_structure_to_list(structure['children'])
+        Folders come first, then files, both sorted alphabetically.
+        """
+        structure = StructureTrie(self.project_id)
         
-        return structure
-    
-    def _add_file_to_structure(self, structure: Dict, file_path: str, file_info: Dict):
-        """Add a file to the hierarchical structure."""
-        path_parts = file_path.split('/')
-        current = structure['children']
-        
-        # Navigate/create directory structure
-        for i, part in enumerate(path_parts[:-1]):
-            if part not in current:
-                current[part] = {
-                    'name': part,
-                    'type': 'folder',
-                    'children': {}
-                }
-            current = current[part]['children']
-        
-        # Add the file
-        file_name = path_parts[-1]
-        current[file_name] = {
-            'name': file_name,
-            'type': 'file',
-            'path': file_path,
-            'extension': file_info['extension'],
-            'size': file_info['size'],
-            'is_valid': file_info['is_valid']
-        }
-    
-    def _convert_structure_to_list(self, children_dict: Dict) -> List[Dict]:
-        """Convert children dictionary to list format."""
-        children_list = []
-        
-        # Sort: folders first, then files, both alphabetically
-        items = list(children_dict.items())
-        items.sort(key=lambda x: (x[1]['type'] == 'file', x[0].lower()))
-        
-        for name, item in items:
-            if item['type'] == 'folder':
-                item['children'] = self._convert_structure_to_list(item['children'])
-            children_list.append(item)
+        for file_path, file_info in self.files.items():
+            structure.insert(file_path, file_info)
         
-        return children_list
+        return structure.to_dict()
     
     def validate_all_files(self):
         """Run additional validation on all parsed files."""
@@ -299,12 +277,214 @@ class ProjectFileParser:
         return type_counts
 
 
+class IncrementalFileParser(ProjectFileParser):
+    """Parse file blocks out of crew output that arrives in chunks.
+    
+    Each call to feed() returns the files whose code block closed in that
+    chunk, so they can be written before the LLM has finished responding.
+    ``closed_blocks`` maps each closed block's path (before component library
+    expansion) to its content, recognition confidence and whether it validated.
+    """
+    
+    def __init__(self, project_id: str):
+        super().__init__('', project_id)
+        self._chunks: List[str] = []
+        self._scanner = FileBlockScanner()
+        self.closed_blocks: Dict[str, Dict[str, Any]] = {}
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Append a chunk of output and return files completed by it."""
+        self._chunks.append(chunk)
+        return self._complete(self._scanner.feed(chunk))
+    
+    def close(self) -> List[Dict]:
+        """Finish the stream and return any files not yet reported."""
+        self.crew_output = ''.join(self._chunks)
+        return self._complete(self._scanner.close())
+    
+    def _complete(self, closed: List[Dict]) -> List[Dict]:
+        """Parse the file blocks the scanner has just closed."""
+        completed = []
+        for closed_block in closed:
+            # A less confidently recognized repeat of a file never replaces it
+            previous = self.closed_blocks.get(closed_block['path'])
+            if previous is not None and previous['confidence'] > closed_block['confidence']:
+                continue
+            
+            # A completed site.json is written out as the library files it fills
+            blocks, _ = expand_site_config([closed_block], final=False)
+            parsed_files = [parsed_file for parsed_file in map(self.parse_file_content, blocks) if parsed_file]
+            for parsed_file in parsed_files:
+                self.files[parsed_file['path']] = parsed_file
+                completed.append(parsed_file)
+            
+            self.closed_blocks[closed_block['path']] = {
+                'content': closed_block['content'],
+                'confidence': closed_block['confidence'],
+                'is_valid': bool(parsed_files) and all(parsed_file['is_valid'] for parsed_file in parsed_files)
+            }
+        
+        return completed
+
+
+def detect_truncation(
+    crew_output: str,
+    expected_files: List[str],
+    stop_reason: Optional[str] = None,
+    provided_files: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """Find files that were cut off or never generated in crew output.
+    
+    Returns the incomplete files (an unclosed final block or content that
+    fails validation), the expected files that are missing, the output up to
+    the last complete block and the next free file number, so continuation
+    output can be appended and re-parsed.
+    
+    Files imported by the generated code that do not exist - in the output,
+    the component library's site.json or ``provided_files`` (added later,
+    such as templates) - are missing too and listed in ``unresolved_imports``.
+    """
+    parser = ProjectFileParser(crew_output, 'truncation-check')
+    reasons = []
+    incomplete_files = []
+    found_paths = []
+    last_number = 0
+    
+    blocks, unclosed = scan_file_blocks(crew_output)
+    for block, (is_valid, validation_error) in zip(blocks, parser.validate_blocks(blocks)):
+        last_number = max(last_number, block['number'])
+        found_paths.append(block['path'])
+        
+        if not is_valid:
+            incomplete_files.append(block['path'])
+            reasons.append(f"{block['path']}: {validation_error}")
+    
+    # A block that opened after the last complete one but never closed
+    if unclosed:
+        incomplete_files.append(unclosed['path'])
+        last_number = max(last_number, unclosed['number'])
+        reasons.append(f"Unclosed code block for {unclosed['path']}")
+        complete_output = crew_output[:unclosed['start']]
+    else:
+        complete_output = crew_output
+    
+    missing_files = [
+        expected for expected in expected_files
+        if not any(path == expected or path.endswith('/' + expected) for path in found_paths)
+        and expected not in incomplete_files
+    ]
+    if missing_files:
+        reasons.append(f"Missing expected files: {', '.join(missing_files)}")
+    
+    # Imports of files that were never generated, after site.json renders the library files;
+    # its App.tsx imports every section, so custom sections that never arrived count too
+    expanded_blocks, _ = expand_site_config(rank_file_blocks(blocks), final=False)
+    project_files = {block['path']: block['content'] for block in expanded_blocks}
+    project_files.update((path, '') for path in provided_files if path not in project_files)
+    unresolved_imports = [
+        item for item in build_import_graph(project_files)['unresolved']
+        if item['path'] not in incomplete_files and item['path'] not in missing_files
+    ]
+    unresolved_files = unresolved_paths({'unresolved': unresolved_imports})
+    if unresolved_files:
+        missing_files.extend(unresolved_files)
+        reasons.append(f"Unresolved imports: {', '.join(unresolved_files)}")
+    
+    if stop_reason == 'max_tokens':
+        reasons.append("Response stopped at the max_tokens limit")
+    
+    return {
+        'truncated': bool(reasons),
+        'reasons': reasons,
+        'incomplete_files': list(dict.fromkeys(incomplete_files)),
+        'missing_files': missing_files,
+        'unresolved_imports': unresolved_imports,
+        'complete_output': complete_output.rstrip(),
+        'next_number': last_number + 1
+    }
+
+
 def parse_project_files(crew_output: str, project_id: str) -> Dict[str, Any]:
     """Convenience function to parse project files from crew output."""
     parser = ProjectFileParser(crew_output, project_id)
     return parser.parse()
 
 
+def crew_output_hash(crew_output: str) -> str:
+    """SHA-256 of the crew output, the key of the parse-result cache."""
+    return hashlib.sha256(crew_output.encode('utf-8')).hexdigest()
+
+
+def parse_project_files_cached(
+    crew_output: str,
+    project_id: str,
+    projects_dir: str = "generated/projects"
+) -> Dict[str, Any]:
+    """Parse project files, reusing the stored result for the same output.
+    
+    The result is cached in the project directory, keyed by the SHA-256 of
+    the crew output and PARSER_VERSION. A different output or a parser
+    upgrade makes the stored result stale, and it is re-parsed and replaced
+    here on the next access. ``from_cache`` in the result tells which
+    happened.
+    """
+    cache_path = Path(projects_dir) / project_id / PARSE_CACHE_FILE
+    output_hash = crew_output_hash(crew_output)
+    
+    cached = _cached_parse_result(cache_path, output_hash)
+    if cached is not None:
+        return cached
+    
+    result = parse_project_files(crew_output, project_id)
+    
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'crew_output_sha256': output_hash,
+                'parser_version': PARSER_VERSION,
+                'result': result
+            }, f)
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # The cache only saves time; an unwritable project directory is not an error
+        pass
+    
+    return {**result, 'from_cache': False}
+
+
+def _cached_parse_result(cache_path: Path, output_hash: str) -> Optional[Dict[str, Any]]:
+    """The stored parse result for this output and parser version, if there is one."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('crew_output_sha256') == output_hash and cached.get('parser_version') == PARSER_VERSION:
+            return {**cached['result'], 'from_cache': True}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def load_parsed_project(project_id: str, projects_dir: str = "generated/projects") -> Dict[str, Any]:
+    """Parse a generated project's saved code output, using the parse-result cache.
+    
+    Only the engineer's output is read, and not even that when the hash in
+    the task output index matches the cached result.
+    """
+    store = TaskOutputStore(project_id, projects_dir)
+    entry = store.entry(CODE_TASK)
+    if entry is not None:
+        cached = _cached_parse_result(Path(projects_dir) / project_id / PARSE_CACHE_FILE, entry['sha256'])
+        if cached is not None:
+            return cached
+    
+    crew_output = store.load(CODE_TASK)
+    if crew_output is None:
+        raise FileNotFoundError(f"No code output saved for project {project_id}")
+    return parse_project_files_cached(crew_output, project_id, projects_dir)
+
+
 def get_parsing_summary(crew_output: str, project_id: str) -> Dict[str, Any]:
     """Get a summary of parsing results without full parsing."""
     parser = ProjectFileParser(crew_output, project_id)
@@ -0,0 +1,54 @@
+"""Per-stage token and latency accounting for website generation."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+# Stages executed by the crew agents (one LLM-backed task each)
+LLM_STAGES = ['requirements', 'design', 'design_reconcile', 'development']
+
+# Post-processing stages run after the crew has finished
+PIPELINE_STAGES = ['parse', 'inject', 'write', 'zip']
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Claude models (about four characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+@contextmanager
+def time_stage(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """Record the wall time of the wrapped block in ``timings[stage]`` (seconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - start, 4)
+
+
+def summarize_stage_metrics(stages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-stage metrics into totals and the dominant (slowest) stage."""
+    # Stages that ran in parallel report the time they overlapped (see speculative design)
+    overlapped_time = sum(stage.get('overlapped_time', 0) or 0 for stage in stages.values())
+    total_wall_time = sum(stage.get('wall_time', 0) or 0 for stage in stages.values()) - overlapped_time
+
+    dominant_stage: Optional[str] = None
+    dominant_time = 0.0
+    for name, stage in stages.items():
+        wall_time = stage.get('wall_time', 0) or 0
+        if wall_time > dominant_time:
+            dominant_stage = name
+            dominant_time = wall_time
+
+    return {
+        'total_wall_time': round(total_wall_time, 4),
+        'total_input_tokens': sum(stage.get('input_tokens', 0) or 0 for stage in stages.values()),
+        'total_output_tokens': sum(stage.get('output_tokens', 0) or 0 for stage in stages.values()),
+        'total_cache_read_tokens': sum(stage.get('cache_read_tokens', 0) or 0 for stage in stages.values()),
+        'total_retries': sum(stage.get('retries', 0) or 0 for stage in stages.values()),
+        'total_rate_limit_wait': round(sum(stage.get('rate_limit_wait', 0) or 0 for stage in stages.values()), 4),
+        'llm_wall_time': round(sum(stages.get(name, {}).get('wall_time', 0) or 0 for name in LLM_STAGES) - overlapped_time, 4),
+        'pipeline_wall_time': round(sum(stages.get(name, {}).get('wall_time', 0) or 0 for name in PIPELINE_STAGES), 4),
+        'dominant_stage': dominant_stage,
+        'dominant_stage_share': round(dominant_time / total_wall_time, 3) if total_wall_time else 0
+    }
@@ -0,0 +1,191 @@
+"""Module graph of the imports and exports between a project's script files.
+
+The graph is built once from the parsed files and stored in the project
+manifest, so later consumers do not have to read the sources again:
+
+- imports that point at a project file that was never generated (App.tsx
+  importing a Gallery that is missing) can be requested on their own,
+- named imports that the target module does not export are listed,
+- the preview can preload every module reachable from the entry point.
+
+Only local imports are resolved: relative paths and the ``@/`` alias for
+``src/``. Bare specifiers such as ``react`` are recorded as external
+packages.
+"""
+
+import posixpath
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.utils.code_validator import SCRIPT_EXTENSIONS
+
+# Tried in this order for an import without an extension, as Vite does
+RESOLVE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js', '.json', '.css')
+ENTRY_POINTS = ('src/main.tsx', 'src/main.ts', 'src/index.tsx', 'src/App.tsx')
+
+# The clause only allows identifier characters, braces, commas and `*`, so a
+# match cannot run past the end of an import statement
+IMPORT_PATTERN = re.compile(
+    r'^[ \t]*(?P<kind>import|export)\s+(?:type\s+)?(?P<clause>[\w$*{}\s,]*?)\s*from\s*[\'"](?P<source>[^\'"\n]+)[\'"]'
+    r'|^[ \t]*import\s*[\'"](?P<side_effect>[^\'"\n]+)[\'"]'
+    r'|\bimport\(\s*[\'"](?P<dynamic>[^\'"\n]+)[\'"]\s*\)',
+    re.MULTILINE
+)
+EXPORT_DEFAULT_PATTERN = re.compile(r'^[ \t]*export\s+default\b', re.MULTILINE)
+EXPORT_DECLARATION_PATTERN = re.compile(
+    r'^[ \t]*export\s+(?:declare\s+)?(?:async\s+)?(?:abstract\s+)?'
+    r'(?:function\s*\*?|class|const|let|var|interface|type|enum)\s+(?P<name>[A-Za-z_$][\w$]*)',
+    re.MULTILINE
+)
+EXPORT_LIST_PATTERN = re.compile(r'^[ \t]*export\s+(?:type\s+)?\{(?P<names>[^}]*)\}', re.MULTILINE)
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def clause_names(clause: str) -> List[str]:
+    """Names an import clause takes from its module: ``default``, ``*`` or named exports."""
+    names = []
+    head, _, rest = clause.partition('{')
+    for part in head.split(','):
+        part = part.strip()
+        if part.startswith('*'):
+            names.append('*')
+        elif IDENTIFIER_PATTERN.fullmatch(part) and part != 'type':
+            names.append('default')
+    if rest:
+        for part in rest.split('}', 1)[0].split(','):
+            words = part.split()
+            if words and words[0] == 'type':
+                words = words[1:]
+            if words:
+                names.append(words[0])
+    return names
+
+
+def module_exports(content: str) -> List[str]:
+    """Names a module exports; ``*`` when it re-exports another module wholesale."""
+    exports = []
+    if EXPORT_DEFAULT_PATTERN.search(content):
+        exports.append('default')
+    exports.extend(match.group('name') for match in EXPORT_DECLARATION_PATTERN.finditer(content))
+    for match in EXPORT_LIST_PATTERN.finditer(content):
+        for part in match.group('names').split(','):
+            words = part.split()
+            if words and words[0] == 'type':
+                words = words[1:]
+            if words:
+                # `a as b` is exported as b
+                exports.append(words[-1])
+    for match in IMPORT_PATTERN.finditer(content):
+        if match.group('kind') == 'export' and match.group('clause').strip().startswith('*'):
+            exports.append('*')
+    return list(dict.fromkeys(exports))
+
+
+def import_base(importer: str, source: str) -> Optional[str]:
+    """Project path an import points at before extensions are tried, or None if external."""
+    if source.startswith('@/'):
+        return posixpath.normpath('src/' + source[2:])
+    if source.startswith('.'):
+        return posixpath.normpath(posixpath.join(posixpath.dirname(importer), source))
+    return None
+
+
+def resolve_import(base: str, paths: Iterable[str]) -> Optional[str]:
+    """The project file an import resolves to, trying extensions and index files."""
+    for candidate in (base,) + tuple(base + extension for extension in RESOLVE_EXTENSIONS) + tuple(
+        f"{base}/index{extension}" for extension in SCRIPT_EXTENSIONS
+    ):
+        if candidate in paths:
+            return candidate
+    return None
+
+
+def expected_path(base: str) -> str:
+    """The file a missing import should be generated as."""
+    if posixpath.splitext(base)[1] in RESOLVE_EXTENSIONS:
+        return base
+    # Components are PascalCase .tsx files; anything else is a plain module
+    return base + ('.tsx' if posixpath.basename(base)[:1].isupper() else '.ts')
+
+
+def build_import_graph(files: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the module graph of project files.
+
+    Args:
+        files: Project files by path; each value is the file's content or
+            a parsed file with a ``content`` key
+
+    Returns:
+        ``modules`` (each script's imports, with the file each resolves to,
+        and its exports), ``unresolved`` local imports of missing files,
+        ``missing_exports`` for names a resolved module does not export,
+        the ``external`` packages used and the ``entry`` module
+    """
+    contents = {path: info if isinstance(info, str) else info.get('content', '') for path, info in files.items()}
+    modules: Dict[str, Dict[str, Any]] = {}
+    external = set()
+    unresolved = []
+
+    for path, content in contents.items():
+        if posixpath.splitext(path)[1] not in SCRIPT_EXTENSIONS:
+            continue
+        imports = []
+        for match in IMPORT_PATTERN.finditer(content):
+            source = match.group('source') or match.group('side_effect') or match.group('dynamic')
+            names = clause_names(match.group('clause')) if match.group('clause') is not None else []
+            base = import_base(path, source)
+            if base is None:
+                # Scoped packages keep their scope: @vitejs/plugin-react
+                external.add('/'.join(source.split('/')[:2 if source.startswith('@') else 1]))
+                continue
+            resolved = resolve_import(base, contents)
+            imports.append({'source': source, 'resolved': resolved, 'names': names})
+            if resolved is None:
+                unresolved.append({'importer': path, 'source': source, 'path': expected_path(base)})
+        modules[path] = {'imports': imports, 'exports': module_exports(content)}
+
+    missing_exports = []
+    for path, module in modules.items():
+        for imported in module['imports']:
+            target = modules.get(imported['resolved'])
+            if target is None or '*' in target['exports']:
+                continue
+            missing_exports.extend(
+                {'importer': path, 'module': imported['resolved'], 'name': name}
+                for name in imported['names']
+                if name != '*' and name not in target['exports']
+            )
+
+    return {
+        'modules': modules,
+        'unresolved': unresolved,
+        'missing_exports': missing_exports,
+        'external': sorted(external),
+        'entry': next((entry for entry in ENTRY_POINTS if entry in modules), None)
+    }
+
+
+def unresolved_paths(graph: Dict[str, Any]) -> List[str]:
+    """Missing files imported by the project, each listed once."""
+    return list(dict.fromkeys(item['path'] for item in graph.get('unresolved', [])))
+
+
+def preload_set(graph: Dict[str, Any], entry: Optional[str] = None) -> List[str]:
+    """Script modules reachable from the entry point, nearest first, entry excluded."""
+    modules = graph.get('modules', {})
+    entry = entry or graph.get('entry')
+    if entry not in modules:
+        return []
+
+    seen = {entry}
+    order = []
+    queue = deque([entry])
+    while queue:
+        for imported in modules[queue.popleft()]['imports']:
+            target = imported['resolved']
+            if target in modules and target not in seen:
+                seen.add(target)
+                order.append(target)
+                queue.append(target)
+    return order
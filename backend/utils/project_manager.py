@@ -1,14 +1,25 @@
 """Project management utilities for tracking website generation projects."""
 
+import gzip
 import json
 import os
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from backend.utils.generation_metrics import summarize_stage_metrics
 from backend.utils.project_structure import ProjectStructureManager
 from backend.utils.project_preview import preview_manager
+from backend.utils.similarity_index import RequestSimilarityIndex
+
+
+# Maximum number of events kept on a project record
+MAX_PROJECT_EVENTS = 500
+
+# Serializes read-modify-write cycles on projects.json; crew stages may run in parallel threads
+_projects_lock = threading.RLock()
 
 
 class ProjectManager:
@@ -44,14 +55,17 @@ class ProjectManager:
             "current_step": "Initializing...",
             "files_generated": [],
             "errors": [],
+            "metrics": {"stages": {}, "summary": {}},
+            "events": [],
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat()
         }
         
         # Save project data
-        projects = self._load_projects()
-        projects[project_id] = project_data
-        self._save_projects(projects)
+        with _projects_lock:
+            projects = self._load_projects()
+            projects[project_id] = project_data
+            self._save_projects(projects)
         
         # Create project directory
         project_dir = self.projects_dir / project_id
@@ -74,54 +88,104 @@ class ProjectManager:
         errors: Optional[List[str]] = None
     ) -> None:
         """Update project status."""
-        projects = self._load_projects()
-        
-        if project_id not in projects:
-            raise ValueError(f"Project {project_id} not found")
-        
-        project = projects[project_id]
-        project["status"] = status
-        project["current_step"] = current_step
-        project["updated_at"] = datetime.now().isoformat()
-        
-        if progress is not None:
-            project["progress"] = progress
-        
-        if files_generated is not None:
-            project["files_generated"] = files_generated
-        
-        if errors is not None:
-            project["errors"] = errors
-        
-        self._save_projects(projects)
+        with _projects_lock:
+            projects = self._load_projects()
+            
+            if project_id not in projects:
+                raise ValueError(f"Project {project_id} not found")
+            
+            project = projects[project_id]
+            project["status"] = status
+            project["current_step"] = current_step
+            project["updated_at"] = datetime.now().isoformat()
+            
+            if progress is not None:
+                project["progress"] = progress
+            
+            if files_generated is not None:
+                project["files_generated"] = files_generated
+            
+            if errors is not None:
+                project["errors"] = errors
+            
+            self._save_projects(projects)
     
     def add_generated_file(self, project_id: str, file_path: str) -> None:
         """Add a generated file to the project."""
-        projects = self._load_projects()
-        
-        if project_id not in projects:
-            raise ValueError(f"Project {project_id} not found")
-        
-        project = projects[project_id]
-        if file_path not in project["files_generated"]:
-            project["files_generated"].append(file_path)
-            project["updated_at"] = datetime.now().isoformat()
-            self._save_projects(projects)
+        with _projects_lock:
+            projects = self._load_projects()
+            
+            if project_id not in projects:
+                raise ValueError(f"Project {project_id} not found")
+            
+            project = projects[project_id]
+            if file_path not in project["files_generated"]:
+                project["files_generated"].append(file_path)
+                project["updated_at"] = datetime.now().isoformat()
+                self._save_projects(projects)
     
     def add_error(self, project_id: str, error: str) -> None:
         """Add an error to the project."""
-        projects = self._load_projects()
+        with _projects_lock:
+            projects = self._load_projects()
+            
+            if project_id not in projects:
+                raise ValueError(f"Project {project_id} not found")
+            
+            project = projects[project_id]
+            project["errors"].append({
+                "message": error,
+                "timestamp": datetime.now().isoformat()
+            })
+            project["updated_at"] = datetime.now().isoformat()
+            self._save_projects(projects)
+    
+    def record_stage_metrics(self, project_id: str, stage: str, metrics: Dict[str, Any]) -> None:
+        """Store the metrics of a generation stage and refresh the summary."""
+        with _projects_lock:
+            projects = self._load_projects()
+            
+            if project_id not in projects:
+                raise ValueError(f"Project {project_id} not found")
+            
+            project = projects[project_id]
+            project_metrics = project.setdefault("metrics", {"stages": {}, "summary": {}})
+            project_metrics["stages"][stage] = metrics
+            project_metrics["summary"] = summarize_stage_metrics(project_metrics["stages"])
+            project["updated_at"] = datetime.now().isoformat()
+            self._save_projects(projects)
+    
+    def add_event(self, project_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append an event (e.g. file_created) to the project's event log."""
+        with _projects_lock:
+            projects = self._load_projects()
+            
+            if project_id not in projects:
+                raise ValueError(f"Project {project_id} not found")
+            
+            project = projects[project_id]
+            events = project.setdefault("events", [])
+            event = {
+                "id": events[-1]["id"] + 1 if events else 1,
+                "type": event_type,
+                "data": data,
+                "timestamp": datetime.now().isoformat()
+            }
+            events.append(event)
+            del events[:-MAX_PROJECT_EVENTS]
+            project["updated_at"] = datetime.now().isoformat()
+            self._save_projects(projects)
+            
+            return event
+    
+    def get_events(self, project_id: str, since: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """Get the project's events with an id greater than ``since``."""
+        project = self.get_project_status(project_id)
         
-        if project_id not in projects:
-            raise ValueError(f"Project {project_id} not found")
+        if project is None:
+            return None
         
-        project = projects[project_id]
-        project["errors"].append({
-            "message": error,
-            "timestamp": datetime.now().isoformat()
-        })
-        project["updated_at"] = datetime.now().isoformat()
-        self._save_projects(projects)
+        return [event for event in project.get("events", []) if event["id"] > since]
     
     def list_projects(self) -> List[Dict[str, Any]]:
         """List all projects."""
@@ -140,7 +204,9 @@ class ProjectManager:
             if file_path.is_file():
                 relative_path = file_path.relative_to(project_dir)
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
+                    # Task outputs may be stored gzip-compressed
+                    opener = gzip.open if file_path.suffix == '.gz' else open
+                    with opener(file_path, 'rt', encoding='utf-8') as f:
                         files[str(relative_path)] = f.read()
                 except Exception as e:
                     files[str(relative_path)] = f"Error reading file: {str(e)}"
@@ -210,12 +276,13 @@ class ProjectManager:
         """Delete a project and all its associated files."""
         try:
             # Remove from projects data
-            projects = self._load_projects()
-            if project_id not in projects:
-                return False
-            
-            del projects[project_id]
-            self._save_projects(projects)
+            with _projects_lock:
+                projects = self._load_projects()
+                if project_id not in projects:
+                    return False
+                
+                del projects[project_id]
+                self._save_projects(projects)
             
             # Remove project directory
             project_dir = self.projects_dir / project_id
@@ -223,6 +290,9 @@ class ProjectManager:
                 import shutil
                 shutil.rmtree(project_dir)
             
+            # Its specification can no longer be reused
+            RequestSimilarityIndex(data_dir=str(self.data_dir)).remove(project_id)
+            
             # Stop any running preview
             try:
                 preview_manager.stop_preview(project_id)
@@ -334,5 +404,8 @@ class ProjectManager:
     
     def _save_projects(self, projects: Dict[str, Any]) -> None:
         """Save projects to file."""
-        with open(self.projects_file, 'w') as f:
+        # Write then rename so concurrent readers never see a partial file
+        temp_file = self.projects_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
             json.dump(projects, f, indent=2)
+        os.replace(temp_file, self.projects_file)
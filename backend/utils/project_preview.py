@@ -83,8 +83,10 @@ class ProjectPreviewManager:
                     'status': 'starting'
                 }
                 
-                # Wait a moment for server to start
-                time.sleep(2)
+                # Wait for the server to accept connections
+                deadline = time.time() + 2
+                while not self._is_server_running(port) and time.time() < deadline:
+                    time.sleep(0.05)
                 
                 # Check if server is actually running
                 if self._is_server_running(port):
@@ -304,7 +306,9 @@ class ProjectPreviewManager:
         """Start a static file server for the project."""
         try:
             # Create a simple HTTP server using Python
-            # FIXED: Use current directory (.) since we set cwd to project_path
+            # Files are served through the unresolved files path, so a draft
+            # atomically swapped for the finished project is picked up
+            files_dir = str(project_path.absolute())
             server_script = f"""
 import http.server
 import socketserver
@@ -312,10 +316,11 @@ import os
 import sys
 from pathlib import Path
 
+FILES_DIR = {files_dir!r}
+
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        # Use current directory since we're running from project directory
-        super().__init__(*args, directory='.', **kwargs)
+        super().__init__(*args, directory=FILES_DIR, **kwargs)
     
     def end_headers(self):
         # Add CORS headers
@@ -325,32 +330,33 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         super().end_headers()
     
     def guess_type(self, path):
-        # Handle React/JS files properly
-        mimetype, encoding = super().guess_type(path)
+        # Handle React/JS files properly (guess_type returns only the MIME type)
+        mimetype = super().guess_type(path)
         if path.endswith('.js'):
-            return 'application/javascript', encoding
+            return 'application/javascript'
         elif path.endswith('.jsx'):
-            return 'application/javascript', encoding
+            return 'application/javascript'
         elif path.endswith('.ts'):
-            return 'application/typescript', encoding
+            return 'application/typescript'
         elif path.endswith('.tsx'):
-            return 'application/typescript', encoding
+            return 'application/typescript'
         elif path.endswith('.css'):
-            return 'text/css', encoding
+            return 'text/css'
         elif path.endswith('.json'):
-            return 'application/json', encoding
-        return mimetype, encoding
+            return 'application/json'
+        return mimetype
     
     def do_GET(self):
         # For SPA routing, serve index.html for non-file requests
-        if not Path('.' + self.path).exists() and not self.path.startswith('/static'):
+        if not Path(FILES_DIR + self.path).exists() and not self.path.startswith('/static'):
             self.path = '/index.html'
         return super().do_GET()
 
-# Start server
+# Start server; reuse the address so a restarted preview can bind its port right away
 PORT = {port}
+socketserver.TCPServer.allow_reuse_address = True
 print(f"Starting server on port {{PORT}}")
-print(f"Serving from: {{os.getcwd()}}")
+print(f"Serving from: {{FILES_DIR}}")
 
 try:
     with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
@@ -362,17 +368,17 @@ except Exception as e:
     traceback.print_exc()
 """
             
-            # Write server script to temp file
-            script_path = project_path / f"preview_server_{port}.py"
+            # Write server script next to the files so it survives a swap
+            script_path = project_path.parent / f"preview_server_{port}.py"
             with open(script_path, 'w') as f:
                 f.write(server_script)
             
-            # Start the server process with cwd set to project directory
+            # Start the server process from the project directory
             process = subprocess.Popen(
                 [sys.executable, f"preview_server_{port}.py"],  # Use relative path
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                cwd=str(project_path)  # Set working directory to project path
+                cwd=str(project_path.parent)
             )
             
             return {
@@ -397,7 +403,7 @@ except Exception as e:
             
             # Clean up server script
             try:
-                script_path = Path(preview_info['project_path']) / f"preview_server_{preview_info['port']}.py"
+                script_path = Path(preview_info['project_path']).parent / f"preview_server_{preview_info['port']}.py"
                 if script_path.exists():
                     script_path.unlink()
             except Exception:
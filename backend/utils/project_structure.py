@@ -1,12 +1,16 @@
 """Project structure manager for creating physical file structures and ZIP archives."""
 
 import os
+import time
 import zipfile
 import shutil
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import json
 
+from .generation_metrics import time_stage
+from .import_graph import build_import_graph, preload_set
+
 # Import template injection functionality
 try:
     from .template_engine import inject_templates
@@ -15,15 +19,18 @@ except ImportError:
     def inject_templates(parsed_files, project_metadata):
         return parsed_files
 
+# Files are written here first when they must replace a live project in one step
+STAGING_FILES_DIR = "files.next"
+
 
 class ProjectStructureManager:
     """Manage project folder structure and file creation."""
     
-    def __init__(self, project_id: str, base_path: str = "generated/projects"):
+    def __init__(self, project_id: str, base_path: str = "generated/projects", files_dir: str = "files"):
         self.project_id = project_id
         self.base_path = Path(base_path)
         self.project_path = self.base_path / project_id
-        self.files_path = self.project_path / "files"
+        self.files_path = self.project_path / files_dir
         self.zip_path = self.project_path / "project.zip"
         
     def create_project_folder(self, parsed_files: Dict[str, Any]) -> Dict[str, Any]:
@@ -37,18 +44,12 @@ class ProjectStructureManager:
             
             # Create all files
             for file_path, file_info in parsed_files['files'].items():
-                full_file_path = self.files_path / file_path
+                full_file_path = self.write_file(file_path, file_info['content'])
                 
-                # Create directory if it doesn't exist
                 directory = full_file_path.parent
                 if directory != self.files_path:
-                    directory.mkdir(parents=True, exist_ok=True)
                     created_directories.add(str(directory.relative_to(self.files_path)))
                 
-                # Write file content
-                with open(full_file_path, 'w', encoding='utf-8') as f:
-                    f.write(file_info['content'])
-                
                 created_files.append({
                     'path': file_path,
                     'full_path': str(full_file_path),
@@ -84,6 +85,65 @@ class ProjectStructureManager:
                 'files_path': str(self.files_path)
             }
     
+    def write_file(self, file_path: str, content: str) -> Path:
+        """Write a single project file, creating its directory if needed."""
+        full_file_path = self.files_path / file_path
+        full_file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(full_file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        return full_file_path
+    
+    def swap_in_files(self, staged_dir: str = STAGING_FILES_DIR) -> Dict[str, Any]:
+        """Atomically replace the project files with a fully written staging directory.
+        
+        The staging directory is renamed to a versioned directory and the
+        files path becomes a symlink to it, so replacing it later is a single
+        rename and readers such as the preview server never see a mix of old
+        and new files.
+        """
+        try:
+            staged_path = self.project_path / staged_dir
+            if not staged_path.is_dir():
+                return {
+                    'success': False,
+                    'error': f'Staging directory {staged_dir} does not exist'
+                }
+            
+            version_path = self.project_path / f"{self.files_path.name}.{time.time_ns()}"
+            staged_path.rename(version_path)
+            
+            link_path = self.project_path / f"{self.files_path.name}.link"
+            if link_path.is_symlink():
+                link_path.unlink()
+            link_path.symlink_to(version_path.name, target_is_directory=True)
+            
+            previous_path = None
+            if self.files_path.is_symlink():
+                previous_path = self.files_path.resolve()
+            elif self.files_path.exists():
+                # A plain directory cannot be replaced by a rename; move it aside first
+                previous_path = self.project_path / f"{self.files_path.name}.{time.time_ns()}.old"
+                self.files_path.rename(previous_path)
+            
+            os.replace(link_path, self.files_path)
+            
+            if previous_path is not None and previous_path != version_path.resolve():
+                shutil.rmtree(previous_path, ignore_errors=True)
+            
+            return {
+                'success': True,
+                'files_path': str(self.files_path),
+                'version_path': str(version_path)
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def create_zip_archive(self) -> Dict[str, Any]:
         """Create downloadable ZIP archive of the project."""
         try:
@@ -201,7 +261,8 @@ class ProjectStructureManager:
             'file_types': self._analyze_file_types(created_files),
             'total_size': sum(f['size'] for f in created_files),
             'creation_timestamp': self._get_timestamp(),
-            'template_metadata': parsed_files.get('metadata', {})
+            'template_metadata': parsed_files.get('metadata', {}),
+            'import_graph': parsed_files.get('import_graph', {})
         }
     
     def _build_file_tree(self, path: Path, relative_to: Optional[Path] = None) -> Dict[str, Any]:
@@ -293,6 +354,38 @@ class ProjectStructureManager:
                 'error': str(e)
             }
     
+    def get_import_graph(self) -> Dict[str, Any]:
+        """Get the module graph stored in the manifest, with the entry point's preload set."""
+        try:
+            manifest_path = self.project_path / "parsed_files.json"
+            
+            if not manifest_path.exists():
+                return {
+                    'success': False,
+                    'error': 'Project manifest not found'
+                }
+            
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                import_graph = json.load(f).get('import_graph', {})
+            
+            return {
+                'success': True,
+                'import_graph': import_graph,
+                'preload': preload_set(import_graph)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def get_preload_links(self) -> str:
+        """modulepreload links for the modules the entry point imports, for the preview page."""
+        result = self.get_import_graph()
+        if not result['success']:
+            return ''
+        return ''.join(f'<link rel="modulepreload" href="{path}">' for path in result['preload'])
+    
     def get_project_info(self) -> Dict[str, Any]:
         """Get general project information."""
         try:
@@ -320,7 +413,12 @@ class ProjectStructureManager:
             }
 
 
-def create_project_structure(project_id: str, parsed_files: Dict[str, Any], project_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def create_project_structure(
+    project_id: str,
+    parsed_files: Dict[str, Any],
+    project_metadata: Optional[Dict[str, Any]] = None,
+    staged: bool = False
+) -> Dict[str, Any]:
     """
     Convenience function to create complete project structure with template injection.
     
@@ -328,9 +426,11 @@ def create_project_structure(project_id: str, parsed_files: Dict[str, Any], proj
         project_id: Unique project identifier
         parsed_files: Parsed files from CrewAI output
         project_metadata: Project metadata for template variables (optional)
+        staged: Write the files to the staging directory and atomically swap
+            them in once complete, replacing a draft that is being previewed
     
     Returns:
-        Dictionary with creation results
+        Dictionary with creation results, including per-step 'timings' in seconds
     """
     # Inject templates before creating project structure
     if project_metadata is None:
@@ -340,18 +440,35 @@ def create_project_structure(project_id: str, parsed_files: Dict[str, Any], proj
             'description': 'AI-generated website project'
         }
     
+    timings: Dict[str, float] = {}
+    
     # Inject template files
-    enhanced_files = inject_templates(parsed_files, project_metadata)
+    with time_stage(timings, 'inject'):
+        enhanced_files = inject_templates(parsed_files, project_metadata)
+        # Templates add the entry point and styles, so the module graph is completed with them
+        if enhanced_files.get('metadata', {}).get('templates_injected'):
+            enhanced_files['import_graph'] = build_import_graph(enhanced_files['files'])
     
-    manager = ProjectStructureManager(project_id)
+    manager = ProjectStructureManager(project_id, files_dir=STAGING_FILES_DIR if staged else "files")
     
     # Create folder structure with enhanced files (including templates)
-    folder_result = manager.create_project_folder(enhanced_files)
+    with time_stage(timings, 'write'):
+        folder_result = manager.create_project_folder(enhanced_files)
     if not folder_result['success']:
+        folder_result['timings'] = timings
         return folder_result
     
     # Create ZIP archive
-    zip_result = manager.create_zip_archive()
+    with time_stage(timings, 'zip'):
+        zip_result = manager.create_zip_archive()
+    
+    if staged:
+        with time_stage(timings, 'swap'):
+            swap_result = ProjectStructureManager(project_id).swap_in_files(STAGING_FILES_DIR)
+        if not swap_result['success']:
+            folder_result.update({'success': False, 'error': swap_result['error'], 'timings': timings})
+            return folder_result
+        folder_result['files_path'] = swap_result['files_path']
     
     return {
         'success': folder_result['success'] and zip_result['success'],
@@ -362,7 +479,8 @@ def create_project_structure(project_id: str, parsed_files: Dict[str, Any], proj
         'total_files': folder_result['total_files'],
         'zip_created': zip_result['success'],
         'templates_injected': folder_result.get('templates_injected', 0),
-        'template_metadata': enhanced_files.get('metadata', {})
+        'template_metadata': enhanced_files.get('metadata', {}),
+        'timings': timings
     }
 
 
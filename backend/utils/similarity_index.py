@@ -0,0 +1,212 @@
+"""Near-duplicate detection for website requests using MinHash signatures."""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+NUM_PERMUTATIONS = 64
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Words that carry no meaning for matching requests
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'for', 'of', 'to', 'with', 'in', 'on', 'my', 'our', 'your',
+    'simple', 'create', 'build', 'make', 'need', 'want', 'please', 'that', 'this', 'is', 'be'
+}
+
+# Interchangeable wordings mapped onto one canonical token
+SYNONYMS = {
+    'site': 'website', 'webpage': 'website', 'web': 'website', 'homepage': 'website',
+    'photography': 'photographer', 'photo': 'photographer', 'photographers': 'photographer',
+    'shop': 'store', 'ecommerce': 'store', 'cafe': 'restaurant', 'bistro': 'restaurant',
+    'blog': 'blog', 'landing': 'landing', 'showcase': 'portfolio'
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Serializes read-modify-write cycles on the index file; lookups, additions and
+# project deletions can run at the same time in different threads
+_index_lock = threading.RLock()
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, drop stopwords, singularize and map synonyms."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith('ies'):
+            token = token[:-3] + 'y'
+        elif len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(SYNONYMS.get(token, token))
+    return tokens
+
+
+def request_shingles(description: str, requirements: List[str], style_preferences: Dict[str, Any]) -> Set[str]:
+    """Build the shingle set of a request.
+
+    Word order is ignored ("photographer portfolio website" matches
+    "portfolio site for a photographer"); tokens are prefixed with their
+    field so a color in the description does not match a style preference.
+    """
+    shingles = {f"desc:{token}" for token in normalize_tokens(description)}
+
+    for requirement in requirements or []:
+        shingles.update(f"req:{token}" for token in normalize_tokens(requirement))
+
+    for key, value in sorted((style_preferences or {}).items()):
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            for token in normalize_tokens(str(item)):
+                shingles.add(f"style:{key.lower()}={token}")
+
+    return shingles
+
+
+class MinHasher:
+    """Compute fixed-size MinHash signatures that estimate Jaccard similarity."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.coefficients = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_permutations)
+        ]
+
+    def signature(self, shingles: Set[str]) -> List[int]:
+        """Return the MinHash signature of a shingle set."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for shingle in shingles
+        ]
+        if not hashes:
+            return [MERSENNE_PRIME] * len(self.coefficients)
+
+        return [
+            min((a * value + b) % MERSENNE_PRIME for value in hashes)
+            for a, b in self.coefficients
+        ]
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+class RequestSimilarityIndex:
+    """Local index of past requests used to reuse product specifications.
+
+    Signatures are stored in data/similarity_index.json together with lookup
+    and hit counters. Lookups scan all entries, which is fine for the number
+    of projects a single instance keeps.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, data_dir: str = "data"):
+        if threshold is None:
+            threshold = float(os.getenv("SPEC_REUSE_THRESHOLD", "0.85"))
+        self.threshold = threshold
+        self.index_file = Path(data_dir) / "similarity_index.json"
+        self.hasher = MinHasher()
+
+    def find_similar(
+        self,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any],
+        exclude: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the most similar indexed project at or above the threshold."""
+        signature = self.hasher.signature(request_shingles(description, requirements, style_preferences))
+
+        with _index_lock:
+            index = self._load_index()
+            best_match = None
+            for project_id, entry in index["entries"].items():
+                if project_id == exclude:
+                    continue
+                similarity = MinHasher.similarity(signature, entry["signature"])
+                if similarity >= self.threshold and (best_match is None or similarity > best_match["similarity"]):
+                    best_match = {"project_id": project_id, "similarity": round(similarity, 3)}
+
+            index["stats"]["lookups"] += 1
+            if best_match:
+                index["stats"]["hits"] += 1
+            self._save_index(index)
+
+        return best_match
+
+    def add(
+        self,
+        project_id: str,
+        description: str,
+        requirements: List[str],
+        style_preferences: Dict[str, Any]
+    ) -> None:
+        """Index a project whose specification can be reused."""
+        signature = self.hasher.signature(request_shingles(description, requirements, style_preferences))
+
+        with _index_lock:
+            index = self._load_index()
+            index["entries"][project_id] = {
+                "signature": signature,
+                "description": description,
+                "indexed_at": datetime.now().isoformat()
+            }
+            self._save_index(index)
+
+    def remove(self, project_id: str) -> bool:
+        """Drop a project from the index."""
+        with _index_lock:
+            index = self._load_index()
+            if project_id not in index["entries"]:
+                return False
+
+            del index["entries"][project_id]
+            self._save_index(index)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup/hit counters and the configured threshold."""
+        with _index_lock:
+            index = self._load_index()
+        stats = index["stats"]
+
+        return {
+            "entries": len(index["entries"]),
+            "lookups": stats["lookups"],
+            "hits": stats["hits"],
+            "hit_rate": round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0,
+            "threshold": self.threshold
+        }
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the index from disk; call with _index_lock held."""
+        empty = {"entries": {}, "stats": {"lookups": 0, "hits": 0}}
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return empty
+        except json.JSONDecodeError:
+            # Keep the unreadable file for inspection instead of overwriting it on the next save
+            corrupt_file = self.index_file.with_name(self.index_file.name + ".corrupt")
+            os.replace(self.index_file, corrupt_file)
+            print(f"Similarity index {self.index_file} is unreadable; moved to {corrupt_file} and starting empty")
+            return empty
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        """Save the index to disk; call with _index_lock held."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers and other processes never see a partial file
+        temp_file = self.index_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(index, f)
+        os.replace(temp_file, self.index_file)
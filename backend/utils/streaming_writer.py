@@ -0,0 +1,58 @@
+"""Write generated files to disk while the software engineer output streams in."""
+
+from typing import Dict, Any, List, Optional
+
+from backend.utils.file_parser import IncrementalFileParser
+from backend.utils.project_structure import STAGING_FILES_DIR, ProjectStructureManager
+from backend.utils.structure_trie import StructureTrie
+
+
+class StreamingFileWriter:
+    """Write each file as soon as its code block closes and emit file_created events.
+    
+    Each event carries a ``tree_patch``: the JSON Patch operations that add
+    the file to the project structure, starting from an empty project, so
+    the file tree can be updated without fetching it again.
+    
+    With ``staged`` the files go to the staging directory, leaving a draft
+    that is being previewed untouched until the finished project is swapped in.
+    """
+    
+    def __init__(self, project_id: str, project_manager: Optional[Any] = None, staged: bool = False):
+        self.project_id = project_id
+        self.project_manager = project_manager
+        self.parser = IncrementalFileParser(project_id)
+        self.structure_manager = ProjectStructureManager(
+            project_id, files_dir=STAGING_FILES_DIR if staged else "files"
+        )
+        self.written_files: Dict[str, Dict[str, Any]] = {}
+        self.structure = StructureTrie(project_id)
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a streamed chunk and write any files it completed."""
+        return [self._write(parsed_file) for parsed_file in self.parser.feed(chunk)]
+    
+    def close(self) -> List[Dict[str, Any]]:
+        """Flush the stream and write any remaining completed files."""
+        return [self._write(parsed_file) for parsed_file in self.parser.close()]
+    
+    def _write(self, parsed_file: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a parsed file to the project's files directory."""
+        self.structure_manager.write_file(parsed_file['path'], parsed_file['content'])
+        
+        written = {
+            'path': parsed_file['path'],
+            'size': parsed_file['size'],
+            'is_valid': parsed_file['is_valid'],
+            'file_number': parsed_file['file_number']
+        }
+        self.written_files[parsed_file['path']] = written
+        tree_patch = self.structure.insert(parsed_file['path'], parsed_file)
+        
+        if self.project_manager is not None:
+            try:
+                self.project_manager.add_event(self.project_id, 'file_created', {**written, 'tree_patch': tree_patch})
+            except Exception as e:
+                print(f"Failed to emit file_created event for {parsed_file['path']}: {str(e)}")
+        
+        return written
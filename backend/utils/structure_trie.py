@@ -0,0 +1,154 @@
+"""Incrementally built project structure that reports its changes as JSON Patch.
+
+The project structure is a tree of folders and files whose children are
+kept sorted (folders first, then files, both case-insensitively), the same
+order the file tree endpoint uses. StructureTrie inserts one file at a time
+with one dictionary lookup and one binary search per path segment, so the
+cost depends on the file's depth, not the size of the project, and returns
+the RFC 6902 operations that turn the previous tree into the new one.
+Clients that hold the tree apply each file's patch in order instead of
+fetching the whole tree again while files stream in.
+"""
+
+import copy
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Set, Tuple
+
+
+def sort_key(name: str, is_file: bool) -> Tuple[bool, str]:
+    """Folders before files, then case-insensitive names."""
+    return is_file, name.lower()
+
+
+class _Folder:
+    """A folder's tree entry plus the lookups that keep insertion cheap."""
+
+    __slots__ = ('entry', 'folders', 'files', 'keys')
+
+    def __init__(self, entry: Dict[str, Any]):
+        # entry['children'] is the sorted child list that is served to clients
+        self.entry = entry
+        self.folders: Dict[str, '_Folder'] = {}
+        self.files: Set[str] = set()
+        # Sort keys of entry['children'], in the same order
+        self.keys: List[Tuple[bool, str]] = []
+
+    def index_of(self, name: str, is_file: bool) -> int:
+        """Position of an existing child."""
+        key = sort_key(name, is_file)
+        children = self.entry['children']
+        index = bisect_left(self.keys, key)
+        # Names that differ only in case share a key; find the exact one
+        while children[index]['name'] != name:
+            index += 1
+        return index
+
+    def insert(self, child: Dict[str, Any]) -> int:
+        """Insert a child in sorted position and return its index."""
+        is_file = child['type'] == 'file'
+        if is_file:
+            self.files.add(child['name'])
+        key = sort_key(child['name'], is_file)
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.entry['children'].insert(index, child)
+        return index
+
+
+class StructureTrie:
+    """Project structure built one file at a time; see the module docstring."""
+
+    def __init__(self, project_id: str):
+        self.root = _Folder({
+            'name': f'project-{project_id}',
+            'type': 'folder',
+            'path': '',
+            'children': []
+        })
+        self.file_count = 0
+
+    def insert(self, file_path: str, file_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Add or replace a file and return the JSON Patch operations for the change.
+
+        A file in a new folder is one ``add`` of the new folder, already
+        holding the file; a file that already exists is one ``replace``.
+        """
+        parts = file_path.split('/')
+        folder = self.root
+        pointer = ''
+
+        for depth, name in enumerate(parts[:-1]):
+            child = folder.folders.get(name)
+            if child is None:
+                # Build the rest of the path as one subtree and add it in one operation
+                subtree = self._build_subtree(parts[depth:], file_path, file_info)
+                index = folder.insert(subtree.entry)
+                folder.folders[name] = subtree
+                self.file_count += 1
+                return [self._operation('add', f"{pointer}/children/{index}", subtree.entry)]
+            pointer = f"{pointer}/children/{folder.index_of(name, False)}"
+            folder = child
+
+        entry = self._file_entry(parts[-1], file_path, file_info)
+        if parts[-1] in folder.files:
+            index = folder.index_of(parts[-1], True)
+            folder.entry['children'][index] = entry
+            return [self._operation('replace', f"{pointer}/children/{index}", entry)]
+
+        index = folder.insert(entry)
+        self.file_count += 1
+        return [self._operation('add', f"{pointer}/children/{index}", entry)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The whole structure, in the layout the patches apply to."""
+        return self.root.entry
+
+    def _operation(self, op: str, path: str, value: Dict[str, Any]) -> Dict[str, Any]:
+        # A copy, so clients applying the patch never share the trie's entries
+        return {'op': op, 'path': path, 'value': copy.deepcopy(value)}
+
+    def _build_subtree(self, parts: List[str], file_path: str, file_info: Dict[str, Any]) -> _Folder:
+        """Folders for ``parts[:-1]`` nested down to the file ``parts[-1]``."""
+        prefix = '/'.join(file_path.split('/')[:-len(parts)])
+        file_folder = None
+        top = None
+        for name in parts[:-1]:
+            prefix = f"{prefix}/{name}" if prefix else name
+            folder = _Folder({'name': name, 'type': 'folder', 'path': prefix, 'children': []})
+            if file_folder is None:
+                top = folder
+            else:
+                file_folder.insert(folder.entry)
+                file_folder.folders[name] = folder
+            file_folder = folder
+        file_folder.insert(self._file_entry(parts[-1], file_path, file_info))
+        return top
+
+    def _file_entry(self, name: str, file_path: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'name': name,
+            'type': 'file',
+            'path': file_path,
+            'extension': file_info['extension'],
+            'size': file_info['size'],
+            'is_valid': file_info['is_valid']
+        }
+
+
+def apply_patch(document: Dict[str, Any], operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply the add/replace operations StructureTrie emits to a client's copy of the tree."""
+    for operation in operations:
+        tokens = [token.replace('~1', '/').replace('~0', '~') for token in operation['path'].split('/')[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if operation['op'] == 'add':
+                parent.insert(index, operation['value'])
+            else:
+                parent[index] = operation['value']
+        else:
+            parent[last] = operation['value']
+    return document
@@ -0,0 +1,124 @@
+"""Per-task storage of the raw agent outputs of a generation.
+
+Each task's output (the product manager's specification, the designer's
+design and the engineer's code) is stored as its own file under
+``task_outputs/`` in the project directory, optionally gzip-compressed,
+with an ``index.json`` recording each file's SHA-256, size and compression.
+Consumers load only the output they need - the parser reads the code, spec
+reuse reads the specification - and can check the index hash against a
+cache without reading the output at all.
+
+Projects generated before this layout only have ``crew_output.txt`` and
+``specification.md``; ``load`` falls back to those.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+TASK_OUTPUTS_DIR = 'task_outputs'
+INDEX_FILE = 'index.json'
+
+SPECIFICATION_TASK = 'specification'
+DESIGN_TASK = 'design'
+CODE_TASK = 'code'
+TASKS = (SPECIFICATION_TASK, DESIGN_TASK, CODE_TASK)
+
+# Files earlier versions saved in the project directory
+LEGACY_FILES = {
+    SPECIFICATION_TASK: 'specification.md',
+    CODE_TASK: 'crew_output.txt',
+}
+
+# Stages of one generation save concurrently with speculative design
+_index_lock = threading.Lock()
+
+
+def output_hash(content: str) -> str:
+    """SHA-256 of a task output."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class TaskOutputStore:
+    """The task outputs of one project; see the module docstring."""
+
+    def __init__(
+        self,
+        project_id: str,
+        projects_dir: str = 'generated/projects',
+        compress: Optional[bool] = None
+    ):
+        self.project_dir = Path(projects_dir) / project_id
+        self.output_dir = self.project_dir / TASK_OUTPUTS_DIR
+        self.index_path = self.output_dir / INDEX_FILE
+        if compress is None:
+            compress = os.getenv('TASK_OUTPUT_COMPRESSION', 'none').lower() == 'gzip'
+        self.compress = compress
+
+    def save(self, task: str, content: str) -> Dict[str, Any]:
+        """Store a task's output, replacing any earlier one, and return its index entry."""
+        if task not in TASKS:
+            raise ValueError(f"Unknown task '{task}'")
+
+        data = content.encode('utf-8')
+        file_name = f"{task}.md.gz" if self.compress else f"{task}.md"
+        stored = gzip.compress(data, mtime=0) if self.compress else data
+        entry = {
+            'file': file_name,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'chars': len(content),
+            'bytes': len(stored),
+            'compression': 'gzip' if self.compress else None,
+            'saved_at': datetime.now().isoformat()
+        }
+
+        with _index_lock:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._write(self.output_dir / file_name, stored)
+
+            index = self.index()
+            previous = index.get(task)
+            if previous and previous['file'] != file_name:
+                # Saved before with the other compression setting
+                (self.output_dir / previous['file']).unlink(missing_ok=True)
+            index[task] = entry
+            self._write(self.index_path, json.dumps({'tasks': index}, indent=2).encode('utf-8'))
+
+        return entry
+
+    def load(self, task: str) -> Optional[str]:
+        """A task's output, or None if it was never saved."""
+        entry = self.entry(task)
+        if entry is not None:
+            path = self.output_dir / entry['file']
+            if path.exists():
+                data = path.read_bytes()
+                return (gzip.decompress(data) if entry['compression'] == 'gzip' else data).decode('utf-8')
+
+        legacy_path = self.project_dir / LEGACY_FILES[task] if task in LEGACY_FILES else None
+        if legacy_path is not None and legacy_path.exists():
+            return legacy_path.read_text(encoding='utf-8')
+        return None
+
+    def entry(self, task: str) -> Optional[Dict[str, Any]]:
+        """A task's index entry, without reading its output."""
+        return self.index().get(task)
+
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries by task."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['tasks']
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Written aside and renamed, so readers never see a partial file
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,303 @@
+"""Throughput and peak-memory benchmarks for backend/utils/file_parser.py.
+
+Runs every parser stage - extract_file_blocks, validation, parse,
+validate_all_files and create_project_structure - over a fixed corpus:
+
+- synthetic crew outputs from 10 KB to 50 MB, generated from a fixed seed
+- pathological outputs: unterminated fences, long digit runs, headers
+  without code blocks, deeply nested brackets, thousands of non-file
+  fenced blocks or stray fences around a file header, and megabytes of
+  prose, empty code blocks or heading paths
+- real outputs: saved code outputs of generated projects and the drifted-format corpus
+
+Results are written as JSON (to the git-ignored scripts/testing/benchmark_results/
+by default) together with the commit, PARSER_VERSION and machine they were
+taken on, so runs can be compared over time with --compare. Block
+extraction on the prose, empty block and heading cases is also timed
+against the single regex the parser used before the block scanner, and the
+run fails if it is more than SCAN_REGRESSION_LIMIT times slower.
+
+    python scripts/testing/benchmark_parser.py [--quick] [--compare OLD.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+sys.path.append('backend')
+
+from backend.utils.file_parser import PARSER_VERSION, ProjectFileParser
+from backend.utils.task_outputs import CODE_TASK, TaskOutputStore
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).parent / 'benchmark_results'
+FORMAT_CORPUS_DIR = Path(__file__).parent / 'file_block_corpus'
+
+SEED = 1729
+SYNTHETIC_SIZES = [10_000, 100_000, 1_000_000, 10_000_000, 50_000_000]
+QUICK_SIZES = [10_000, 100_000, 1_000_000]
+
+# Repeats per case, by output size; the best time is reported
+REPEATS = [(100_000, 7), (1_000_000, 5), (10_000_000, 3)]
+
+# The parser's regex before the block scanner, the yardstick for scanning speed
+BASELINE_PATTERN = re.compile(r'(\d+)\.\s+([^\n]+)\n\n```(\w+)\n(.*?)\n```', re.DOTALL)
+SCAN_REGRESSION_CASES = ('prose_without_blocks', 'empty_fenced_blocks', 'heading_paths_without_fences')
+SCAN_REGRESSION_LIMIT = 4.0
+
+SECTIONS = ['Hero', 'About', 'Services', 'Gallery', 'Pricing', 'Testimonials', 'Team', 'Contact', 'Faq', 'Footer']
+WORDS = 'modern clean bold elegant fast reliable crafted local friendly trusted creative studio'.split()
+
+
+def synthetic_component(rng: random.Random, name: str) -> str:
+    """A React component of a realistic, varying size."""
+    items = "\n".join(
+        f"        <li key=\"{index}\" className=\"p-4 rounded-lg bg-white shadow\">{' '.join(rng.choices(WORDS, k=6))}</li>"
+        for index in range(rng.randint(5, 60))
+    )
+    return f"""import React, {{ useState }} from 'react';
+import {{ siteContent }} from '../content';
+
+interface {name}Props {{
+  title?: string;
+}}
+
+const {name}: React.FC<{name}Props> = ({{ title = siteContent.name }}) => {{
+  const [open, setOpen] = useState<boolean>(false);
+  return (
+    <section id="{name.lower()}" className="py-20 px-6 bg-gray-50">
+      <h2 className="text-3xl font-bold" onClick={{() => setOpen(!open)}}>{{title}}</h2>
+      <ul className={{`grid gap-4 ${{open ? 'grid-cols-3' : 'grid-cols-1'}}`}}>
+{items}
+      </ul>
+    </section>
+  );
+}};
+
+export default {name};"""
+
+
+def synthetic_output(size: int) -> str:
+    """A crew output of about ``size`` characters with numbered file blocks."""
+    rng = random.Random(SEED + size)
+    blocks = [
+        "Thought: I now know the final answer\nFinal Answer: Here is the complete project.\n",
+        '1. package.json\n\n```json\n{"name": "site", "dependencies": {"react": "^18.2.0"}}\n```\n',
+        '2. README.md\n\n```markdown\n# Site\n\nRun `npm install` and `npm run dev`.\n```\n',
+    ]
+    length = sum(len(block) for block in blocks)
+    number = 3
+    while length < size:
+        name = f"{rng.choice(SECTIONS)}{number}"
+        block = f"{number}. src/components/{name}.tsx\n\n```tsx\n{synthetic_component(rng, name)}\n```\n"
+        blocks.append(block)
+        length += len(block) + 1
+        number += 1
+    blocks.insert(3, f"{number}. src/App.tsx\n\n```tsx\n{synthetic_component(rng, 'App')}\n```\n")
+    return "\n".join(blocks)
+
+
+def pathological_outputs(quick: bool) -> dict:
+    """Outputs that are slow for backtracking patterns or deep nesting."""
+    lines = 25_000 if quick else 250_000
+    scan_lines = 40_000 if quick else 400_000
+    rng = random.Random(SEED)
+    header = "1. src/App.tsx\n\n```tsx\nexport const x = 1;\n```\n"
+    command_blocks = "Then run:\n\n```bash\nnpm install\n```\n\n" * (lines // 5)
+    stray_fences = "```\n" * lines
+    return {
+        'unterminated_fence': "1. src/App.tsx\n\n```tsx\n" + "const x = 1;\n" * lines,
+        'digit_run': "1" * (lines * 4) + ". \n",
+        'headers_without_fences': "".join(f"{n}. src/components/Part{n}.tsx\n" for n in range(lines // 5)),
+        'nested_brackets': "1. src/App.tsx\n\n```tsx\nexport const x = " + "(" * (lines // 5) + "1" + ")" * (lines // 5) + ";\n```\n",
+        # Fences that are not files, before and after the only file header
+        'non_file_fenced_blocks': command_blocks + header + command_blocks,
+        'stray_fences': stray_fences + header + stray_fences,
+        # Each line is costly for a line-by-line scanner
+        'prose_without_blocks': "".join(' '.join(rng.choices(WORDS, k=10)) + ".\n" for _ in range(scan_lines // 5)),
+        'empty_fenced_blocks': "```tsx\n```\n" * scan_lines,
+        'heading_paths_without_fences': "### src/App.tsx\n" * scan_lines,
+    }
+
+
+def real_outputs() -> dict:
+    """Saved crew outputs and the drifted-format corpus."""
+    outputs = {}
+    projects_dir = PROJECT_ROOT / 'generated' / 'projects'
+    for project_dir in sorted(path for path in projects_dir.glob('*') if path.is_dir()):
+        crew_output = TaskOutputStore(project_dir.name, str(projects_dir)).load(CODE_TASK)
+        if crew_output is not None:
+            outputs[f"crew_output_{project_dir.name[:8]}"] = crew_output
+    for path in sorted(FORMAT_CORPUS_DIR.glob('*.md')):
+        outputs[f"format_{path.stem}"] = path.read_text(encoding='utf-8')
+    return outputs
+
+
+def repeats_for(size: int) -> int:
+    return next((repeats for limit, repeats in REPEATS if size <= limit), 1)
+
+
+def parsed(text: str) -> ProjectFileParser:
+    parser = ProjectFileParser(text, 'benchmark')
+    parser.parse()
+    return parser
+
+
+# Each stage: (setup run outside the measurement, the measured call)
+STAGES = {
+    'extract_file_blocks': (lambda text: ProjectFileParser(text, 'benchmark'), lambda parser: parser.extract_file_blocks()),
+    'validate_blocks': (
+        lambda text: (ProjectFileParser(text, 'benchmark'), ProjectFileParser(text, 'benchmark').extract_file_blocks()),
+        lambda state: state[0].validate_blocks(state[1])
+    ),
+    'parse': (lambda text: ProjectFileParser(text, 'benchmark'), lambda parser: parser.parse()),
+    'validate_all_files': (parsed, lambda parser: parser.validate_all_files()),
+    'create_project_structure': (parsed, lambda parser: parser.create_project_structure()),
+}
+
+
+def measure_stage(text: str, setup, stage, repeats: int) -> dict:
+    """Best wall time over ``repeats`` runs, then tracemalloc peak in one more run."""
+    times = []
+    for _ in range(repeats):
+        state = setup(text)
+        gc.collect()
+        start = time.perf_counter()
+        stage(state)
+        times.append(time.perf_counter() - start)
+
+    state = setup(text)
+    gc.collect()
+    tracemalloc.start()
+    stage(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = min(times)
+    return {
+        'seconds': round(seconds, 6),
+        'mb_per_second': round(len(text) / 1e6 / seconds, 2) if seconds > 0 else None,
+        'peak_memory_mb': round(peak / 1e6, 3)
+    }
+
+
+def measure_baseline(text: str, repeats: int) -> float:
+    """Best wall time of the baseline regex over ``repeats`` runs."""
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        BASELINE_PATTERN.findall(text)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def git_commit() -> str:
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or 'unknown'
+
+
+def run_benchmarks(quick: bool = False) -> dict:
+    """Benchmark every stage on the corpus and return the report."""
+    corpus = [('synthetic', f"synthetic_{size // 1000}kb", synthetic_output(size)) for size in (QUICK_SIZES if quick else SYNTHETIC_SIZES)]
+    corpus += [('pathological', name, text) for name, text in pathological_outputs(quick).items()]
+    corpus += [('real', name, text) for name, text in real_outputs().items()]
+
+    cases = []
+    for kind, name, text in corpus:
+        print(f"📄 {name} ({len(text) / 1e6:.2f} MB)")
+        stages = {}
+        for stage_name, (setup, stage) in STAGES.items():
+            stages[stage_name] = measure_stage(text, setup, stage, repeats_for(len(text)))
+            result = stages[stage_name]
+            print(f"   {stage_name:<26} {result['seconds'] * 1000:>10.1f} ms {result['mb_per_second'] or 0:>9.1f} MB/s {result['peak_memory_mb']:>9.1f} MB peak")
+        case = {
+            'name': name,
+            'kind': kind,
+            'bytes': len(text),
+            'files': len(ProjectFileParser(text, 'benchmark').extract_file_blocks()),
+            'stages': stages
+        }
+        if name in SCAN_REGRESSION_CASES:
+            baseline = measure_baseline(text, repeats_for(len(text)))
+            case['baseline_regex_seconds'] = round(baseline, 6)
+            case['scan_ratio'] = round(stages['extract_file_blocks']['seconds'] / baseline, 2) if baseline > 0 else None
+            print(f"   {'baseline regex':<26} {baseline * 1000:>10.1f} ms {case['scan_ratio']:>9.2f}x")
+        cases.append(case)
+
+    return {
+        'benchmark': 'file_parser',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'parser_version': PARSER_VERSION,
+        'quick': quick,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'validation_workers': os.getenv('VALIDATION_WORKERS', '0'),
+            'parallel_validation_min_bytes': os.getenv('PARALLEL_VALIDATION_MIN_BYTES', '1000000')
+        },
+        'cases': cases
+    }
+
+
+def scan_regressions(report: dict) -> list:
+    """Cases whose block extraction is too slow compared with the baseline regex."""
+    return [
+        case for case in report['cases']
+        if case.get('scan_ratio') is not None and case['scan_ratio'] > SCAN_REGRESSION_LIMIT
+    ]
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print each stage's time and peak memory relative to an earlier report."""
+    previous = {case['name']: case['stages'] for case in baseline['cases']}
+    print(f"\n📊 Compared with {baseline['git_commit']} ({baseline['timestamp']}); below 1.00x is better")
+    for case in report['cases']:
+        if case['name'] not in previous:
+            continue
+        for stage_name, result in case['stages'].items():
+            old = previous[case['name']].get(stage_name)
+            if not old or not old['seconds'] or not old['peak_memory_mb']:
+                continue
+            print(
+                f"   {case['name']:<28} {stage_name:<26} time {result['seconds'] / old['seconds']:>6.2f}x"
+                f"   memory {result['peak_memory_mb'] / old['peak_memory_mb']:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    arguments.add_argument('--quick', action='store_true', help='outputs up to 1 MB only')
+    arguments.add_argument('--output', type=Path, help='where to write the JSON report')
+    arguments.add_argument('--compare', type=Path, help='an earlier JSON report to compare with')
+    options = arguments.parse_args()
+
+    print("⏱️  Benchmarking File Parser")
+    print("=" * 50)
+
+    report = run_benchmarks(options.quick)
+    output = options.output or RESULTS_DIR / f"parser_{report['timestamp'].replace(':', '')}_{report['git_commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if options.compare:
+        compare(report, json.loads(options.compare.read_text(encoding='utf-8')))
+
+    print(f"\n💾 Results saved to {output}")
+
+    regressions = scan_regressions(report)
+    for case in regressions:
+        print(f"❌ {case['name']}: extract_file_blocks {case['scan_ratio']:.2f}x the baseline regex (limit {SCAN_REGRESSION_LIMIT:.0f}x)")
+    if regressions:
+        sys.exit(1)
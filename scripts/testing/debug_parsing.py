@@ -3,7 +3,7 @@
 import sys
 sys.path.append('backend')
 
-from backend.utils.file_parser import ProjectFileParser
+from backend.utils.file_parser import PARSER_VERSION, load_parsed_project
 from backend.utils.project_structure import create_project_structure
 
 def debug_parsing():
@@ -14,15 +14,10 @@ def debug_parsing():
     
     # Read the crew output
     try:
-        with open(f'generated/projects/{project_id}/crew_output.txt', 'r') as f:
-            crew_output = f.read()
-        
-        print(f"✅ Crew output loaded: {len(crew_output)} characters")
-        
-        # Parse files
-        parser = ProjectFileParser(crew_output, project_id)
-        parsed_result = parser.parse()
+        # Parse files, reusing the cached result unless the output or parser changed
+        parsed_result = load_parsed_project(project_id)
         
+        print(f"✅ Crew output parsed ({'cached' if parsed_result['from_cache'] else f'parser version {PARSER_VERSION}'})")
         print(f"Parse success: {parsed_result['success']}")
         
         if parsed_result['success']:
@@ -0,0 +1,101 @@
+"""Test script for serving requests while a generation runs in the background."""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+sys.path.append('backend')
+os.environ.setdefault('LLM_PROVIDER', 'stub')
+os.environ.setdefault('STUB_LLM_LATENCY', '1.5')
+
+import uvicorn
+
+from backend.main import app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(url: str, data: dict = None) -> tuple:
+    """Response JSON and the seconds it took."""
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=30) as response:
+        result = json.loads(response.read().decode('utf-8'))
+    return result, time.perf_counter() - start
+
+
+def test_background_generation():
+    """Events and the draft files are served while the stub model's stages run."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        try:
+            while not server.started:
+                time.sleep(0.05)
+
+            api = f"http://127.0.0.1:{port}/api/v1"
+            started, _ = request(f"{api}/generate", {
+                'description': "A bakery website for Crumb & Co. Show our breads and opening hours.",
+                'requirements': ["Menu section"],
+                'style_preferences': {},
+                'draft': True
+            })
+            project_id = started['project_id']
+
+            # Poll while the crew's stages are still running
+            event_times = []
+            draft_times = []
+            draft_files = []
+            status = 'created'
+            while status in ('created', 'in_progress'):
+                _, elapsed = request(f"{api}/projects/{project_id}/events?since=0")
+                event_times.append(elapsed)
+                draft_file, elapsed = request(f"{api}/projects/{project_id}/files/src/content.ts")
+                draft_times.append(elapsed)
+                draft_files.append(draft_file)
+                status = request(f"{api}/projects/{project_id}/status")[0]['status']
+                time.sleep(0.1)
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+            os.chdir(original_dir)
+
+    print(f"📡 {len(event_times)} event polls during generation, slowest {max(event_times):.2f}s")
+    print(f"📄 {len(draft_times)} draft file fetches during generation, slowest {max(draft_times):.2f}s")
+
+    checks = [
+        (len(event_times) >= 5, "Events polled repeatedly while generation runs"),
+        (max(event_times) < 1.0, "Event polls answered without waiting for a stage"),
+        (max(draft_times) < 1.0, "Draft file served without waiting for a stage"),
+        ('Crumb & Co' in draft_files[0]['content'], "Draft file is browsable while the refined files generate"),
+        (status == 'completed', "Generation completes"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Background Generation")
+    print("=" * 50)
+
+    if test_background_generation():
+        print("\n🎉 Background generation test completed successfully!")
+    else:
+        print("\n⚠️  Background generation test completed with issues.")
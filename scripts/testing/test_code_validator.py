@@ -0,0 +1,107 @@
+"""Test script for the lexer-based TypeScript/JavaScript validator."""
+
+import sys
+import time
+sys.path.append('backend')
+
+from backend.utils.code_validator import lex_script, validate_scripts
+from backend.utils.file_parser import ProjectFileParser
+
+# Braces and brackets inside strings, templates, comments, regexes and JSX text
+VALID_COMPONENT = """import React, { useState } from 'react';
+
+// A stray { in a comment
+/* and ) in a block comment */
+const PATTERN = /[{(]+\\/}/g;
+
+interface Props { items: Array<string>; onSelect?: (item: string) => void }
+
+const pick = <T,>(values: T[]): T => values[0];
+
+export default function Menu({ items, onSelect }: Props) {
+  const [open, setOpen] = useState<boolean>(false);
+  const label = `Menu ${items.length > 1 ? `(${items.length})` : '{single}'}`;
+  return (
+    <nav className="flex gap-4" aria-label="Main">
+      <button onClick={() => setOpen(!open)}>Don't click {'{'} here :)</button>
+      {open && items.map((item) => (
+        <a key={item} href={`#${item}`} onClick={() => onSelect?.(item)}>{item}</a>
+      ))}
+      <>
+        <img src="/logo.svg" alt="{" />
+      </>
+      {/* closing } in a JSX comment */}
+    </nav>
+  );
+}
+"""
+
+MISMATCHED_TAG = """export default function Hero() {
+  return (
+    <section>
+      <h1>Title</h2>
+    </section>
+  );
+}
+"""
+
+UNCLOSED_BRACE = """export function total(values: number[]) {
+  return values.reduce((sum, value) => {
+    return sum + value;
+  , 0);
+}
+"""
+
+
+def test_code_validator():
+    """Balanced files pass; the first imbalance is reported with its exact offset."""
+    valid = lex_script(VALID_COMPONENT, '.tsx')
+    mismatched = lex_script(MISMATCHED_TAG, '.tsx')
+    unclosed = lex_script(UNCLOSED_BRACE, '.ts')
+
+    # The old count-based check rejected the valid component and accepted the others
+    counted = VALID_COMPONENT.count('{') == VALID_COMPONENT.count('}')
+
+    # Many files validated across processes agree with validating them one by one
+    files = [(VALID_COMPONENT, '.tsx'), (MISMATCHED_TAG, '.tsx'), (UNCLOSED_BRACE, '.ts')] * 400
+    start = time.perf_counter()
+    sequential = validate_scripts(files, workers=1)
+    sequential_time = time.perf_counter() - start
+    validate_scripts(files[:8], workers=4, min_parallel_bytes=0)  # start the pool
+    start = time.perf_counter()
+    parallel = validate_scripts(files, workers=4, min_parallel_bytes=0)
+    parallel_time = time.perf_counter() - start
+    print(f"⚡ {len(files)} files validated in {sequential_time * 1000:.0f} ms sequentially, {parallel_time * 1000:.0f} ms in 4 processes")
+
+    output = f"1. src/components/Hero.tsx\n\n```tsx\n{MISMATCHED_TAG}\n```\n\n2. src/components/Menu.tsx\n\n```tsx\n{VALID_COMPONENT}\n```"
+    result = ProjectFileParser(output, 'validator-test').parse()
+    print(f"📄 Parsing errors: {result['parsing_errors']}")
+
+    checks = [
+        (valid is None, "Braces in strings, templates, comments, regexes and JSX text are ignored"),
+        (not counted, "Count-based brace check would have rejected the valid component"),
+        (mismatched is not None and mismatched['offset'] == MISMATCHED_TAG.index('</h2>'), "Mismatched closing tag reported at its offset"),
+        (mismatched is not None and mismatched['line'] == 4 and '</h1>' in mismatched['message'], "Message names the line and the expected tag"),
+        (unclosed is not None and unclosed['offset'] == UNCLOSED_BRACE.index(', 0)') + 3, "Mismatched bracket reported at its offset"),
+        (lex_script("const a = 1 < 2 && b > 3;", '.tsx') is None, "Comparisons are not JSX"),
+        (lex_script("const App = () => <div>", '.tsx') is not None, "Unclosed JSX element reported"),
+        (lex_script("# Title\n\nSome text", '.js') is not None, "Prose without code keywords rejected"),
+        (parallel == sequential, "Parallel validation matches sequential validation"),
+        (not result['files']['src/components/Hero.tsx']['is_valid'] and result['files']['src/components/Menu.tsx']['is_valid'], "Parser uses the lexer"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Code Validator")
+    print("=" * 50)
+
+    if test_code_validator():
+        print("\n🎉 Code validator test completed successfully!")
+    else:
+        print("\n⚠️  Code validator test completed with issues.")
@@ -0,0 +1,96 @@
+"""Test script for filling the vetted component library from site.json output."""
+
+import json
+import sys
+sys.path.append('backend')
+
+from backend.utils.component_library import LIBRARY_COMPONENTS, normalize_site_config
+from backend.utils.file_parser import IncrementalFileParser, ProjectFileParser
+
+SITE_CONFIG = {
+    "siteName": "Lens & Light",
+    "theme": {"primary": "#1E3A8A", "secondary": "#38BDF8", "background": "#FFFFFF", "text": "dark grey", "font": "Inter"},
+    "navbar": {"links": [{"label": "Gallery", "href": "#gallery"}, {"label": "Contact", "href": "#contact"}, {"label": "Broken"}]},
+    "hero": {"headline": "Stories told in light", "subheadline": "Portraits (and weddings) across Lisbon {since 2012"},
+    "about": {"title": "About Ana", "body": "First paragraph.\nSecond paragraph.", "highlights": ["12 years", "400+ weddings"]},
+    "contact": {"email": "ana@example.com"},
+    "sections": ["Navbar", "Hero", "Gallery", "About", "Testimonials", "Contact", "Footer"]
+}
+
+GALLERY = """import React from 'react';
+
+const Gallery: React.FC = () => {
+  return <section id="gallery">Gallery</section>;
+};
+
+export default Gallery;"""
+
+CREW_OUTPUT = f"""Final Answer:
+
+1. site.json
+
+```json
+{json.dumps(SITE_CONFIG, indent=2)}
+```
+
+2. src/components/Gallery.tsx
+
+```tsx
+{GALLERY}
+```
+"""
+
+
+def test_component_library():
+    """site.json expands into validated library files plus the custom sections."""
+    result = ProjectFileParser(CREW_OUTPUT, 'library-test').parse()
+    files = result['files']
+    app = files.get('src/App.tsx', {}).get('content', '')
+    content = files.get('src/content.ts', {}).get('content', '')
+
+    print(f"📁 Files: {sorted(files)}")
+    print(f"⚠️  Warnings: {result['warnings']}")
+
+    # Streaming writes the library files as soon as site.json closes
+    streaming = IncrementalFileParser('library-test')
+    streamed = []
+    for start in range(0, len(CREW_OUTPUT), 40):
+        streamed.extend(parsed['path'] for parsed in streaming.feed(CREW_OUTPUT[start:start + 40]))
+    streamed.extend(parsed['path'] for parsed in streaming.close())
+
+    normalized, _ = normalize_site_config(SITE_CONFIG)
+    invalid = ProjectFileParser("1. site.json\n\n```json\n{\"siteName\": \n```", 'library-test').parse()
+
+    checks = [
+        (result['success'], "Parse succeeds without boilerplate from the LLM"),
+        (all(f"src/components/{name}.tsx" in files for name in LIBRARY_COMPONENTS), "Library components rendered"),
+        (all(files[path]['is_valid'] for path in files), "Every rendered file validates"),
+        ('site.json' not in files, "site.json replaced by the files it fills"),
+        ("import Gallery from './components/Gallery';" in app and '<Gallery />' in app, "Custom section wired into App.tsx"),
+        (app.index('<Gallery />') < app.index('<About />'), "Sections keep the requested order"),
+        ('Testimonials' not in app and any('Testimonials' in warning for warning in result['warnings']), "Missing custom section dropped with a warning"),
+        (normalized['theme']['text'] == '#111827', "Invalid colour falls back to the default palette"),
+        (normalized['navbar']['links'] == SITE_CONFIG['navbar']['links'][:2], "Incomplete links are dropped"),
+        ('Lens & Light' in content and '\\u0028and weddings\\u0029' in content, "Copy lands in content.ts with brackets escaped"),
+        ('"name": "lens-light"' in files['package.json']['content'], "package.json named after the site"),
+        (files['src/content.ts']['language'] == 'ts' and files['src/App.tsx']['language'] == 'tsx', "Rendered files labelled by their extension"),
+        ('src/components/Hero.tsx' in streamed and streamed.index('src/components/Hero.tsx') < streamed.index('src/components/Gallery.tsx'),
+         "Streaming writes library files when site.json closes"),
+        (not invalid['success'] and 'site.json' in invalid['files'], "Invalid site.json reported by validation"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Component Library")
+    print("=" * 50)
+
+    if test_component_library():
+        print("\n🎉 Component library test completed successfully!")
+    else:
+        print("\n⚠️  Component library test completed with issues.")
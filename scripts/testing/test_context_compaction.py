@@ -0,0 +1,95 @@
+"""Test script for context compaction between crew stages."""
+
+import sys
+sys.path.append('backend')
+
+from backend.utils.context_compactor import compact_context
+
+SPECIFICATION = """
+# Project Specification: Photography Portfolio
+
+## 1. Project Overview and Goals
+The goal of this project is to create a stunning, modern portfolio website for a
+professional photographer that converts visitors into clients.
+- Showcase the photographer's best work
+- Generate booking inquiries
+
+## 2. Target Audience Analysis
+- Couples planning weddings
+- Small businesses needing product photography
+
+## 3. Feature Requirements
+1. Responsive image gallery with lightbox
+2. Contact form with validation
+
+## 4. Content Structure and Sitemap
+- Hero with headline "Capturing Moments That Last Forever"
+- About
+- Gallery
+- Contact
+"""
+
+PROSE_SPECIFICATION = """
+# Luna Photography - Product Specification
+
+## 1. Overview
+Luna is a portfolio website for a wedding photographer based in Lisbon. It should
+feel calm and editorial, letting the photographs carry the page. Couples browse the
+galleries on their phones, so every page has to load quickly.
+
+## 2. Pages
+- Home
+- Weddings
+- Contact
+"""
+
+DESIGN = """
+1. **Design System**:
+   - Primary color: Deep Blue #1E3A8A
+   - Accent: Sky Blue (#38BDF8)
+   - Typography: Inter for body, Playfair Display for headings
+
+2. **Layout Structure**:
+   - Header: fixed navbar with logo left, links right
+   - Hero: full-screen image with CTA button "View My Work"
+
+3. **Component Specifications**:
+   - Buttons: rounded-lg px-6 py-3 bg-blue-900 text-white
+"""
+
+
+def test_context_compaction():
+    """Compaction keeps palette, sections and copy while reducing tokens."""
+    result = compact_context(SPECIFICATION * 5, DESIGN * 5, 200, 200)
+    prose = compact_context(PROSE_SPECIFICATION + SPECIFICATION * 5, DESIGN, 200, 200)
+    
+    print(f"📉 Tokens: {result['tokens_before']} -> {result['tokens_after']} ({result['reduction']:.0%} less)")
+    print(f"\n📄 Specification summary:\n{result['specification']}")
+    print(f"\n🎨 Design summary:\n{result['design']}")
+    print(f"\n📄 Prose specification summary:\n{prose['specification']}")
+    
+    checks = [
+        ('#1E3A8A' in result['design'], "Primary color kept"),
+        ('#38BDF8' in result['design'], "Accent color kept"),
+        ('Capturing Moments That Last Forever' in result['specification'], "Hero copy kept"),
+        ('Gallery' in result['specification'], "Site sections kept"),
+        (result['tokens_after'] < result['tokens_before'], "Token count reduced"),
+        ('Luna is a portfolio website for a wedding photographer' in prose['specification'], "Business name from a prose overview kept"),
+        ('load quickly' not in prose['specification'], "Only the lead sentence of the prose kept"),
+    ]
+    
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+    
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Context Compaction")
+    print("=" * 50)
+    
+    if test_context_compaction():
+        print("\n🎉 Context compaction test completed successfully!")
+    else:
+        print("\n⚠️  Context compaction test completed with issues.")
@@ -0,0 +1,140 @@
+"""Test script for reusing design systems across matching style preferences."""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append('backend')
+os.environ.setdefault('LLM_PROVIDER', 'stub')
+
+from backend.crew.website_crew import WebsiteCrew
+from backend.llm.agent_llm import message_text
+from backend.llm.stub import StubChatModel
+from backend.utils.context_compactor import ContextCompactor
+from backend.utils.design_cache import DesignSystemCache, website_category
+
+STYLE = {"theme": "Modern", "colors": ["blue", "white"]}
+REORDERED_STYLE = {"colors": ["White ", "blue"], "theme": "modern"}
+
+DESIGN = """Thought: I now know the final answer
+Final Answer:
+## Color Scheme
+- Primary: #1E3A8A
+- Accent: #F59E0B
+
+## Typography
+- Headings: Playfair Display, bold
+- Body: Inter, 16px
+
+## Layout Structure
+- Full-width hero with a centered headline
+
+## Tailwind CSS Classes
+- Buttons: bg-blue-900 text-white rounded-lg px-6 py-3
+"""
+
+
+def test_design_cache():
+    """A second request with the same style reuses the design system and shortens the designer call."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # The crew's project manager keeps its records under the working directory
+        os.chdir(temp_dir)
+        try:
+            cache = DesignSystemCache(max_entries=2, data_dir=os.path.join(temp_dir, 'data'))
+            category = website_category("Portfolio website for a photographer", ["Image gallery"])
+            design_system = ContextCompactor().extract_design_system(DESIGN)
+            print(f"🎨 Extracted design system ({category}):\n{design_system}\n")
+
+            cache.put(STYLE, category, design_system, 'first-project')
+            reordered = cache.get(REORDERED_STYLE, category)
+            other_category = cache.get(STYLE, website_category("Online store for candles", ["Shopping cart"]))
+
+            # Least recently used entries go first once the cache is full
+            cache.put({"theme": "rustic"}, category, design_system)
+            cache.get(STYLE, category)
+            cache.put({"theme": "playful"}, category, design_system)
+            evicted = cache.get({"theme": "rustic"}, category)
+            evictions = cache.get_stats()['evictions']
+            expired = DesignSystemCache(ttl_days=0, data_dir=os.path.join(temp_dir, 'data')).get(STYLE, category)
+
+            # Lookups from parallel designer threads keep every entry and counter
+            shared = DesignSystemCache(data_dir=os.path.join(temp_dir, 'shared'))
+
+            def designer_thread(worker):
+                for n in range(20):
+                    shared.put({"theme": f"theme-{worker}-{n}"}, category, design_system)
+                    shared.get({"theme": f"theme-{worker}-{n}"}, category)
+
+            threads = [threading.Thread(target=designer_thread, args=(worker,)) for worker in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            concurrent = shared.get_stats()
+
+            # An unreadable file is kept aside rather than silently overwritten
+            cache_file = Path(temp_dir) / 'shared' / 'design_cache.json'
+            cache_file.write_text('{"entries": {')
+            recovered = shared.get_stats()
+            corrupt_file = cache_file.with_name('design_cache.json.corrupt')
+            corrupt_kept = corrupt_file.exists() and corrupt_file.read_text() == '{"entries": {'
+            leftover_temp_files = list(cache_file.parent.glob('*.tmp'))
+
+            # Through the crew: the first request designs and caches, the second reuses
+            crew = WebsiteCrew()
+            crew.design_cache = DesignSystemCache(data_dir=os.path.join(temp_dir, 'crew-data'))
+            prompts = []
+
+            def designer(messages):
+                prompts.append(message_text(messages[-1]))
+                return DESIGN
+
+            crew.ui_designer.llm.chat_model = StubChatModel(response=designer)
+            first_id = crew.project_manager.create_project("Photographer portfolio", [], STYLE)
+            second_id = crew.project_manager.create_project("Photography portfolio site", [], REORDERED_STYLE)
+            crew._design(first_id, "Specification", "Photographer portfolio", ["Gallery"], STYLE)
+            reused = crew._design(second_id, "Specification", "Photography portfolio site", ["Gallery"], REORDERED_STYLE)
+            first_stage = crew.project_manager.get_project_status(first_id)['metrics']['stages']['design']
+            second_stage = crew.project_manager.get_project_status(second_id)['metrics']['stages']['design']
+            print(f"📊 Stats: {crew.design_cache.get_stats()}")
+
+            crew.design_cache_skip_designer = True
+            third_id = crew.project_manager.create_project("Portfolio for my photos", [], STYLE)
+            skipped = crew._design(third_id, "Specification", "Portfolio for my photos", [], STYLE)
+            third_stage = crew.project_manager.get_project_status(third_id)['metrics']['stages']['design']
+        finally:
+            os.chdir(original_dir)
+
+    checks = [
+        (category == 'portfolio', "Request classified as a portfolio"),
+        ('#1E3A8A' in design_system and 'Playfair' in design_system and 'bg-blue-900' in design_system, "Palette, typography and Tailwind classes extracted"),
+        ('hero' not in design_system, "Layout left out of the design system"),
+        (reordered is not None and reordered['source_project'] == 'first-project', "Reordered, re-cased preferences hit"),
+        (other_category is None, "Other website category misses"),
+        (evicted is None and evictions >= 1, "Least recently used entry evicted"),
+        (expired is None, "Expired entry evicted"),
+        (concurrent['entries'] == 80 and concurrent['hits'] == 80, "Concurrent lookups keep every entry and counter"),
+        (recovered['entries'] == 0 and corrupt_kept and not leftover_temp_files, "Unreadable cache moved aside"),
+        (first_stage['design_cache'] == 'miss' and second_stage['design_cache'] == 'hit', "Design stage records cache misses and hits"),
+        ('DESIGN SYSTEM' in prompts[1] and 'Color scheme' not in prompts[1], "Hit gives the designer a shortened task"),
+        ('#1E3A8A' in reused and '## Typography' in reused, "Reused design keeps the cached system"),
+        (third_stage['llm_calls'] == 0 and len(prompts) == 2 and '#1E3A8A' in skipped, "Designer skipped when configured"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Design System Cache")
+    print("=" * 50)
+
+    if test_design_cache():
+        print("\n🎉 Design cache test completed successfully!")
+    else:
+        print("\n⚠️  Design cache test completed with issues.")
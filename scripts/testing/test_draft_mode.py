@@ -0,0 +1,97 @@
+"""Test script for instant draft projects and the atomic swap to refined files."""
+
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+sys.path.append('backend')
+
+from backend.utils.draft_project import create_draft_project
+from backend.utils.file_parser import ProjectFileParser
+from backend.utils.project_preview import ProjectPreviewManager
+from backend.utils.project_structure import STAGING_FILES_DIR, create_project_structure
+from backend.utils.streaming_writer import StreamingFileWriter
+
+PROJECT_ID = 'draft-test'
+
+REFINED_OUTPUT = """1. site.json
+
+```json
+{"siteName": "Crumb & Co", "hero": {"headline": "Sourdough baked at dawn"}}
+```
+"""
+
+
+def fetch(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=2) as response:
+        return response.read().decode('utf-8')
+
+
+def test_draft_mode():
+    """A draft is previewable within a second and refined files replace it in one step."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            start = time.perf_counter()
+            draft = create_draft_project(
+                PROJECT_ID,
+                "A bakery website for Crumb & Co. Show our breads and opening hours.",
+                ["Menu section", "Opening hours"],
+                {"primary_color": "#92400E"}
+            )
+            preview_manager = ProjectPreviewManager(base_port=3401)
+            preview = preview_manager.start_preview(PROJECT_ID)
+            time_to_preview = time.perf_counter() - start
+            print(f"⚡ Draft with {draft.get('total_files')} files previewed in {time_to_preview:.2f}s at {preview.get('url')}")
+
+            files_path = Path('generated/projects') / PROJECT_ID / 'files'
+            draft_version = files_path.resolve()
+            draft_content = fetch(f"{preview['url']}/src/content.ts") if preview.get('success') else ''
+            draft_index = fetch(f"{preview['url']}/index.html") if preview.get('success') else ''
+
+            # Refined files stream into the staging directory while the draft is served
+            writer = StreamingFileWriter(PROJECT_ID, staged=True)
+            writer.feed(REFINED_OUTPUT)
+            writer.close()
+            during_refinement = fetch(f"{preview['url']}/src/content.ts") if preview.get('success') else ''
+
+            parsed = ProjectFileParser(REFINED_OUTPUT, PROJECT_ID).parse()
+            refined = create_project_structure(PROJECT_ID, parsed, {'title': 'Crumb & Co'}, staged=True)
+            refined_content = fetch(f"{preview['url']}/src/content.ts") if preview.get('success') else ''
+            preview_manager.stop_preview(PROJECT_ID)
+            served_by_link = files_path.is_symlink()
+            draft_removed = not draft_version.exists()
+            staging_consumed = not (files_path.parent / STAGING_FILES_DIR).exists()
+        finally:
+            os.chdir(original_dir)
+
+    checks = [
+        (draft.get('success') and preview.get('success'), "Draft written and preview started"),
+        (time_to_preview < 1.0, "Time to first preview under a second"),
+        ('Show our breads' in draft_content and '#92400E' in draft_content, "Draft filled from the request without an LLM"),
+        ('src="/src/main.tsx"' in draft_index, "Draft includes the project templates"),
+        (served_by_link, "Served files are a swappable link"),
+        (during_refinement == draft_content, "Streamed refined files do not touch the draft"),
+        (refined.get('success') and 'Sourdough baked at dawn' in refined_content, "Preview serves the refined files after the swap"),
+        (draft_removed, "Draft version removed after the swap"),
+        (staging_consumed, "Staging directory consumed by the swap"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Draft Mode")
+    print("=" * 50)
+
+    if test_draft_mode():
+        print("\n🎉 Draft mode test completed successfully!")
+    else:
+        print("\n⚠️  Draft mode test completed with issues.")
@@ -0,0 +1,92 @@
+"""Test script for ending the engineer's stream once every required file is complete."""
+
+import os
+import sys
+import tempfile
+sys.path.append('backend')
+os.environ.setdefault('LLM_PROVIDER', 'stub')
+
+from backend.crew.website_crew import WebsiteCrew
+from backend.llm.agent_llm import AgentLLM
+from backend.llm.stub import StubChatModel
+from backend.utils.streaming_writer import StreamingFileWriter
+
+SITE_JSON = '{"siteName": "Lens & Light", "sections": ["Navbar", "Hero", "Gallery", "Contact", "Footer"]}'
+GALLERY = "import React from 'react';\n\nconst Gallery: React.FC = () => <section id=\"gallery\" />;\n\nexport default Gallery;"
+COMMENTARY = "\n\nThese components follow the design closely. " * 200
+
+FILES = f"""1. site.json
+
+```json
+{SITE_JSON}
+```
+
+2. src/components/Gallery.tsx
+
+```tsx
+{GALLERY}
+```"""
+
+RESPONSE = f"Thought: I now know the final answer\nFinal Answer:\n\n{FILES}{COMMENTARY}"
+
+
+def run(crew: WebsiteCrew, response: str, project_id: str):
+    """Stream a response through the engineer's LLM with early stopping armed."""
+    writer = StreamingFileWriter(project_id)
+    received = []
+
+    def listen(text):
+        received.append(text)
+        writer.feed(text)
+
+    llm = AgentLLM(StubChatModel(response=response, chunk_size=16))
+    llm.stream_listener = listen
+    llm.stream_stop = lambda: crew._required_files_complete(writer.parser.closed_blocks)
+    answer = llm.call("Implement the website")
+    return answer, llm.get_usage(), ''.join(received)
+
+
+def test_early_stop():
+    """The stream ends after the last required file, not after the commentary."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            crew = WebsiteCrew()
+            answer, usage, received = run(crew, RESPONSE, 'early-stop-test')
+            print(f"✂️  Stopped after {len(received)} of {len(RESPONSE)} characters ({usage['stop_reason']})")
+
+            # Without the Gallery component that site.json asks for, the stream runs to the end
+            missing = RESPONSE.replace("src/components/Gallery.tsx", "docs/notes.tsx")
+            _, missing_usage, missing_received = run(crew, missing, 'early-stop-test-missing')
+
+            # Files in the reasoning before the final answer never end the stream
+            premature = f"Thought: a first draft\n\n{FILES}\n\n{RESPONSE}"
+            _, premature_usage, premature_received = run(crew, premature, 'early-stop-test-premature')
+        finally:
+            os.chdir(original_dir)
+
+    checks = [
+        (usage['stop_reason'] == 'early_stop', "Stream stopped early"),
+        (len(received) < len(RESPONSE) / 4, "Trailing commentary never streamed"),
+        (answer.count('```') >= 4 and 'export default Gallery' in answer, "Answer keeps every required file"),
+        (0 < usage['output_tokens'] < len(RESPONSE) // 4 / 4, "Output tokens estimated for the shortened response"),
+        (missing_usage['stop_reason'] != 'early_stop' and len(missing_received) == len(missing), "Missing custom section keeps the stream open"),
+        ('Final Answer:' in premature_received and premature_usage['stop_reason'] == 'early_stop', "Stream only stops inside the final answer"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Early Stop")
+    print("=" * 50)
+
+    if test_early_stop():
+        print("\n🎉 Early stop test completed successfully!")
+    else:
+        print("\n⚠️  Early stop test completed with issues.")
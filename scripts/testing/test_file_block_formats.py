@@ -0,0 +1,95 @@
+"""Test script for recognizing file blocks written in drifted formats.
+
+Each output in file_block_corpus/ is parsed and compared with the paths,
+languages and formats listed in file_block_corpus/expected.json. Add a new
+case there whenever a model drifts into a layout that is not recognized.
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+sys.path.append('backend')
+
+from backend.utils.file_block_scanner import FileBlockScanner
+from backend.utils.file_parser import IncrementalFileParser, ProjectFileParser, detect_truncation
+
+CORPUS_DIR = Path(__file__).parent / 'file_block_corpus'
+
+# The only layout recognized before, for comparison
+LEGACY_PATTERN = re.compile(r'(\d+)\.\s+([^\n]+)\n\n```(\w+)\n(.*?)\n```', re.DOTALL)
+
+
+def test_file_block_formats():
+    """Every corpus output yields its expected files, whole or streamed."""
+    expected = json.loads((CORPUS_DIR / 'expected.json').read_text())
+    checks = []
+    legacy_misses = 0
+
+    for case, files in expected.items():
+        text = (CORPUS_DIR / case).read_text()
+        blocks = ProjectFileParser(text, 'format-test').extract_file_blocks()
+        found = [[block['path'], block['language'], block['format']] for block in blocks]
+
+        # Streaming in small chunks keeps the most confident block per path as well
+        streaming = IncrementalFileParser('format-test')
+        for index in range(0, len(text), 7):
+            streaming.feed(text[index:index + 7])
+        streaming.close()
+
+        expected_paths = [path for path, _, _ in files]
+        truncation = detect_truncation(text, expected_paths)
+        legacy_found = {path.strip() for _, path, _, _ in LEGACY_PATTERN.findall(text)}
+        if not set(expected_paths) <= legacy_found:
+            legacy_misses += 1
+
+        print(f"📄 {case}: {[path for path, _, _ in found]}")
+        checks.append((found == files, f"{case}: expected files, languages and formats"))
+        checks.append((sorted(streaming.closed_blocks) == sorted(expected_paths), f"{case}: same files when streamed"))
+        checks.append((not truncation['missing_files'], f"{case}: no continuation requested"))
+
+    duplicates = {block['path']: block['content'] for block in ProjectFileParser(
+        (CORPUS_DIR / 'duplicates.md').read_text(), 'format-test'
+    ).extract_file_blocks()}
+    checks.append(('final' in duplicates['src/App.tsx'], "Numbered block outranks a later heading block"))
+    checks.append(('sticky' in duplicates['src/components/Navbar.tsx'], "Later block wins between equal formats"))
+
+    # Drifted formats are still scanned in linear time
+    scanner = FileBlockScanner()
+    scanner.feed("### src/App.tsx\n```tsx\n" + "const x = 1;\n" * 100000)
+    checks.append((scanner.open_block is not None and scanner.open_block['path'] == 'src/App.tsx', "Unclosed heading block reported"))
+
+    # Stray fences and non-file fenced blocks before and after a header do not
+    # rescan the rest of the output: four times the lines take about four times as long
+    def fence_noise(lines):
+        noise = "```\n" * lines + "Then run:\n```bash\nnpm install\n```\n" * (lines // 4)
+        return f"{noise}1. src/App.tsx\n\n```tsx\nexport const x = 1;\n```\n{noise}"
+
+    timings = []
+    for lines in (5000, 20000):
+        text = fence_noise(lines)
+        start = time.perf_counter()
+        blocks = ProjectFileParser(text, 'format-test').extract_file_blocks()
+        timings.append(time.perf_counter() - start)
+    print(f"⚡ Fence noise: {timings[0] * 1000:.0f} ms for 5,000 lines, {timings[1] * 1000:.0f} ms for 20,000")
+    checks.append(([block['path'] for block in blocks] == ['src/App.tsx'], "File found between stray fences and command blocks"))
+    checks.append((timings[1] < timings[0] * 8, "Stray fences are scanned in linear time"))
+
+    print(f"\n🔁 Outputs the legacy pattern would have sent back for regeneration: {legacy_misses}/{len(expected)}")
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing File Block Formats")
+    print("=" * 50)
+
+    if test_file_block_formats():
+        print("\n🎉 File block format test completed successfully!")
+    else:
+        print("\n⚠️  File block format test completed with issues.")
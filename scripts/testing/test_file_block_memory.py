@@ -0,0 +1,93 @@
+"""Test script for the memory used by parsed file blocks on a large output."""
+
+import os
+import re
+import sys
+import tracemalloc
+sys.path.append('backend')
+
+# Validate in this process so tracemalloc sees all the work
+os.environ['VALIDATION_WORKERS'] = '1'
+
+from backend.utils.file_block_scanner import scan_file_blocks
+from backend.utils.file_parser import ProjectFileParser
+
+# The block representation before offsets: stripped content plus the raw match groups
+LEGACY_PATTERN = re.compile(r'(\d+)\.\s+([^\n]+)\n\n```(\w+)\n(.*?)\n```', re.DOTALL)
+
+COMPONENT = "\n".join(f"      <p className=\"text-gray-600\">Line {line}</p>" for line in range(100))
+LARGE_OUTPUT = "".join(
+    f"{n}. src/components/Section{n}.tsx\n\n```tsx\nexport default function Section{n}() {{\n  return (\n    <section>\n{COMPONENT}\n    </section>\n  );\n}}\n```\n\n"
+    for n in range(1, 2001)
+)
+
+
+def legacy_blocks(text):
+    return [
+        {
+            'number': int(match.group(1)),
+            'path': match.group(2).strip(),
+            'language': match.group(3),
+            'content': match.group(4).strip(),
+            'raw_match': match.groups()
+        }
+        for match in LEGACY_PATTERN.finditer(text)
+    ]
+
+
+def measure(function):
+    """Return the function's result, the memory it keeps and its peak, in MB."""
+    tracemalloc.start()
+    result = function()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained / 1e6, peak / 1e6
+
+
+def test_file_block_memory():
+    """Blocks point into the output and only copy content when it is read."""
+    size = len(LARGE_OUTPUT) / 1e6
+
+    legacy, legacy_retained, legacy_peak = measure(lambda: legacy_blocks(LARGE_OUTPUT))
+    del legacy
+    blocks, retained, peak = measure(lambda: ProjectFileParser(LARGE_OUTPUT, 'memory-test').extract_file_blocks())
+    parsed, parse_retained, parse_peak = measure(lambda: ProjectFileParser(LARGE_OUTPUT, 'memory-test').parse())
+
+    print(f"📦 {size:.1f} MB output, {len(blocks)} file blocks")
+    print(f"   Legacy blocks: {legacy_retained:.1f} MB kept, {legacy_peak:.1f} MB peak")
+    print(f"   Offset blocks: {retained:.1f} MB kept, {peak:.1f} MB peak ({(1 - peak / legacy_peak) * 100:.0f}% lower peak)")
+    print(f"   Full parse:    {parse_retained:.1f} MB kept, {parse_peak:.1f} MB peak")
+
+    unread = blocks[0]._content is None
+    first = blocks[0].content
+    expected = legacy_blocks(LARGE_OUTPUT[:len(LARGE_OUTPUT) // 100])
+
+    # Anonymous blocks named by a first-line comment skip that line without copying
+    commented, _ = scan_file_blocks("```tsx\n// src/App.tsx\nexport default function App() {}\n```\n")
+
+    checks = [
+        (len(blocks) == 2000 and unread, "Content is not copied until it is read"),
+        (first is blocks[0].content and first == expected[0]['content'], "Content is materialized once and matches the legacy content"),
+        ([(block['number'], block['path'], block['content']) for block in blocks[:len(expected)]]
+         == [(block['number'], block['path'], block['content']) for block in expected], "Same blocks as the legacy representation"),
+        (peak < legacy_peak / 4 and retained < size / 10, "Scanning keeps a small fraction of the output"),
+        (parsed['file_count'] == 2000 and parse_peak < size * 1.6, "Full parse holds about one copy of the content"),
+        (parsed['files']['src/components/Section1.tsx']['content'] == first, "Parsed files carry the block content"),
+        (commented[0].path == 'src/App.tsx' and commented[0].content == 'export default function App() {}', "Comment-named block content starts after the comment"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing File Block Memory")
+    print("=" * 50)
+
+    if test_file_block_memory():
+        print("\n🎉 File block memory test completed successfully!")
+    else:
+        print("\n⚠️  File block memory test completed with issues.")
@@ -0,0 +1,116 @@
+"""Test script for the linear-time file block scanner."""
+
+import re
+import sys
+import time
+sys.path.append('backend')
+
+from backend.utils.file_block_scanner import FileBlockScanner, scan_file_blocks
+from backend.utils.file_parser import ProjectFileParser, detect_truncation
+
+# The regular expression the scanner replaced, kept here as the reference
+REFERENCE_PATTERN = re.compile(r'(\d+)\.\s+([^\n]+)\n\n```(\w+)\n(.*?)\n```', re.DOTALL)
+
+OUTPUT = """Thought: I now know the final answer
+Final Answer: Here are the files.
+
+1. src/App.tsx
+
+```tsx
+import React from 'react';
+
+const App: React.FC = () => <main>```not a fence``` inline</main>;
+
+export default App;
+```
+
+Step 2. is explained below and is not a file.
+
+2. package.json
+
+```json
+{"name": "site", "dependencies": {"react": "^18.2.0"}}
+```
+
+3. README.md
+
+```markdown
+# Site
+
+Run `npm install`.
+```
+"""
+
+TRUNCATED = OUTPUT + """
+4. src/components/Footer.tsx
+
+```tsx
+const Footer = () => <footer>"""
+
+
+def reference_blocks(text):
+    return [(int(n), path.strip(), language, content.strip()) for n, path, language, content in REFERENCE_PATTERN.findall(text)]
+
+
+def scanned_blocks(blocks):
+    return [(block['number'], block['path'], block['language'], block['content']) for block in blocks]
+
+
+def test_file_block_scanner():
+    """The scanner matches the old regex, streams in any chunk size and stays linear."""
+    whole, _ = scan_file_blocks(OUTPUT)
+
+    # Feed the same output one character at a time
+    scanner = FileBlockScanner()
+    streamed = [block for char in OUTPUT for block in scanner.feed(char)] + scanner.close()
+
+    _, unclosed = scan_file_blocks(TRUNCATED)
+    truncation = detect_truncation(TRUNCATED, ['src/App.tsx'])
+
+    # An unterminated fence followed by megabytes of content
+    pathological = "1. src/App.tsx\n\n```tsx\n" + "const x = 1;\n" * 250000
+    digits = "1" * 200000 + ". \n"
+    start = time.perf_counter()
+    blocks, open_block = scan_file_blocks(pathological)
+    unterminated_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan_file_blocks(digits)
+    digits_time = time.perf_counter() - start
+
+    # A thousand components of about a hundred lines each
+    component = "\n".join(f"  <p className=\"text-gray-600\">Line {line}</p>" for line in range(100))
+    large = "".join(f"{n}. src/components/Section{n}.tsx\n\n```tsx\n{component}\n```\n\n" for n in range(1, 1001))
+    start = time.perf_counter()
+    large_blocks = ProjectFileParser(large, 'scanner-test').extract_file_blocks()
+    large_time = time.perf_counter() - start
+    print(f"⚡ {len(pathological) / 1e6:.1f} MB unterminated fence scanned in {unterminated_time * 1000:.0f} ms")
+    print(f"⚡ {len(large) / 1e6:.1f} MB of file blocks scanned in {large_time * 1000:.0f} ms")
+
+    checks = [
+        (scanned_blocks(whole) == reference_blocks(OUTPUT), "Same blocks as the reference regex"),
+        (scanned_blocks(streamed) == scanned_blocks(whole), "Character-by-character feed gives the same blocks"),
+        (OUTPUT[whole[1]['start']:whole[1]['end']].startswith('2. package.json') and OUTPUT[whole[1]['end'] - 3:whole[1]['end']] == '```', "Block offsets span the block text"),
+        (unclosed is not None and unclosed['path'] == 'src/components/Footer.tsx', "Unclosed block reported"),
+        (truncation['incomplete_files'] == ['src/components/Footer.tsx'] and truncation['next_number'] == 5, "Truncation detection uses the scanner"),
+        (not truncation['complete_output'].rstrip().endswith('<footer>'), "Cut-off block dropped from the complete output"),
+        (blocks == [] and open_block is not None and unterminated_time < 1.0, "Unterminated fence scanned in linear time"),
+        (digits_time < 0.1, "Long runs of digits scanned in linear time"),
+        (len(large_blocks) == 1000 and large_time < 0.1, "Multi-megabyte output scanned quickly"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing File Block Scanner")
+    print("=" * 50)
+
+    if test_file_block_scanner():
+        print("\n🎉 File block scanner test completed successfully!")
+    else:
+        print("\n⚠️  File block scanner test completed with issues.")
@@ -5,17 +5,18 @@ import os
 sys.path.append('backend')
 
 from backend.utils.file_parser import ProjectFileParser
+from backend.utils.task_outputs import CODE_TASK, TaskOutputStore
 
 def test_file_parser():
     """Test the file parser with existing crew output."""
     
     # Read the existing crew output
     project_id = "9e5c696f-96e4-445a-8bd9-a909b0b37a33"
-    crew_output_path = f"generated/projects/{project_id}/crew_output.txt"
     
     try:
-        with open(crew_output_path, 'r', encoding='utf-8') as f:
-            crew_output = f.read()
+        crew_output = TaskOutputStore(project_id).load(CODE_TASK)
+        if crew_output is None:
+            raise FileNotFoundError(project_id)
         
         print(f"✅ Successfully read crew output ({len(crew_output)} characters)")
         
@@ -65,7 +66,7 @@ def test_file_parser():
         return result
         
     except FileNotFoundError:
-        print(f"❌ Could not find crew output file: {crew_output_path}")
+        print(f"❌ Could not find crew output for project {project_id}")
         return None
     except Exception as e:
         print(f"❌ Error testing file parser: {str(e)}")
@@ -0,0 +1,64 @@
+"""Test script for hedged software engineer requests against the local stub model."""
+
+import sys
+import time
+from collections import deque
+sys.path.append('backend')
+
+from backend.llm.agent_llm import AgentLLM
+from backend.llm.hedging import HedgedChatModel
+from backend.llm.stub import StubChatModel
+
+RESPONSE = "Final Answer: 1. src/App.tsx"
+
+
+def test_hedged_requests():
+    """A slow first request is hedged, the fast one wins and the budget caps hedging."""
+    # Past runs started streaming within 50ms; this call's first request stalls for 1s
+    history = deque([0.05] * 10, maxlen=50)
+    stub = StubChatModel(model="stub-engineer", response=RESPONSE, latencies=[1.0, 0.01], chunk_size=8)
+    llm = AgentLLM(HedgedChatModel(stub, history, hedge_percentile=0.9, max_extra_tokens=1000))
+
+    start = time.perf_counter()
+    answer = llm.call("Implement the website")
+    elapsed = time.perf_counter() - start
+    time.sleep(1.1)  # let the cancelled request notice and report its spend
+    usage = llm.get_usage()
+    print(f"⚡ Hedged answer in {elapsed:.2f}s: {answer!r}")
+    print(f"📊 Usage: hedges={usage['hedges']} wins={usage['hedge_wins']} extra_tokens={usage['hedge_extra_tokens']}")
+
+    # With no extra-token budget the slow request is simply awaited
+    capped_stub = StubChatModel(model="stub-engineer", response=RESPONSE, latencies=[0.3, 0.01])
+    capped = AgentLLM(HedgedChatModel(capped_stub, deque([0.05] * 10), max_extra_tokens=0))
+    capped.call("Implement the website")
+    capped_usage = capped.get_usage()
+
+    # Fast starts are never hedged
+    fast_stub = StubChatModel(model="stub-engineer", response=RESPONSE, latency=0.01)
+    fast = AgentLLM(HedgedChatModel(fast_stub, deque([0.5] * 10)))
+    fast.call("Implement the website")
+
+    checks = [
+        (answer == RESPONSE, "Winning response returned intact"),
+        (elapsed < 0.5, "Hedge avoided the slow first request"),
+        (usage['hedges'] == 1 and usage['hedge_wins'] == 1, "Hedge launched and won"),
+        (0 < usage['hedge_extra_tokens'] <= 1000, "Losing request's tokens counted against the cap"),
+        (capped_usage['hedges'] == 0 and capped_stub.calls == 1, "No hedge once the extra-token budget is spent"),
+        (fast.get_usage()['hedges'] == 0 and fast_stub.calls == 1, "Requests that start quickly are not hedged"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Hedged Requests")
+    print("=" * 50)
+
+    if test_hedged_requests():
+        print("\n🎉 Hedged requests test completed successfully!")
+    else:
+        print("\n⚠️  Hedged requests test completed with issues.")
@@ -0,0 +1,91 @@
+"""Test script for the shared Anthropic connection pool against a local stand-in server."""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append('backend')
+
+from backend.llm.http_pool import PooledChatAnthropic, close_http_client, get_http_client
+
+
+class CountingAnthropicHandler(BaseHTTPRequestHandler):
+    """Answer /v1/messages like the Anthropic API and count TCP connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests = 0
+    versions = set()
+
+    def setup(self):
+        super().setup()
+        CountingAnthropicHandler.connections += 1
+
+    def do_POST(self):
+        CountingAnthropicHandler.requests += 1
+        CountingAnthropicHandler.versions.add(self.request_version)
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({
+            "id": "msg_local",
+            "type": "message",
+            "role": "assistant",
+            "model": "claude-3-5-haiku-20241022",
+            "content": [{"type": "text", "text": "Final Answer: ok"}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 5, "output_tokens": 4}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_http_pool():
+    """Three agent clients making six calls share one kept-alive connection."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CountingAnthropicHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        agents = [
+            PooledChatAnthropic(model="claude-3-5-haiku-20241022", api_key="local", base_url=base_url, max_tokens=64)
+            for _ in range(3)
+        ]
+        answers = [agent.invoke("Hello").content for agent in agents for _ in range(2)]
+        shared = all(agent._client._client is get_http_client() for agent in agents)
+        negotiated = get_http_client().post(f"{base_url}/v1/messages", json={}).http_version
+    finally:
+        server.shutdown()
+        close_http_client()
+
+    print(f"📨 Requests: {CountingAnthropicHandler.requests}")
+    print(f"🔌 Connections opened: {CountingAnthropicHandler.connections}")
+    print(f"🌐 Protocol: {negotiated}")
+
+    checks = [
+        (answers == ["Final Answer: ok"] * 6, "All calls answered"),
+        (shared, "Every agent client uses the shared HTTP client"),
+        (CountingAnthropicHandler.connections == 1, "Connection kept alive and reused across agents"),
+        (negotiated == "HTTP/1.1" and CountingAnthropicHandler.versions == {"HTTP/1.1"}, "Requests are sent over HTTP/1.1"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Shared HTTP Pool")
+    print("=" * 50)
+
+    if test_http_pool():
+        print("\n🎉 HTTP pool test completed successfully!")
+    else:
+        print("\n⚠️  HTTP pool test completed with issues.")
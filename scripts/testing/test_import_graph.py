@@ -0,0 +1,112 @@
+"""Test script for the import graph between generated script files."""
+
+import os
+import sys
+import tempfile
+sys.path.append('backend')
+os.environ.setdefault('LLM_PROVIDER', 'stub')
+
+from backend.crew.website_crew import TEMPLATE_FILES, WebsiteCrew
+from backend.utils.file_parser import detect_truncation, parse_project_files
+from backend.utils.import_graph import build_import_graph, preload_set
+from backend.utils.project_structure import ProjectStructureManager, create_project_structure
+
+APP = """import React from 'react';
+import { Camera } from 'lucide-react';
+import Navbar from './components/Navbar';
+import Hero from '@/components/Hero';
+import Gallery from './components/Gallery';
+import './index.css';
+
+export default function App() {
+  return (<main><Navbar /><Hero /><Gallery /><Camera /></main>);
+}"""
+
+NAVBAR = """import React from 'react';
+import { siteContent, type NavLink } from '../content';
+
+const Navbar: React.FC = () => <nav>{siteContent.name}</nav>;
+
+export default Navbar;"""
+
+HERO = """import React from 'react';
+import { siteContent, heroImage } from '../content';
+
+export default function Hero() {
+  return (<section>{siteContent.tagline}</section>);
+}"""
+
+CONTENT = """export interface NavLink { label: string }
+
+export const siteContent = { name: 'Lens & Light', tagline: 'Photography' };"""
+
+OUTPUT = "".join(
+    f"{n}. {path}\n\n```tsx\n{content}\n```\n\n"
+    for n, (path, content) in enumerate([
+        ('src/App.tsx', APP), ('src/components/Navbar.tsx', NAVBAR),
+        ('src/components/Hero.tsx', HERO), ('src/content.ts', CONTENT),
+    ], 1)
+) + '5. package.json\n\n```json\n{"name": "lens-and-light"}\n```\n\n6. README.md\n\n```markdown\n# Lens & Light\n```\n'
+
+SITE_JSON = '{"siteName": "Lens & Light", "sections": ["Navbar", "Hero", "Gallery", "Footer"]}'
+
+
+def test_import_graph():
+    """Unresolved imports are found, requested and stored with the project."""
+    parsed = parse_project_files(OUTPUT, 'imports-test')
+    graph = parsed['import_graph']
+
+    check = detect_truncation(OUTPUT, ['src/App.tsx'], provided_files=TEMPLATE_FILES)
+    prompt = WebsiteCrew()._create_continuation_prompt(check, "spec", "design")
+
+    # Components that site.json asks for are imported by the rendered App.tsx
+    library_check = detect_truncation(f"1. site.json\n\n```json\n{SITE_JSON}\n```\n", [], provided_files=TEMPLATE_FILES)
+    print(f"🔗 Unresolved: {[item['path'] for item in check['unresolved_imports']]}, with site.json: {[item['path'] for item in library_check['unresolved_imports']]}")
+
+    # The manifest keeps the graph, completed with the template entry point
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            create_project_structure('imports-test', parsed, {'title': 'Lens & Light'})
+            manager = ProjectStructureManager('imports-test')
+            stored = manager.get_import_graph()
+            links = manager.get_preload_links()
+        finally:
+            os.chdir(original_dir)
+    print(f"📦 Preload set: {stored['preload']}")
+
+    cyclic = build_import_graph({
+        'src/a.ts': "import { b } from './b';\nexport const a = 1;",
+        'src/b.ts': "import { a } from './a';\nexport const b = 2;",
+    })
+
+    app_imports = {item['source']: item['resolved'] for item in graph['modules']['src/App.tsx']['imports']}
+    checks = [
+        (app_imports['@/components/Hero'] == 'src/components/Hero.tsx' and app_imports['./components/Navbar'] == 'src/components/Navbar.tsx', "Relative and @/ imports resolve to project files"),
+        ([item['path'] for item in graph['unresolved']] == ['src/components/Gallery.tsx', 'src/index.css'], "Imports of missing files are unresolved at parse time"),
+        (graph['external'] == ['lucide-react', 'react'], "Packages are recorded as external"),
+        (graph['missing_exports'] == [{'importer': 'src/components/Hero.tsx', 'module': 'src/content.ts', 'name': 'heroImage'}], "Names a module does not export are listed"),
+        (check['missing_files'] == ['src/components/Gallery.tsx'] and check['truncated'], "Only the missing module is requested; template files count as present"),
+        ("src/components/Gallery.tsx (imported by src/App.tsx)" in prompt, "Continuation prompt names the importer"),
+        ('src/components/Gallery.tsx' in [item['path'] for item in library_check['unresolved_imports']], "Custom sections in site.json are checked"),
+        (stored['success'] and stored['import_graph']['entry'] == 'src/main.tsx' and stored['preload'][0] == 'src/App.tsx', "Manifest graph includes the template entry point"),
+        ('src/content.ts' in stored['preload'] and '<link rel="modulepreload" href="src/App.tsx">' in links, "Preload set covers modules reachable from the entry"),
+        (preload_set(cyclic, 'src/a.ts') == ['src/b.ts'], "Import cycles are preloaded once"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Import Graph")
+    print("=" * 50)
+
+    if test_import_graph():
+        print("\n🎉 Import graph test completed successfully!")
+    else:
+        print("\n⚠️  Import graph test completed with issues.")
@@ -0,0 +1,79 @@
+"""Import-time budget check for the API process (python -X importtime)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import time allowed for backend.main, in milliseconds
+IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# The generation stack is only imported when a generation runs
+DEFERRED_MODULES = ['crewai', 'litellm', 'langchain_core', 'langchain_anthropic', 'anthropic']
+
+
+def measure_import_time(module: str = "backend.main") -> dict:
+    """Import a module in a fresh interpreter and parse the -X importtime report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True
+    )
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative.strip())
+
+    return {
+        'returncode': result.returncode,
+        'total_ms': imports.get(module, 0) / 1000,
+        'imports': imports
+    }
+
+
+def test_import_time():
+    """backend.main stays within its import budget and does not load crewai/langchain."""
+    report = measure_import_time()
+    top_level = sorted(
+        ((name, micros) for name, micros in report['imports'].items() if '.' not in name),
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+    print(f"⏱️  backend.main imported in {report['total_ms']:.0f} ms (budget {IMPORT_TIME_BUDGET_MS} ms)")
+    print("🐢 Slowest top-level imports:")
+    for name, micros in top_level[:5]:
+        print(f"   {name}: {micros / 1000:.0f} ms")
+
+    loaded = [module for module in DEFERRED_MODULES if module in report['imports']]
+
+    checks = [
+        (report['returncode'] == 0, "backend.main imports cleanly"),
+        (report['total_ms'] <= IMPORT_TIME_BUDGET_MS, "Import time within budget"),
+        (not loaded, f"Generation stack deferred{' (loaded: ' + ', '.join(loaded) + ')' if loaded else ''}"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing API Import Time")
+    print("=" * 50)
+
+    if test_import_time():
+        print("\n🎉 Import time check completed successfully!")
+    else:
+        print("\n⚠️  Import time check completed with issues.")
+        sys.exit(1)
@@ -0,0 +1,88 @@
+"""Test script for latency-aware model routing against the local stub model."""
+
+import os
+import sys
+import threading
+import time
+sys.path.append('backend')
+
+from backend.llm.agent_llm import AgentLLM
+from backend.llm.config import get_agent_model_config
+from backend.llm.router import ModelRouter
+from backend.llm.stub import StubChatModel
+
+
+def primary_response(messages):
+    """Answer on the primary unless the prompt asks it to fail."""
+    if 'fail over' in str(messages[-1].content):
+        raise RuntimeError("primary unavailable")
+    return "Final Answer: primary"
+
+
+def test_model_router():
+    """A slow primary is routed around, a failing one falls back per call."""
+    slow_primary = StubChatModel(model="slow-primary", latency=0.05, response="Final Answer: primary")
+    fast_fallback = StubChatModel(model="fast-fallback", response="Final Answer: fallback")
+    router = ModelRouter(slow_primary, fast_fallback, p95_threshold=0.02, min_samples=3, probe_interval=4)
+    llm = AgentLLM(router)
+
+    answers = [llm.call("Write a specification") for _ in range(8)]
+    stats = router.get_stats()
+    print(f"🔀 Answers: {answers}")
+    print(f"📊 Stats: {stats}")
+
+    failing_primary = StubChatModel(model="failing-primary", fail_first=1)
+    failover = ModelRouter(failing_primary, StubChatModel(model="backup", response="Final Answer: backup"))
+    failover_answer = AgentLLM(failover).call("Design the site")
+
+    # A stream stopped after the final answer still counts as a latency sample
+    streamed = ModelRouter(StubChatModel(model="streamed", response="Final Answer: " + "done " * 200, chunk_size=8))
+    early_stopping = AgentLLM(streamed)
+    early_stopping.stream_listener = lambda text: None
+    early_stopping.stream_stop = lambda: True
+    early_stopping.call("Write the code")
+    early_stop_samples = streamed.get_stats()['models']['streamed']['samples']
+
+    # Concurrent calls on one router are each attributed to the model that served them
+    shared = ModelRouter(
+        StubChatModel(model="shared-primary", latencies=[0.3, 0.0], response=primary_response),
+        StubChatModel(model="shared-fallback", response="Final Answer: fallback")
+    )
+    concurrent = [AgentLLM(shared), AgentLLM(shared)]
+    slow_call = threading.Thread(target=concurrent[0].call, args=("Design the site",))
+    slow_call.start()
+    time.sleep(0.1)
+    concurrent[1].call("Design the site, fail over")
+    slow_call.join()
+    served_by = [llm.get_usage()['model'] for llm in concurrent]
+
+    os.environ["PRODUCT_MANAGER_MAX_TOKENS"] = "2048"
+    config = get_agent_model_config("product_manager")
+    del os.environ["PRODUCT_MANAGER_MAX_TOKENS"]
+
+    checks = [
+        (answers[:3] == ["Final Answer: primary"] * 3, "Primary serves calls until it has enough samples"),
+        (not stats['primary_healthy'], "Slow primary marked unhealthy by p95 latency"),
+        ("Final Answer: fallback" in answers[3:], "Calls routed to the fallback model"),
+        (stats['models']['slow-primary']['samples'] > 3, "Primary still probed while unhealthy"),
+        (failover_answer == "Final Answer: backup", "Failed primary call retried on the fallback"),
+        (early_stopping.get_usage()['stop_reason'] == 'early_stop' and early_stop_samples == 1, "Early-stopped stream records a latency sample"),
+        (served_by == ["shared-primary", "shared-fallback"], "Concurrent calls attributed to the model that served each"),
+        (config['max_tokens'] == 2048 and 'haiku' in config['model'], "Per-agent tier and overrides resolved"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Model Router")
+    print("=" * 50)
+
+    if test_model_router():
+        print("\n🎉 Model router test completed successfully!")
+    else:
+        print("\n⚠️  Model router test completed with issues.")
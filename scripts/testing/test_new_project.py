@@ -5,6 +5,7 @@ sys.path.append('backend')
 
 from backend.utils.file_parser import ProjectFileParser
 from backend.utils.project_structure import create_project_structure
+from backend.utils.task_outputs import CODE_TASK, TaskOutputStore
 
 def test_new_project():
     project_id = '3ec68bde-f4ee-4d3b-b2e9-6a6d55443de1'
@@ -12,8 +13,9 @@ def test_new_project():
     print('🔍 Testing automatic parsing on new project...')
     
     # Read the crew output
-    with open(f'generated/projects/{project_id}/crew_output.txt', 'r') as f:
-        crew_output = f.read()
+    crew_output = TaskOutputStore(project_id).load(CODE_TASK)
+    if crew_output is None:
+        raise FileNotFoundError(f"No code output saved for project {project_id}")
     
     print(f'Crew output length: {len(crew_output)} characters')
     
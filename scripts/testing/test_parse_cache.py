@@ -0,0 +1,81 @@
+"""Test script for the parse-result cache stored next to parsed_files.json."""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append('backend')
+
+from backend.utils import file_parser
+from backend.utils.file_parser import PARSE_CACHE_FILE, load_parsed_project, parse_project_files_cached
+
+PROJECT_ID = 'parse-cache-test'
+
+COMPONENT = "\n".join(f"      <p className=\"text-gray-600\">Line {line}</p>" for line in range(100))
+CREW_OUTPUT = "".join(
+    f"{n}. src/components/Section{n}.tsx\n\n```tsx\nexport default function Section{n}() {{\n  return (\n    <section>\n{COMPONENT}\n    </section>\n  );\n}}\n```\n\n"
+    for n in range(1, 301)
+)
+
+
+def test_parse_cache():
+    """The same output and parser reuse the stored result; anything else re-parses."""
+    original_dir = os.getcwd()
+    original_version = file_parser.PARSER_VERSION
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            project_dir = Path('generated/projects') / PROJECT_ID
+            project_dir.mkdir(parents=True)
+            (project_dir / 'crew_output.txt').write_text(CREW_OUTPUT)
+
+            start = time.perf_counter()
+            first = load_parsed_project(PROJECT_ID)
+            parse_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            second = load_parsed_project(PROJECT_ID)
+            cached_time = time.perf_counter() - start
+            print(f"⚡ {len(CREW_OUTPUT) / 1e6:.1f} MB parsed in {parse_time * 1000:.0f} ms, loaded from cache in {cached_time * 1000:.0f} ms")
+
+            changed = parse_project_files_cached(CREW_OUTPUT + "\n", PROJECT_ID)
+
+            # A parser upgrade re-parses lazily on the next access, then caches again
+            file_parser.PARSER_VERSION = original_version + '-upgraded'
+            upgraded = load_parsed_project(PROJECT_ID)
+            after_upgrade = load_parsed_project(PROJECT_ID)
+
+            (project_dir / PARSE_CACHE_FILE).write_text('{"crew_output_sha256": ')
+            corrupted = load_parsed_project(PROJECT_ID)
+        finally:
+            file_parser.PARSER_VERSION = original_version
+            os.chdir(original_dir)
+
+    without_flag = {key: value for key, value in second.items() if key != 'from_cache'}
+    checks = [
+        (not first['from_cache'] and first['file_count'] == 300, "First access parses the output"),
+        (second['from_cache'], "Second access uses the cached result"),
+        (without_flag == {key: value for key, value in first.items() if key != 'from_cache'}, "Cached result equals the parsed result"),
+        (cached_time < parse_time, "Loading the cache is faster than parsing"),
+        (not changed['from_cache'], "Changed crew output is re-parsed"),
+        (not upgraded['from_cache'] and after_upgrade['from_cache'], "Parser upgrade re-parses once, then caches"),
+        (not corrupted['from_cache'] and corrupted['file_count'] == 300, "Unreadable cache is re-parsed"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Parse Cache")
+    print("=" * 50)
+
+    if test_parse_cache():
+        print("\n🎉 Parse cache test completed successfully!")
+    else:
+        print("\n⚠️  Parse cache test completed with issues.")
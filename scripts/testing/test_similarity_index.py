@@ -0,0 +1,87 @@
+"""Test script for near-duplicate request detection."""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append('backend')
+
+from backend.utils.similarity_index import RequestSimilarityIndex
+
+STYLE = {"theme": "modern", "colors": ["blue", "white"]}
+
+
+def test_similarity_index():
+    """Reworded requests hit the index, unrelated ones do not."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        index = RequestSimilarityIndex(threshold=0.8, data_dir=data_dir)
+        index.add(
+            "original-project",
+            "Create a portfolio website for a photographer",
+            ["Image gallery", "Contact form"],
+            STYLE
+        )
+
+        reworded = index.find_similar(
+            "Photographer portfolio site",
+            ["contact form", "image galleries"],
+            STYLE
+        )
+        unrelated = index.find_similar(
+            "Online store for handmade candles",
+            ["Shopping cart", "Checkout"],
+            {"theme": "rustic"}
+        )
+        stats = index.get_stats()
+        removed = index.remove("original-project")
+
+        # Generations and deletions update the index from several threads at once
+        def generation(worker):
+            for n in range(20):
+                index.add(f"project-{worker}-{n}", f"Bakery website number {n}", [], STYLE)
+                index.find_similar("Bakery website", [], STYLE)
+                index.remove(f"project-{worker}-{n - 1}")
+
+        threads = [threading.Thread(target=generation, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        concurrent = index.get_stats()
+
+        # An unreadable file is kept aside rather than silently overwritten
+        index_file = Path(data_dir) / "similarity_index.json"
+        index_file.write_text('{"entries": {"original-project": ')
+        recovered = index.get_stats()
+        corrupt_file = Path(data_dir) / "similarity_index.json.corrupt"
+        corrupt_kept = corrupt_file.exists() and corrupt_file.read_text().startswith('{"entries"')
+        leftover_temp_files = list(Path(data_dir).glob("*.tmp"))
+
+        print(f"🔁 Reworded request: {reworded}")
+        print(f"🆕 Unrelated request: {unrelated}")
+        print(f"📊 Stats: {stats}")
+
+        checks = [
+            (reworded is not None and reworded['project_id'] == "original-project", "Reworded request reuses the specification"),
+            (unrelated is None, "Unrelated request misses"),
+            (stats['lookups'] == 2 and stats['hits'] == 1 and stats['hit_rate'] == 0.5, "Hit rate tracked"),
+            (removed and stats['entries'] == 1, "Deleted project removed from index"),
+            (concurrent['entries'] == 4 and concurrent['lookups'] == 2 + 80, "Concurrent updates keep every entry and counter"),
+            (recovered['entries'] == 0 and corrupt_kept and not leftover_temp_files, "Unreadable index moved aside"),
+        ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Specification Reuse Index")
+    print("=" * 50)
+
+    if test_similarity_index():
+        print("\n🎉 Similarity index test completed successfully!")
+    else:
+        print("\n⚠️  Similarity index test completed with issues.")
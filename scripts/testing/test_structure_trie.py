@@ -0,0 +1,126 @@
+"""Test script for the incremental project structure and its JSON Patch deltas."""
+
+import copy
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append('backend')
+
+from backend.utils.file_parser import ProjectFileParser
+from backend.utils.project_manager import ProjectManager
+from backend.utils.streaming_writer import StreamingFileWriter
+from backend.utils.structure_trie import StructureTrie, apply_patch
+
+PATHS = [
+    'src/App.tsx', 'package.json', 'README.md', 'src/components/Hero.tsx',
+    'src/components/about/Team.tsx', 'src/index.css', 'public/favicon.svg',
+    'src/components/Navbar.tsx', 'src/lib/utils.ts', 'index.html', 'src/main.tsx',
+    'src/components/about/History.tsx', 'src/Assets/logo.svg', 'vite.config.ts',
+]
+
+
+def file_info(path, size=100):
+    return {'extension': os.path.splitext(path)[1], 'size': size, 'is_valid': True}
+
+
+def is_sorted(folder):
+    """Folders first, then files, case-insensitively, at every level."""
+    keys = [(child['type'] == 'file', child['name'].lower()) for child in folder['children']]
+    return keys == sorted(keys) and all(is_sorted(child) for child in folder['children'] if child['type'] == 'folder')
+
+
+def files_in(folder):
+    """File paths in tree order."""
+    return [path for child in folder['children'] for path in (files_in(child) if child['type'] == 'folder' else [child['path']])]
+
+
+def find(folder, path):
+    """The file entry for a path."""
+    for child in folder['children']:
+        if child['type'] == 'file' and child['path'] == path:
+            return child
+        if child['type'] == 'folder' and path.startswith(child['path'] + '/'):
+            return find(child, path)
+    return None
+
+
+def test_structure_trie():
+    """Patches applied in order rebuild the same sorted tree the trie holds."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Everything the test writes stays in the temporary directory
+        os.chdir(temp_dir)
+        try:
+            trie = StructureTrie('trie-test')
+            client = copy.deepcopy(trie.to_dict())
+            patches = []
+            consistent = True
+
+            order = PATHS[:]
+            random.Random(7).shuffle(order)
+            for path in order:
+                patch = trie.insert(path, file_info(path))
+                patches.append(patch)
+                apply_patch(client, patch)
+                consistent = consistent and client == trie.to_dict()
+
+            replaced = trie.insert('src/components/Hero.tsx', file_info('src/components/Hero.tsx', size=250))
+            apply_patch(client, replaced)
+            nested = StructureTrie('nested').insert('docs/guides/setup/intro.md', file_info('intro.md'))
+
+            # The parser's structure comes from the same trie
+            output = "".join(f"{n}. {path}\n\n```text\nexport const x = 1;\n```\n\n" for n, path in enumerate(PATHS, 1))
+            parsed = ProjectFileParser(output, 'trie-test').parse()
+
+            # Insertion cost does not grow with the size of the project
+            large = StructureTrie('large')
+            start = time.perf_counter()
+            for n in range(20000):
+                large.insert(f"src/components/section{n % 50}/Part{n}.tsx", file_info('x.tsx'))
+            insert_time = (time.perf_counter() - start) / 20000
+            print(f"⚡ {insert_time * 1e6:.1f} µs per insertion into a 20,000 file tree")
+
+            # Streamed files carry their patch in the file_created event
+            project_manager = ProjectManager()
+            project_id = project_manager.create_project("Trie test", [], {})
+            writer = StreamingFileWriter(project_id, project_manager)
+            for index in range(0, len(output), 11):
+                writer.feed(output[index:index + 11])
+            writer.close()
+            events = project_manager.get_events(project_id)
+        finally:
+            os.chdir(original_dir)
+
+    streamed = copy.deepcopy(StructureTrie(project_id).to_dict())
+    for event in events:
+        apply_patch(streamed, event['data']['tree_patch'])
+
+    checks = [
+        (consistent, "Each patch brings the client tree in line with the trie"),
+        (is_sorted(trie.to_dict()) and trie.file_count == len(PATHS), "Children stay sorted on insert"),
+        (all(len(patch) == 1 for patch in patches), "One operation per file, new folders included"),
+        (replaced[0]['op'] == 'replace' and client == trie.to_dict() and find(client, 'src/components/Hero.tsx')['size'] == 250, "Regenerated file is replaced in place"),
+        (nested == [{'op': 'add', 'path': '/children/0', 'value': nested[0]['value']}]
+         and files_in(nested[0]['value']) == ['docs/guides/setup/intro.md'], "New folders are added together with their file"),
+        (files_in(parsed['project_structure']) == files_in(trie.to_dict()) and is_sorted(parsed['project_structure']), "Parser structure uses the trie"),
+        (insert_time < 0.0005, "Insertion stays cheap in a large tree"),
+        (len(events) == len(PATHS) and streamed == writer.structure.to_dict(), "file_created events rebuild the streamed tree"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Structure Trie")
+    print("=" * 50)
+
+    if test_structure_trie():
+        print("\n🎉 Structure trie test completed successfully!")
+    else:
+        print("\n⚠️  Structure trie test completed with issues.")
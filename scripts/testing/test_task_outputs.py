@@ -0,0 +1,110 @@
+"""Test script for the per-task storage of agent outputs."""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append('backend')
+os.environ.setdefault('LLM_PROVIDER', 'stub')
+
+from backend.crew.website_crew import WebsiteCrew
+from backend.utils.file_parser import crew_output_hash, load_parsed_project
+from backend.utils.task_outputs import (
+    CODE_TASK,
+    DESIGN_TASK,
+    SPECIFICATION_TASK,
+    TASK_OUTPUTS_DIR,
+    TaskOutputStore
+)
+
+CODE = "".join(
+    f"{n}. src/components/Section{n}.tsx\n\n```tsx\nexport default function Section{n}() {{\n  return <section id=\"s{n}\">Section {n}</section>;\n}}\n```\n\n"
+    for n in range(1, 41)
+)
+SPECIFICATION = "# Lens & Light\n\nA portfolio for a wedding photographer. " * 20
+DESIGN = "## Palette\n\n- Primary: #1F2937\n- Accent: #F59E0B\n" * 20
+
+
+def test_task_outputs():
+    """Each task's output is stored, indexed and loaded on its own."""
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            crew = WebsiteCrew()
+            project_id = crew.project_manager.create_project("Task outputs test", [], {})
+            crew._store_task_output(project_id, SPECIFICATION_TASK, SPECIFICATION)
+            crew._store_task_output(project_id, DESIGN_TASK, DESIGN)
+            crew._process_results(CODE, project_id)
+
+            store = TaskOutputStore(project_id)
+            index = store.index()
+            loaded = {task: store.load(task) for task in (SPECIFICATION_TASK, DESIGN_TASK, CODE_TASK)}
+            project_dir = Path('generated/projects') / project_id
+            legacy_written = (project_dir / 'crew_output.txt').exists()
+
+            # The parser reads the code output only, and nothing once its parse is cached
+            first = load_parsed_project(project_id)
+            (project_dir / TASK_OUTPUTS_DIR / index[CODE_TASK]['file']).unlink()
+            second = load_parsed_project(project_id)
+
+            compressed = TaskOutputStore(project_id, compress=True)
+            compressed_entry = compressed.save(CODE_TASK, CODE)
+            compressed_files = sorted(path.name for path in (project_dir / TASK_OUTPUTS_DIR).iterdir())
+            compressed_load = TaskOutputStore(project_id, compress=False).load(CODE_TASK)
+            listed = crew.project_manager.get_project_files(project_id)
+
+            # Stages that finish together keep every entry in the index
+            threads = [
+                threading.Thread(target=TaskOutputStore('concurrent').save, args=(task, task * 1000))
+                for task in (SPECIFICATION_TASK, DESIGN_TASK, CODE_TASK)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            concurrent = TaskOutputStore('concurrent').index()
+
+            # Projects saved before the task outputs only have the legacy files
+            legacy_dir = Path('generated/projects/legacy')
+            legacy_dir.mkdir(parents=True)
+            (legacy_dir / 'crew_output.txt').write_text(CODE, encoding='utf-8')
+            (legacy_dir / 'specification.md').write_text(SPECIFICATION, encoding='utf-8')
+            legacy = TaskOutputStore('legacy')
+            legacy_loaded = [legacy.load(task) for task in (CODE_TASK, SPECIFICATION_TASK, DESIGN_TASK)]
+            legacy_parsed = load_parsed_project('legacy')
+        finally:
+            os.chdir(original_dir)
+
+    print(f"📦 Code output: {len(CODE)} chars, {compressed_entry['bytes']} bytes gzip-compressed")
+
+    checks = [
+        (loaded == {SPECIFICATION_TASK: SPECIFICATION, DESIGN_TASK: DESIGN, CODE_TASK: CODE}, "Each task's output loads back unchanged"),
+        (index[CODE_TASK]['sha256'] == crew_output_hash(CODE) and index[CODE_TASK]['chars'] == len(CODE), "Index records the hash and size"),
+        (not legacy_written, "No combined crew_output.txt is written"),
+        (not first['from_cache'] and first['file_count'] == 40, "Parser loads the code output"),
+        (second['from_cache'] and second['file_count'] == 40, "Cached parse is found from the index without reading the output"),
+        (compressed_entry['compression'] == 'gzip' and compressed_entry['bytes'] < len(CODE) and compressed_load == CODE, "Compressed output loads back unchanged"),
+        (compressed_files == ['code.md.gz', 'design.md', 'index.json', 'specification.md'], "Re-saving with compression replaces the plain file"),
+        (listed[f"{TASK_OUTPUTS_DIR}/code.md.gz"] == CODE, "Project file listing decompresses task outputs"),
+        (sorted(concurrent) == sorted([SPECIFICATION_TASK, DESIGN_TASK, CODE_TASK]), "Concurrent saves keep every index entry"),
+        (legacy_loaded == [CODE, SPECIFICATION, None], "Legacy projects fall back to their saved files"),
+        (legacy_parsed['file_count'] == 40, "Legacy projects still parse"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Task Outputs")
+    print("=" * 50)
+
+    if test_task_outputs():
+        print("\n🎉 Task outputs test completed successfully!")
+    else:
+        print("\n⚠️  Task outputs test completed with issues.")
@@ -0,0 +1,74 @@
+"""Test script for detecting truncated software engineer output."""
+
+import sys
+sys.path.append('backend')
+
+from backend.utils.file_parser import detect_truncation, parse_project_files
+
+COMPONENT = "import React from 'react';\n\nexport default function Hero() {\n  return (<section>Hero</section>);\n}"
+
+TRUNCATED_OUTPUT = f"""1. src/App.tsx
+
+```tsx
+{COMPONENT}
+```
+
+2. src/components/Hero.tsx
+
+```tsx
+import React from 'react';
+
+export default function Hero() {{
+  return (
+    <section className="bg-blue-900">"""
+
+CONTINUATION = f"""3. src/components/Hero.tsx
+
+```tsx
+{COMPONENT}
+```
+
+4. package.json
+
+```json
+{{"name": "portfolio"}}
+```"""
+
+
+def test_truncation_detection():
+    """Cut-off blocks and missing files are reported and can be stitched."""
+    expected_files = ['src/App.tsx', 'src/components/Hero.tsx', 'package.json']
+    check = detect_truncation(TRUNCATED_OUTPUT, expected_files, stop_reason='max_tokens')
+
+    print(f"✂️  Reasons: {check['reasons']}")
+    print(f"📄 Incomplete: {check['incomplete_files']}, missing: {check['missing_files']}")
+
+    stitched = f"{check['complete_output']}\n\n{CONTINUATION}"
+    recheck = detect_truncation(stitched, expected_files)
+    parsed = parse_project_files(stitched, 'truncation-test')
+
+    checks = [
+        (check['truncated'], "Truncation detected"),
+        (check['incomplete_files'] == ['src/components/Hero.tsx'], "Unclosed block reported as incomplete"),
+        (check['missing_files'] == ['package.json'], "Missing expected file reported"),
+        (check['next_number'] == 3, "Continuation numbering starts after the cut-off block"),
+        ('bg-blue-900' not in check['complete_output'], "Cut-off block dropped from complete output"),
+        (not recheck['truncated'], "Stitched output is complete"),
+        (set(parsed['files']) == set(expected_files), "Stitched output parses into all files"),
+    ]
+
+    print()
+    for passed, label in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    return all(passed for passed, _ in checks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Truncation Detection")
+    print("=" * 50)
+
+    if test_truncation_detection():
+        print("\n🎉 Truncation detection test completed successfully!")
+    else:
+        print("\n⚠️  Truncation detection test completed with issues.")